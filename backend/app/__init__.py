@@ -14,6 +14,7 @@ from .api import api_bp
 from .commands import cli_commands_bp
 from .config import config_by_name
 from .extensions import cors, db, migrate
+from .tools.event_bus import init_event_bus
 
 
 def create_app(config_name: str = None):
@@ -87,6 +88,7 @@ def create_app(config_name: str = None):
     db.init_app(app)
     migrate.init_app(app, db)  # Flask-Migrate 用於資料庫遷移
     jwt_manager.init_app(app)  # Flask-JWT-Extended 用於 JWT 認證
+    init_event_bus(app)  # 即時事件推播 (SSE)
 
     # 設定 CORS (Cross-Origin Resource Sharing)
     allowed_origins_str = os.environ.get(
@@ -5,9 +5,14 @@ api_bp = Blueprint("api", __name__)
 
 from . import (
     auth_routes,
+    event_routes,
     leaderboard_routes,
+    live_scoring_routes,
     match_routes,
     member_routes,
     organization_routes,
+    pairing_routes,
+    prediction_routes,
     profile_routes,
+    sync_routes,
 )
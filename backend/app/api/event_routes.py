@@ -0,0 +1,67 @@
+# backend/app/api/event_routes.py
+"""
+即時事件推播 (Server-Sent Events)
+
+事件類型：
+- match_created / match_updated / match_deleted：比賽摘要
+- ratings_changed：受影響球員的評分差異（大量重算時為 full_refresh）
+
+斷線期間的事件不會補送，客戶端重連後應以 /api/sync 補齊資料。
+每條連線會佔用一個 worker 執行緒直到 EVENT_STREAM_MAX_SECONDS，部署時應使用
+gthread / gevent 等可同時處理多連線的 worker。
+"""
+
+import json
+import time
+
+from flask import Response, current_app, request
+
+from ..tools.event_bus import get_event_bus
+from . import api_bp
+
+HEARTBEAT_SECONDS = 15
+RECONNECT_MILLISECONDS = 3000
+DEFAULT_STREAM_MAX_SECONDS = 300
+
+
+@api_bp.route("/events/stream", methods=["GET"])
+def stream_events():
+    """
+    訂閱即時事件
+
+    查詢參數：
+    - types: 以逗號分隔的事件類型，未指定時接收全部
+    """
+    bus = get_event_bus()
+    max_seconds = current_app.config.get(
+        "EVENT_STREAM_MAX_SECONDS", DEFAULT_STREAM_MAX_SECONDS
+    )
+    event_types = {
+        event_type.strip()
+        for event_type in request.args.get("types", "").split(",")
+        if event_type.strip()
+    }
+    subscription = bus.subscribe()
+
+    def generate():
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+            while (remaining := deadline - time.monotonic()) > 0:
+                item = subscription.get(timeout=min(HEARTBEAT_SECONDS, remaining))
+                if item is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                if event_types and item.get("type") not in event_types:
+                    continue
+                data = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+                event_type = item.get("type", "message")
+                yield f"id: {item['id']}\nevent: {event_type}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
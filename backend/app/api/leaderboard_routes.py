@@ -9,12 +9,26 @@ from marshmallow import ValidationError
 
 # 使用正確的 leaderboard_schemas
 from ..schemas.leaderboard_schemas import (
+    GameStatisticsQuerySchema,
     LeaderboardPlayerSchema,
     LeaderboardQuerySchema,
     LeaderboardStatisticsSchema,
+    MemberRankQuerySchema,
+    PairLeaderboardQuerySchema,
+    PairRatingSchema,
+    PerformanceQuerySchema,
     PlayerComparisonSchema,
+    RacketLeaderboardQuerySchema,
+    RankHistoryQuerySchema,
+    RankHistorySchema,
+    SeasonSchema,
 )
 from ..services.leaderboard_service import LeaderboardService
+from ..services.leaderboard_snapshot_service import LeaderboardSnapshotService
+from ..services.match_analytics_service import MatchAnalyticsService
+from ..services.pair_rating_service import PairRatingService
+from ..services.performance_cube_service import PerformanceCubeService
+from ..services.racket_analytics_service import RacketAnalyticsService
 from ..tools.exceptions import AppException
 from . import api_bp
 
@@ -23,6 +37,15 @@ leaderboard_schema = LeaderboardPlayerSchema(many=True)
 leaderboard_query_schema = LeaderboardQuerySchema()
 player_comparison_schema = PlayerComparisonSchema()
 statistics_schema = LeaderboardStatisticsSchema()
+seasons_schema = SeasonSchema(many=True)
+member_rank_query_schema = MemberRankQuerySchema()
+pair_query_schema = PairLeaderboardQuerySchema()
+pair_ratings_schema = PairRatingSchema(many=True)
+rank_history_query_schema = RankHistoryQuerySchema()
+rank_history_schema = RankHistorySchema(many=True)
+performance_query_schema = PerformanceQuerySchema()
+racket_query_schema = RacketLeaderboardQuerySchema()
+game_stats_query_schema = GameStatisticsQuerySchema()
 
 
 def handle_validation_error(error: ValidationError, message: str = "輸入數據有誤"):
@@ -70,7 +93,7 @@ def get_leaderboard():
                         f"無法轉換參數 {key}: {query_params[key]}"
                     )
 
-        for key in ["include_guests", "include_inactive"]:
+        for key in ["include_guests", "include_inactive", "inactivity_adjusted"]:
             if key in query_params:
                 validated_params[key] = query_params[key].lower() == "true"
 
@@ -148,16 +171,29 @@ def get_leaderboard():
 
     except ValidationError as err:
         return handle_validation_error(err, "查詢參數錯誤")
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         current_app.logger.error(f"[LeaderboardAPI] 獲取排行榜失敗: {e}", exc_info=True)
         return handle_server_error(e, "獲取排行榜時發生錯誤", "get_leaderboard")
 
 
+@api_bp.route("/leaderboard/seasons", methods=["GET"])
+def get_seasons():
+    """賽季列表（GET /leaderboard?season=<id> 使用）"""
+    try:
+        seasons = LeaderboardService.get_seasons()
+        return jsonify({"data": seasons_schema.dump(seasons)}), 200
+
+    except Exception as e:
+        return handle_server_error(e, "獲取賽季列表時發生錯誤", "get_seasons")
+
+
 @api_bp.route("/leaderboard/compare/<int:member1_id>/<int:member2_id>", methods=["GET"])
 @jwt_required(optional=True)
 def compare_players(member1_id, member2_id):
     """
-    比較兩位球員
+    比較兩位球員；可用 context=clay_court 等以情境評分比較
     """
     try:
         if member1_id == member2_id:
@@ -165,7 +201,9 @@ def compare_players(member1_id, member2_id):
                 {"error": "validation_error", "message": "不能比較相同的球員"}
             ), 400
 
-        result = LeaderboardService.compare_players(member1_id, member2_id)
+        result = LeaderboardService.compare_players(
+            member1_id, member2_id, context=request.args.get("context") or None
+        )
 
         # 使用 PlayerComparisonSchema 序列化比較結果
         if "comparison" in result:
@@ -239,6 +277,152 @@ def get_member_match_stats(member_id):
 
 
 # 調試端點（開發用）
+@api_bp.route("/leaderboard/pairs", methods=["GET"])
+@jwt_required(optional=True)
+def get_pair_leaderboard():
+    """雙打組合排行榜（依組合保守評分排序，可用 member_id 查詢某球員的搭檔）"""
+    try:
+        params = pair_query_schema.load(request.args)
+        pairs, total = PairRatingService.get_leaderboard(
+            page=params["page"],
+            per_page=params["per_page"],
+            min_matches=params["min_matches"],
+            member_id=params.get("member_id"),
+        )
+        return jsonify(
+            {
+                "data": pair_ratings_schema.dump(pairs),
+                "total": total,
+                "page": params["page"],
+                "per_page": params["per_page"],
+                "total_pages": (total + params["per_page"] - 1) // params["per_page"],
+            }
+        ), 200
+
+    except ValidationError as err:
+        return handle_validation_error(err, "查詢參數錯誤")
+    except Exception as e:
+        return handle_server_error(
+            e, "獲取組合排行榜時發生錯誤", "get_pair_leaderboard"
+        )
+
+
+@api_bp.route("/leaderboard/rackets", methods=["GET"])
+@jwt_required(optional=True)
+def get_racket_leaderboard():
+    """球拍排行榜：各球拍使用者的勝率、平均評分與每場評分變化（依資料版本快取）"""
+    try:
+        params = racket_query_schema.load(request.args)
+        version, rackets = RacketAnalyticsService.get_leaderboard(
+            sort_by=params["sort_by"],
+            sort_order=params["sort_order"],
+            min_matches=params["min_matches"],
+        )
+        return jsonify({"version": version, "data": rackets}), 200
+
+    except ValidationError as err:
+        return handle_validation_error(err, "查詢參數錯誤")
+    except Exception as e:
+        return handle_server_error(
+            e, "獲取球拍排行榜時發生錯誤", "get_racket_leaderboard"
+        )
+
+
+@api_bp.route("/leaderboard/rank/<int:member_id>", methods=["GET"])
+@jwt_required(optional=True)
+def get_member_rank(member_id):
+    """
+    單一球員的名次與百分位（例如個人頁「第 37 名 / 212 人」）
+
+    支援 include_guests / include_inactive / organization_id，neighbors 為前後各幾名
+    """
+    try:
+        params = member_rank_query_schema.load(request.args)
+        result = LeaderboardService.get_member_rank(member_id, params)
+        return jsonify(result), 200
+
+    except ValidationError as err:
+        return handle_validation_error(err, "查詢參數錯誤")
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        return handle_server_error(e, "獲取球員名次時發生錯誤", "get_member_rank")
+
+
+@api_bp.route("/leaderboard/<int:member_id>/rank-history", methods=["GET"])
+@jwt_required(optional=True)
+def get_member_rank_history(member_id):
+    """球員每期排行榜快照的名次與分數（由舊到新）"""
+    try:
+        params = rank_history_query_schema.load(request.args)
+        history = LeaderboardSnapshotService.get_member_history(
+            member_id, limit=params["limit"]
+        )
+        return jsonify(
+            {"member_id": member_id, "data": rank_history_schema.dump(history)}
+        ), 200
+
+    except ValidationError as err:
+        return handle_validation_error(err, "查詢參數錯誤")
+    except Exception as e:
+        return handle_server_error(
+            e, "獲取名次軌跡時發生錯誤", "get_member_rank_history"
+        )
+
+
+@api_bp.route("/leaderboard/<int:member_id>/performance", methods=["GET"])
+@jwt_required(optional=True)
+def get_member_performance(member_id):
+    """
+    球員依比賽條件分組的表現（例如 ?group_by=court_surface,match_time_slot）
+
+    可依 court_surface / court_environment / match_time_slot / match_format 任意組合分組，
+    start_date / end_date 限制比賽日期；未記錄的條件以 null 表示
+    """
+    try:
+        params = performance_query_schema.load(request.args)
+        breakdown = PerformanceCubeService.get_breakdown(
+            member_id,
+            group_by=params["group_by"],
+            start_date=params.get("start_date"),
+            end_date=params.get("end_date"),
+        )
+        return jsonify(
+            {
+                "member_id": member_id,
+                "group_by": params["group_by"],
+                "data": breakdown,
+            }
+        ), 200
+
+    except ValidationError as err:
+        return handle_validation_error(err, "查詢參數錯誤")
+    except Exception as e:
+        return handle_server_error(
+            e, "獲取球員表現時發生錯誤", "get_member_performance"
+        )
+
+
+@api_bp.route("/leaderboard/<int:member_id>/game-stats", methods=["GET"])
+@jwt_required(optional=True)
+def get_member_game_stats(member_id):
+    """
+    球員的每局統計：deuce 比率、發球局保發率與接發局破發率
+
+    可用 start_date / end_date / match_type / match_format 篩選；
+    只統計有記錄每局比分的比賽
+    """
+    try:
+        params = game_stats_query_schema.load(request.args)
+        stats = MatchAnalyticsService.get_game_statistics(member_id, params)
+        return jsonify(stats), 200
+
+    except ValidationError as err:
+        return handle_validation_error(err, "查詢參數錯誤")
+    except Exception as e:
+        return handle_server_error(e, "獲取每局統計時發生錯誤", "get_member_game_stats")
+
+
 @api_bp.route("/leaderboard/debug", methods=["GET"])
 @jwt_required(optional=True)
 def debug_leaderboard():
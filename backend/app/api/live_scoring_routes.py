@@ -0,0 +1,191 @@
+# backend/app/api/live_scoring_routes.py
+"""
+即時計分 API
+
+計分員開始比賽後逐分送出得分方，伺服器維護目前比分與發球方；
+最後一局結束時自動寫入比賽記錄。觀看端可訂閱 /api/events/stream?types=live_point。
+"""
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from marshmallow import ValidationError as MarshmallowValidationError
+
+from ..schemas.live_scoring_schemas import (
+    LiveEventsQuerySchema,
+    LiveMatchCreateSchema,
+    LiveMatchQuerySchema,
+    LiveMatchResponseSchema,
+    LivePointCreateSchema,
+    LivePointEventSchema,
+)
+from ..services.live_scoring_service import LiveScoringService
+from ..tools.exceptions import AppException
+from . import api_bp
+
+live_create_schema = LiveMatchCreateSchema()
+live_query_schema = LiveMatchQuerySchema()
+live_response_schema = LiveMatchResponseSchema()
+live_responses_schema = LiveMatchResponseSchema(many=True)
+point_create_schema = LivePointCreateSchema()
+events_query_schema = LiveEventsQuerySchema()
+point_event_schema = LivePointEventSchema()
+point_events_schema = LivePointEventSchema(many=True)
+
+
+@api_bp.route("/live-matches", methods=["POST"])
+@jwt_required()
+def start_live_match():
+    json_data = request.get_json()
+    if not json_data:
+        return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
+
+    try:
+        validated_data = live_create_schema.load(json_data)
+        live_match = LiveScoringService.start_match(
+            validated_data, int(get_jwt_identity())
+        )
+        return jsonify(
+            {
+                "message": "即時計分已開始",
+                "live_match": live_response_schema.dump(live_match),
+            }
+        ), 201
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "輸入數據有誤",
+                "details": err.messages,
+            }
+        ), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"開始即時計分時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "開始計分時發生錯誤"}), 500
+
+
+@api_bp.route("/live-matches", methods=["GET"])
+def get_live_matches():
+    """即時比賽列表，預設依最後更新時間排序；可用 status 篩選"""
+    try:
+        params = live_query_schema.load(request.args)
+        live_matches = LiveScoringService.get_live_matches(params.get("status"))
+        return jsonify({"data": live_responses_schema.dump(live_matches)}), 200
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "查詢參數有誤",
+                "details": err.messages,
+            }
+        ), 400
+    except Exception as e:
+        current_app.logger.error(f"獲取即時比賽列表時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "獲取列表時發生錯誤"}), 500
+
+
+@api_bp.route("/live-matches/<int:live_match_id>", methods=["GET"])
+def get_live_match(live_match_id):
+    """目前比分（讀取快照，不重播事件）"""
+    try:
+        live_match = LiveScoringService.get_live_match(live_match_id)
+        return jsonify(live_response_schema.dump(live_match)), 200
+
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"獲取即時比賽時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "獲取比賽時發生錯誤"}), 500
+
+
+@api_bp.route("/live-matches/<int:live_match_id>/points", methods=["POST"])
+@jwt_required()
+def add_live_point(live_match_id):
+    """
+    記錄一分
+
+    請求範例：{"scoring_side": "side_a", "expected_sequence": 12}
+    """
+    json_data = request.get_json()
+    if not json_data:
+        return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
+
+    try:
+        validated_data = point_create_schema.load(json_data)
+        live_match, point = LiveScoringService.add_point(
+            live_match_id,
+            int(get_jwt_identity()),
+            scoring_side=validated_data["scoring_side"],
+            server_side=validated_data.get("server_side"),
+            expected_sequence=validated_data.get("expected_sequence"),
+        )
+        return jsonify(
+            {
+                "point": point_event_schema.dump(point),
+                "live_match": live_response_schema.dump(live_match),
+            }
+        ), 201
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "輸入數據有誤",
+                "details": err.messages,
+            }
+        ), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"記錄即時比分時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "記錄比分時發生錯誤"}), 500
+
+
+@api_bp.route("/live-matches/<int:live_match_id>/points", methods=["GET"])
+def get_live_points(live_match_id):
+    """逐分事件；以 after 取得某序號之後的事件"""
+    try:
+        params = events_query_schema.load(request.args)
+        points = LiveScoringService.get_events(
+            live_match_id, after=params["after"], limit=params["limit"]
+        )
+        return jsonify({"data": point_events_schema.dump(points)}), 200
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "查詢參數有誤",
+                "details": err.messages,
+            }
+        ), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"獲取逐分事件時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "獲取事件時發生錯誤"}), 500
+
+
+@api_bp.route("/live-matches/<int:live_match_id>/abandon", methods=["POST"])
+@jwt_required()
+def abandon_live_match(live_match_id):
+    """中止比賽（不寫入比賽記錄）"""
+    try:
+        live_match = LiveScoringService.abandon_match(
+            live_match_id, int(get_jwt_identity())
+        )
+        return jsonify(
+            {
+                "message": "比賽已中止",
+                "live_match": live_response_schema.dump(live_match),
+            }
+        ), 200
+
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"中止即時比賽時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "中止比賽時發生錯誤"}), 500
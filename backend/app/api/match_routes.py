@@ -5,6 +5,7 @@ from marshmallow import ValidationError as MarshmallowValidationError
 
 from ..schemas.match_schemas import (
     MatchQuerySchema,
+    MatchRecordBatchSchema,
     MatchRecordCreateSchema,
     MatchRecordDetailedCreateSchema,
     MatchRecordDetailedResponseSchema,
@@ -13,6 +14,7 @@ from ..schemas.match_schemas import (
     MatchRecordUpdateSchema,
 )
 from ..services.match_service import MatchRecordService
+from ..services.rating_job_service import RatingJobService
 from ..tools.exceptions import AppException
 from . import api_bp
 
@@ -24,6 +26,18 @@ response_schema = MatchRecordResponseSchema()
 detailed_response_schema = MatchRecordDetailedResponseSchema()
 responses_schema = MatchRecordResponseSchema(many=True)
 query_schema = MatchQuerySchema()
+batch_schema = MatchRecordBatchSchema()
+
+
+def _load_create_data(schema, json_data: dict) -> dict:
+    """驗證建立比賽的資料；Idempotency-Key 標頭與 idempotency_key 欄位等效"""
+    validated_data = schema.load(json_data)
+    header_key = request.headers.get("Idempotency-Key")
+    if header_key and not validated_data.get("idempotency_key"):
+        validated_data["idempotency_key"] = schema.fields["idempotency_key"].deserialize(
+            header_key
+        )
+    return validated_data
 
 
 @api_bp.route("/match-records", methods=["POST"])
@@ -34,7 +48,15 @@ def create_match_record():
         return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
 
     try:
-        validated_data = create_schema.load(json_data)
+        validated_data = _load_create_data(create_schema, json_data)
+        existing = MatchRecordService.find_existing(validated_data)
+        if existing:
+            # 重送的請求：回傳先前建立的記錄
+            return jsonify({
+                "message": "比賽記錄已存在",
+                "record": response_schema.dump(existing)
+            }), 200
+
         new_record = MatchRecordService.create_match_record(validated_data)
         return jsonify({
             "message": "比賽記錄已成功建立",
@@ -62,7 +84,15 @@ def create_match_record_detailed():
         return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
 
     try:
-        validated_data = detailed_create_schema.load(json_data)
+        validated_data = _load_create_data(detailed_create_schema, json_data)
+        existing = MatchRecordService.find_existing(validated_data)
+        if existing:
+            # 重送的請求：回傳先前建立的記錄
+            return jsonify({
+                "message": "比賽記錄已存在",
+                "record": detailed_response_schema.dump(existing)
+            }), 200
+
         new_record = MatchRecordService.create_match_record_detailed(validated_data)
         return jsonify({
             "message": "詳細比賽記錄已成功建立",
@@ -82,6 +112,57 @@ def create_match_record_detailed():
         return jsonify({"error": "server_error", "message": "創建時發生錯誤"}), 500
 
 
+@api_bp.route("/match-records/batch", methods=["POST"])
+@jwt_required()
+def create_match_records_batch():
+    """
+    批次提交離線記錄的比賽
+
+    請求範例：
+    {"matches": [{"idempotency_key": "device1-0001", "match_date": "2025-07-01", ...}, ...]}
+
+    已提交過的比賽（相同 idempotency_key）標記為 duplicate 並回傳既有記錄，
+    同一 idempotency_key 搭配不同內容時回傳 422；
+    其餘比賽依比賽時間排序後在同一交易中建立，評分依序只計算一次。
+    """
+    json_data = request.get_json()
+    if not json_data:
+        return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
+
+    try:
+        validated_data = batch_schema.load(json_data)
+        results = MatchRecordService.create_match_records_batch(
+            validated_data["matches"]
+        )
+        created_count = sum(1 for result in results if result["status"] == "created")
+        return jsonify({
+            "message": f"已建立 {created_count} 場比賽",
+            "created": created_count,
+            "duplicates": len(results) - created_count,
+            "results": [
+                {
+                    "index": result["index"],
+                    "idempotency_key": result["idempotency_key"],
+                    "status": result["status"],
+                    "record": detailed_response_schema.dump(result["record"]),
+                }
+                for result in results
+            ],
+        }), 200
+
+    except MarshmallowValidationError as err:
+        return jsonify({
+            "error": "validation_error",
+            "message": "輸入數據有誤",
+            "details": err.messages
+        }), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"批次建立比賽記錄時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "批次建立時發生錯誤"}), 500
+
+
 @api_bp.route("/match-records", methods=["GET"])
 @jwt_required(optional=True)
 def get_match_records():
@@ -147,6 +228,20 @@ def get_match_record_detailed(record_id):
         return jsonify({"error": "server_error", "message": "獲取數據時發生錯誤"}), 500
 
 
+@api_bp.route("/match-records/<int:record_id>/rating-status", methods=["GET"])
+@jwt_required(optional=True)
+def get_match_record_rating_status(record_id):
+    """查詢比賽記錄的評分更新狀態 (pending/processing/done/failed)"""
+    try:
+        return jsonify(RatingJobService.get_rating_status(record_id)), 200
+
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"獲取評分狀態時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "獲取數據時發生錯誤"}), 500
+
+
 @api_bp.route("/match-records/<int:record_id>", methods=["PUT"])
 @jwt_required()
 def update_match_record(record_id):
@@ -16,7 +16,7 @@ from sqlalchemy.orm import joinedload
 
 from ..extensions import db
 from ..models import Member, Organization
-from ..models.enums import GuestRoleEnum
+from ..models.enums import ChangeActionEnum, ChangeEntityEnum, GuestRoleEnum
 from ..schemas.member_schemas import (
     GuestCreateResponseSchema,
     GuestCreateSchema,
@@ -26,8 +26,13 @@ from ..schemas.member_schemas import (
     MemberCreateSchema,
     MemberSchema,
     MemberUpdateSchema,
+    PlayerSearchQuerySchema,
+    PlayerSearchResultSchema,
 )
+from ..services.change_log_service import ChangeLogService
+from ..services.member_search_service import MemberSearchService
 from ..services.member_service import MemberService
+from ..services.player_directory_service import PlayerDirectoryService
 from ..tools.exceptions import AppException, UserAlreadyExistsError
 from . import api_bp
 
@@ -37,6 +42,8 @@ member_schema = MemberSchema()
 members_schema = MemberSchema(many=True)
 member_create_schema = MemberCreateSchema()
 member_update_schema = MemberUpdateSchema()
+player_search_query_schema = PlayerSearchQuerySchema()
+player_search_results_schema = PlayerSearchResultSchema(many=True)
 
 # 訪客 Schemas
 guest_create_schema = GuestCreateSchema()
@@ -98,6 +105,78 @@ def get_members_list():
         return handle_server_error(e, "獲取成員列表時發生錯誤", "get_members_list")
 
 
+@api_bp.route("/members/search", methods=["GET"])
+@jwt_required(optional=True)
+def search_players():
+    """
+    球員搜尋（typeahead）
+
+    查詢參數：
+    - q: 搜尋關鍵字
+    - include_guests: 是否包含訪客（登入時只包含自己建立的訪客）
+    - limit: 回傳筆數上限（預設 10）
+    """
+    try:
+        params = player_search_query_schema.load(request.args)
+        user_id = get_jwt_identity()
+        include_guests = params["include_guests"] and user_id is not None
+
+        players = MemberSearchService.search(
+            params["q"],
+            limit=params["limit"],
+            include_guests=include_guests,
+            created_by_user_id=int(user_id) if user_id else None,
+        )
+        return jsonify(
+            {
+                "success": True,
+                "results": player_search_results_schema.dump(players),
+                "total": len(players),
+            }
+        ), 200
+
+    except ValidationError as err:
+        return handle_validation_error(err, "查詢參數格式錯誤")
+    except Exception as e:
+        return handle_server_error(e, "搜尋球員時發生錯誤", "search_players")
+
+
+@api_bp.route("/members/directory", methods=["GET"])
+@jwt_required(optional=True)
+def get_player_directory():
+    """
+    球員名錄（選手選擇器用）
+
+    只包含 id、短名稱、性別、組織與最後出賽日期（last_played）；登入時包含自己建立的訪客。
+    完整名錄依 last_played 由新到舊、再依 id 排序，套用差異後客戶端以同一規則排序。
+
+    查詢參數：
+    - since: 已快取的版本，若伺服器仍保留該版本則只回傳差異（players 為變更項目，removed 為移除的 ID）
+
+    支援 ETag / If-None-Match，內容未變更時回傳 304。
+    """
+    try:
+        user_id = get_jwt_identity()
+        user_id = int(user_id) if user_id else None
+        since = request.args.get("since")
+
+        directory = PlayerDirectoryService.get_directory(user_id=user_id, since=since)
+        etag = f"{directory['version']}-{user_id or 0}"
+        if since:
+            etag = f"{etag}-{since}"
+
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = jsonify({"success": True, **directory})
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    except Exception as e:
+        return handle_server_error(e, "獲取球員名錄時發生錯誤", "get_player_directory")
+
+
 def _get_leaderboard_legacy():
     """向後兼容的排行榜視圖"""
     from .leaderboard_routes import get_leaderboard
@@ -236,6 +315,10 @@ def create_guest():
         )
 
         db.session.add(new_guest)
+        db.session.flush()
+        ChangeLogService.record(
+            ChangeEntityEnum.MEMBER, new_guest.id, ChangeActionEnum.CREATED
+        )
         db.session.commit()
 
         current_app.logger.info(
@@ -277,24 +360,28 @@ def search_my_guests():
         )
 
         # 應用篩選
-        if params.get("q"):
-            search_term = f"%{params['q']}%"
-            query = query.filter(
-                db.or_(
-                    Member.name.ilike(search_term),
-                    Member.guest_phone.ilike(search_term),
-                    Member.guest_identifier.ilike(search_term),
-                    Member.guest_notes.ilike(search_term),
-                )
-            )
-
         if params.get("guest_role"):
             query = query.filter(Member.guest_role == params["guest_role"])
 
         if params.get("organization_id"):
             query = query.filter(Member.organization_id == params["organization_id"])
 
-        guests = query.limit(params.get("limit", 10)).all()
+        limit = params.get("limit", 10)
+        if params.get("q"):
+            # 使用搜尋索引，結果依相關度排序
+            ranked_ids = MemberSearchService.search_ranked_ids(
+                params["q"],
+                limit=None,
+                include_members=False,
+                created_by_user_id=current_user_id,
+            )
+            order = {member_id: index for index, member_id in enumerate(ranked_ids)}
+            guests = sorted(
+                query.filter(Member.id.in_(ranked_ids)).all(),
+                key=lambda guest: order[guest.id],
+            )[:limit]
+        else:
+            guests = query.limit(limit).all()
 
         return jsonify(
             guest_list_schema.dump(
@@ -340,6 +427,9 @@ def update_guest(guest_id):
             organization_id=data.get("organization_id"),
             notes=data.get("notes"),
         )
+        ChangeLogService.record(
+            ChangeEntityEnum.MEMBER, guest.id, ChangeActionEnum.UPDATED
+        )
 
         db.session.commit()
 
@@ -386,6 +476,9 @@ def delete_guest(guest_id):
             ), 400
 
         guest_name = guest.name
+        ChangeLogService.record(
+            ChangeEntityEnum.MEMBER, guest.id, ChangeActionEnum.DELETED
+        )
         db.session.delete(guest)
         db.session.commit()
 
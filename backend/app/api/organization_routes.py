@@ -24,10 +24,8 @@ org_update_schema = OrganizationUpdateSchema()
 def get_organizations():
     """獲取所有組織的列表。"""
     try:
+        # 成員統計已由服務層以單一彙總查詢附加到每個組織物件上
         orgs = OrganizationService.get_all_organizations(request.args)
-        # 在序列化前，將成員數量附加到每個組織物件上
-        for org in orgs:
-            org.members_count = len(org.members)
         return jsonify(orgs_schema.dump(orgs)), 200
     except Exception as e:
         current_app.logger.error(f"獲取組織列表時發生錯誤: {e}", exc_info=True)
@@ -38,11 +36,10 @@ def get_organizations():
 def get_organization(org_id):
     """根據 ID 獲取單一組織的詳細資訊。"""
     try:
-        org = OrganizationService.get_organization_by_id(org_id)
+        org = OrganizationService.get_organization_with_stats(org_id)
         if not org:
             raise OrganizationNotFoundError()  # 拋出業務異常
 
-        org.members_count = len(org.members)
         return jsonify(org_schema.dump(org)), 200
     except OrganizationNotFoundError as e:
         return jsonify(e.to_dict()), e.status_code
@@ -0,0 +1,48 @@
+# backend/app/api/pairing_routes.py
+"""
+練習賽配對相關的 API 路由
+"""
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from marshmallow import ValidationError as MarshmallowValidationError
+
+from ..schemas.pairing_schemas import PairingRequestSchema
+from ..services.pairing_service import PairingService
+from ..tools.exceptions import AppException
+from . import api_bp
+
+pairing_request_schema = PairingRequestSchema()
+
+
+@api_bp.route("/pairings/generate", methods=["POST"])
+@jwt_required()
+def generate_pairings():
+    """
+    根據出席名單產生雙打場地分配
+
+    請求範例：
+    {"attendee_ids": [1, 2, ...], "rounds": 3, "gender_rule": "mixed"}
+    """
+    json_data = request.get_json()
+    if not json_data:
+        return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
+
+    try:
+        validated_data = pairing_request_schema.load(json_data)
+        result = PairingService.generate_session(**validated_data)
+        return jsonify({"message": "配對完成", **result}), 200
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "輸入數據有誤",
+                "details": err.messages,
+            }
+        ), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"產生配對時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "產生配對時發生錯誤"}), 500
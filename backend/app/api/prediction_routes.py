@@ -0,0 +1,93 @@
+# backend/app/api/prediction_routes.py
+"""
+對戰預測相關的 API 路由 - 勝率與對戰品質
+"""
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from marshmallow import ValidationError as MarshmallowValidationError
+
+from ..schemas.prediction_schemas import (
+    BatchPredictionRequestSchema,
+    LineupSchema,
+    PredictionResultSchema,
+)
+from ..services.prediction_service import PredictionService
+from ..tools.exceptions import AppException
+from . import api_bp
+
+lineup_schema = LineupSchema()
+batch_request_schema = BatchPredictionRequestSchema()
+result_schema = PredictionResultSchema()
+results_schema = PredictionResultSchema(many=True)
+
+
+@api_bp.route("/predictions/match", methods=["POST"])
+@jwt_required(optional=True)
+def predict_match():
+    """預測單一組合的勝率與對戰品質"""
+    json_data = request.get_json()
+    if not json_data:
+        return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
+
+    try:
+        validated_data = lineup_schema.load(json_data)
+        result = PredictionService.evaluate_lineup(
+            validated_data["team_a"], validated_data["team_b"]
+        )
+        return jsonify(
+            {"message": "預測完成", "prediction": result_schema.dump(result)}
+        ), 200
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "輸入數據有誤",
+                "details": err.messages,
+            }
+        ), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"預測對戰時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "預測時發生錯誤"}), 500
+
+
+@api_bp.route("/predictions/batch", methods=["POST"])
+@jwt_required(optional=True)
+def predict_batch():
+    """
+    批次預測多組組合
+
+    請求格式：{"lineups": [{"team_a": [1, 2], "team_b": [3, 4]}, ...]}
+    回傳順序與請求相同，無效組合會在該筆結果帶有 error 欄位。
+    """
+    json_data = request.get_json()
+    if not json_data:
+        return jsonify({"error": "missing_json", "message": "缺少 JSON 請求內容"}), 400
+
+    try:
+        validated_data = batch_request_schema.load(json_data)
+        results = PredictionService.evaluate_batch(validated_data["lineups"])
+        return jsonify(
+            {
+                "message": "批次預測完成",
+                "total": len(results),
+                "predictions": results_schema.dump(results),
+            }
+        ), 200
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "輸入數據有誤",
+                "details": err.messages,
+            }
+        ), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"批次預測時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "批次預測時發生錯誤"}), 500
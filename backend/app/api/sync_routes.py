@@ -0,0 +1,73 @@
+# backend/app/api/sync_routes.py
+"""
+離線客戶端增量同步 API
+"""
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from marshmallow import ValidationError as MarshmallowValidationError
+
+from ..schemas.match_schemas import MatchRecordResponseSchema
+from ..schemas.sync_schemas import SyncMemberSchema, SyncQuerySchema, SyncRatingSchema
+from ..services.change_log_service import ChangeLogService
+from ..tools.exceptions import AppException
+from . import api_bp
+
+sync_query_schema = SyncQuerySchema()
+sync_matches_schema = MatchRecordResponseSchema(many=True)
+sync_members_schema = SyncMemberSchema(many=True)
+sync_ratings_schema = SyncRatingSchema(many=True)
+
+
+def _dump_changes(changes: dict, schema) -> dict:
+    return {
+        "created": schema.dump(changes["created"]),
+        "updated": schema.dump(changes["updated"]),
+        "deleted": changes["deleted"],
+    }
+
+
+@api_bp.route("/sync", methods=["GET"])
+@jwt_required()
+def get_sync_changes():
+    """
+    取得版本號之後的比賽、球員與評分變更
+
+    查詢參數：
+    - since: 最後同步的版本號（第一次同步為 0）
+    - limit: 單次最多讀取的變更數
+
+    客戶端保存回應中的 version，下次以 since=version 呼叫；
+    has_more 為 true 時應立即繼續呼叫，reset 為 true 時應清除本地資料後重新同步。
+    """
+    try:
+        params = sync_query_schema.load(request.args)
+        changes = ChangeLogService.get_changes(
+            since=params["since"],
+            limit=params["limit"],
+            user_id=int(get_jwt_identity()),
+        )
+        return jsonify(
+            {
+                "version": changes["version"],
+                "has_more": changes["has_more"],
+                "reset": changes["reset"],
+                "matches": _dump_changes(changes["matches"], sync_matches_schema),
+                "members": _dump_changes(changes["members"], sync_members_schema),
+                "ratings": sync_ratings_schema.dump(changes["ratings"]),
+            }
+        ), 200
+
+    except MarshmallowValidationError as err:
+        return jsonify(
+            {
+                "error": "validation_error",
+                "message": "查詢參數格式錯誤",
+                "details": err.messages,
+            }
+        ), 400
+    except AppException as e:
+        return jsonify(e.to_dict()), e.status_code
+    except Exception as e:
+        current_app.logger.error(f"同步資料時發生錯誤: {e}", exc_info=True)
+        return jsonify({"error": "server_error", "message": "同步資料時發生錯誤"}), 500
@@ -1,15 +1,27 @@
 # backend/app/commands/__init__.py
 from flask import Blueprint
 
+from .auth_commands import benchmark_login_command
 from .init_admin import (
     init_admin_command,
     list_admins_command,
     reset_admin_password_command,
 )
+from .leaderboard_commands import (
+    rebuild_member_form_command,
+    rebuild_performance_cube_command,
+    snapshot_leaderboard_command,
+)
 from .rating_commands import (
+    create_season_command,
     rating_stats_command,
+    rating_worker_command,
+    rebuild_context_ratings_command,
+    rebuild_pair_ratings_command,
+    rebuild_rating_snapshots_command,
     recalculate_all_ratings_command,
     reset_all_ratings_command,
+    simulate_ratings_command,
     validate_ratings_command,
 )
 
@@ -22,8 +34,22 @@ cli_commands_bp.cli.add_command(init_admin_command)
 cli_commands_bp.cli.add_command(list_admins_command)
 cli_commands_bp.cli.add_command(reset_admin_password_command)
 
+# 將帳號認證相關指令添加到 Blueprint
+cli_commands_bp.cli.add_command(benchmark_login_command)
+
 # 將所有評分相關指令添加到 Blueprint
 cli_commands_bp.cli.add_command(recalculate_all_ratings_command)
 cli_commands_bp.cli.add_command(reset_all_ratings_command)
 cli_commands_bp.cli.add_command(rating_stats_command)
 cli_commands_bp.cli.add_command(validate_ratings_command)
+cli_commands_bp.cli.add_command(simulate_ratings_command)
+cli_commands_bp.cli.add_command(rating_worker_command)
+cli_commands_bp.cli.add_command(rebuild_rating_snapshots_command)
+cli_commands_bp.cli.add_command(rebuild_pair_ratings_command)
+cli_commands_bp.cli.add_command(rebuild_context_ratings_command)
+cli_commands_bp.cli.add_command(create_season_command)
+
+# 將排行榜相關指令添加到 Blueprint
+cli_commands_bp.cli.add_command(snapshot_leaderboard_command)
+cli_commands_bp.cli.add_command(rebuild_member_form_command)
+cli_commands_bp.cli.add_command(rebuild_performance_cube_command)
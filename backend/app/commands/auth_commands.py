@@ -0,0 +1,91 @@
+# backend/app/commands/auth_commands.py
+"""
+帳號認證相關命令
+
+提供登入效能基準測試，用於調整密碼雜湊參數與執行池設定。
+"""
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ..extensions import db
+from ..models import User
+from ..models.enums.user_enums import UserRoleEnum
+from ..services.auth_service import AuthService
+
+BENCHMARK_USERNAME_PREFIX = "bench_login_"
+BENCHMARK_PASSWORD = "benchmark-password"
+
+
+@click.command("benchmark-login")
+@click.option("--users", default=20, help="測試帳號數量")
+@click.option("--concurrency", default=8, help="同時登入的執行緒數")
+@click.option("--rounds", default=1, help="每個帳號登入次數")
+@with_appcontext
+def benchmark_login_command(users, concurrency, rounds):
+    """
+    登入吞吐量基準測試
+
+    建立暫時帳號後以多執行緒同時呼叫 AuthService.login，
+    回報每秒登入數與延遲分布，結束後刪除測試帳號。
+    雜湊參數請透過 PASSWORD_HASH_METHOD / PASSWORD_HASH_EXECUTOR 等環境變數調整。
+    """
+    config = current_app.config
+    click.echo(click.style("🔐 登入效能基準測試", fg="blue", bold=True))
+    click.echo("=" * 50)
+    click.echo(f"雜湊方法: {config.get('PASSWORD_HASH_METHOD')}")
+    click.echo(
+        f"執行池: {config.get('PASSWORD_HASH_EXECUTOR')}"
+        f" ({config.get('PASSWORD_HASH_WORKERS')} workers)"
+    )
+    click.echo(f"帳號數: {users}，並行數: {concurrency}，每帳號登入 {rounds} 次")
+
+    usernames = [f"{BENCHMARK_USERNAME_PREFIX}{i:04d}" for i in range(users)]
+    app = current_app._get_current_object()
+
+    try:
+        for username in usernames:
+            user = User(username=username, role=UserRoleEnum.MEMBER, is_active=True)
+            user.set_password(BENCHMARK_PASSWORD)
+            db.session.add(user)
+        db.session.commit()
+
+        def timed_login(username):
+            with app.app_context():
+                start = time.perf_counter()
+                AuthService.login(username, BENCHMARK_PASSWORD)
+                elapsed = time.perf_counter() - start
+                db.session.remove()
+                return elapsed
+
+        jobs = usernames * rounds
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(timed_login, jobs))
+        total_seconds = time.perf_counter() - started
+
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        click.echo("\n📊 結果：")
+        click.echo(f"   總登入次數: {len(latencies)}，耗時 {total_seconds:.2f} 秒")
+        click.echo(f"   吞吐量: {len(latencies) / total_seconds:.1f} 次/秒")
+        click.echo(
+            f"   延遲: 平均 {statistics.mean(latencies) * 1000:.1f} ms，"
+            f"p95 {p95 * 1000:.1f} ms，最大 {latencies[-1] * 1000:.1f} ms"
+        )
+
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"❌ 基準測試失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"登入基準測試失敗: {e}")
+
+    finally:
+        User.query.filter(User.username.like(f"{BENCHMARK_USERNAME_PREFIX}%")).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
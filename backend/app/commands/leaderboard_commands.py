@@ -0,0 +1,85 @@
+# backend/app/commands/leaderboard_commands.py
+"""
+排行榜相關命令
+
+snapshot-leaderboard 建議每週排程執行（例如每週一凌晨 cron），
+同一週重複執行會覆蓋該週的快照。
+"""
+
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from ..extensions import db
+from ..services.leaderboard_service import LeaderboardService
+from ..services.member_form_service import MemberFormService
+from ..services.performance_cube_service import PerformanceCubeService
+
+
+@click.command("snapshot-leaderboard")
+@click.option(
+    "--date",
+    "day",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    default=None,
+    help="快照所屬日期（默認為今天），以該週週一為期別",
+)
+@with_appcontext
+def snapshot_leaderboard_command(day):
+    """保存目前排行榜的名次與分數（排行榜名次變化與球員名次軌跡使用）"""
+    try:
+        period_start, count = LeaderboardService.take_snapshot(
+            day.date() if day else None
+        )
+        db.session.commit()
+        click.echo(
+            click.style(
+                f"✅ 已保存 {period_start} 當週排行榜快照（{count} 位球員）", fg="green"
+            )
+        )
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"❌ 保存快照失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"保存排行榜快照失敗: {e}")
+
+
+@click.command("rebuild-member-form")
+@with_appcontext
+def rebuild_member_form_command():
+    """以全部比賽重建球員近況（連勝 / 連敗、近期戰績）"""
+    try:
+        start = time.perf_counter()
+        count = MemberFormService.rebuild()
+        db.session.commit()
+        click.echo(
+            click.style(
+                f"✅ 已重建 {count} 位球員的近況（{time.perf_counter() - start:.1f} 秒）",
+                fg="green",
+            )
+        )
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"❌ 重建失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"重建球員近況失敗: {e}")
+
+
+@click.command("rebuild-performance-cube")
+@with_appcontext
+def rebuild_performance_cube_command():
+    """以全部比賽重建球員表現彙總（場地材質 / 場地環境 / 時段 / 賽制）"""
+    try:
+        start = time.perf_counter()
+        count = PerformanceCubeService.rebuild()
+        db.session.commit()
+        click.echo(
+            click.style(
+                f"✅ 已重建 {count} 筆球員表現彙總（{time.perf_counter() - start:.1f} 秒）",
+                fg="green",
+            )
+        )
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"❌ 重建失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"重建球員表現彙總失敗: {e}")
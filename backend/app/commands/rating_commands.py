@@ -5,22 +5,41 @@
 提供重新計算評分、重置評分等功能的 CLI 指令。
 """
 
+import json
+import time
+
 import click
 from flask import current_app
 from flask.cli import with_appcontext
 from sqlalchemy import func
 
 from ..extensions import db
-from ..models import MatchRecord, Member
+from ..models import MatchRecord, Member, Season
+from ..services.context_rating_service import ContextRatingService
+from ..services.pair_rating_service import PairRatingService
+from ..services.rating_job_service import RatingJobService
 from ..services.rating_service import RatingService, trueskill_env
+from ..services.rating_simulation_service import (
+    SIMULATION_PARAM_KEYS,
+    RatingSimulationService,
+)
+from ..services.rating_snapshot_service import RatingSnapshotService
 
 
 @click.command("recalculate-all-ratings")
 @click.option("--force", is_flag=True, help="強制執行，不詢問確認")
 @click.option("--batch-size", default=50, help="批次處理大小（默認50個球員為一批）")
 @click.option("--dry-run", is_flag=True, help="試運行模式，不實際修改數據庫")
+@click.option(
+    "--parallel",
+    is_flag=True,
+    help="依球員連通分量平行重算全部比賽，最後一次寫回（忽略 --batch-size）",
+)
+@click.option(
+    "--workers", type=int, default=None, help="平行行程數（默認為 CPU 核心數）"
+)
 @with_appcontext
-def recalculate_all_ratings_command(force, batch_size, dry_run):
+def recalculate_all_ratings_command(force, batch_size, dry_run, parallel, workers):
     """
     重新計算所有球員的積分
 
@@ -45,7 +64,10 @@ def recalculate_all_ratings_command(force, batch_size, dry_run):
     click.echo("📊 系統統計：")
     click.echo(f"   總球員數量: {total_members}")
     click.echo(f"   總比賽記錄: {total_matches}")
-    click.echo(f"   批次大小: {batch_size}")
+    if parallel:
+        click.echo(f"   平行行程數: {workers or '自動'}")
+    else:
+        click.echo(f"   批次大小: {batch_size}")
 
     if dry_run:
         click.echo(click.style("🔍 試運行模式 - 不會修改數據庫", fg="yellow"))
@@ -60,6 +82,10 @@ def recalculate_all_ratings_command(force, batch_size, dry_run):
 
     click.echo("\n🚀 開始重新計算積分...")
 
+    if parallel:
+        _recalculate_all_ratings_parallel(workers, dry_run)
+        return
+
     try:
         # 獲取所有球員ID，分批處理
         all_member_ids = db.session.query(Member.id).all()
@@ -133,6 +159,91 @@ def recalculate_all_ratings_command(force, batch_size, dry_run):
             db.session.rollback()
 
 
+def _recalculate_all_ratings_parallel(workers, dry_run):
+    """以連通分量切分後平行重算全部評分"""
+    try:
+        if dry_run:
+            matches = RatingService._load_match_history()
+            components = RatingService._partition_matches(
+                [match for match in matches if match[0] and match[1]]
+            )
+            sizes = sorted((len(c) for c in components), reverse=True)
+            click.echo(click.style("🔍 試運行完成！", fg="blue", bold=True))
+            click.echo(f"   獨立連通分量: {len(components)} 個")
+            if sizes:
+                click.echo(f"   最大分量比賽數: {sizes[0]}（共 {sum(sizes)} 場）")
+            return
+
+        stats = RatingService.recalculate_all_ratings(workers=workers)
+        db.session.commit()
+
+        click.echo("\n" + "=" * 50)
+        click.echo(click.style("🎉 積分重計算完成！", fg="green", bold=True))
+        click.echo(f"   成功處理: {stats['players']} 個球員")
+        click.echo(f"   比賽記錄: {stats['matches']} 場")
+        click.echo(
+            f"   連通分量: {stats['components']} 個（{stats['workers']} 個行程）"
+        )
+        _show_rating_statistics()
+
+    except Exception as e:
+        click.echo(click.style(f"❌ 重計算過程中發生錯誤: {str(e)}", fg="red"))
+        current_app.logger.error(f"積分平行重計算失敗: {e}")
+        if not dry_run:
+            db.session.rollback()
+
+
+@click.command("rating-worker")
+@click.option("--once", is_flag=True, help="處理完目前佇列後即結束")
+@click.option("--poll-interval", default=2.0, help="佇列為空時的輪詢間隔（秒）")
+@click.option("--max-jobs", type=int, default=None, help="最多處理的工作數")
+@with_appcontext
+def rating_worker_command(once, poll_interval, max_jobs):
+    """
+    評分工作佇列 worker
+
+    依提交順序處理 rating_jobs 中的評分更新與重算工作。
+    需搭配 RATING_UPDATE_MODE=async 使用，同一時間只能執行一個 worker。
+    """
+    with RatingJobService.worker_lock() as acquired:
+        if not acquired:
+            click.echo(click.style("❌ 已有其他評分 worker 執行中", fg="red"))
+            return
+        _run_rating_worker(once, poll_interval, max_jobs)
+
+
+def _run_rating_worker(once, poll_interval, max_jobs):
+    """worker 主迴圈（需持有 worker_lock）"""
+    click.echo(click.style("⚙️  評分 worker 啟動", fg="blue", bold=True))
+
+    requeued = RatingJobService.requeue_stale_jobs()
+    if requeued:
+        click.echo(click.style(f"   重新排入 {requeued} 個中斷的工作", fg="yellow"))
+
+    total = {"processed": 0, "failed": 0}
+    try:
+        while True:
+            remaining = None if max_jobs is None else max_jobs - sum(total.values())
+            stats = RatingJobService.run_pending(max_jobs=remaining)
+            for key in total:
+                total[key] += stats[key]
+            if stats["processed"] or stats["failed"]:
+                click.echo(
+                    f"   ✅ 完成 {stats['processed']} 個工作"
+                    + (f"，失敗 {stats['failed']} 個" if stats["failed"] else "")
+                )
+
+            if once or (max_jobs is not None and sum(total.values()) >= max_jobs):
+                break
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+    click.echo(
+        f"評分 worker 結束：完成 {total['processed']} 個，失敗 {total['failed']} 個"
+    )
+
+
 @click.command("reset-all-ratings")
 @click.option("--force", is_flag=True, help="強制執行，不詢問確認")
 @click.option("--dry-run", is_flag=True, help="試運行模式，不實際修改數據庫")
@@ -169,6 +280,10 @@ def reset_all_ratings_command(force, dry_run):
             Member.query.update(
                 {Member.mu: trueskill_env.mu, Member.sigma: trueskill_env.sigma}
             )
+            # 評分歷史一併清除
+            RatingSnapshotService.replace([])
+            PairRatingService.replace([])
+            ContextRatingService.replace([])
             db.session.commit()
             click.echo(
                 click.style(f"✅ 已重置 {total_members} 個球員的積分", fg="green")
@@ -187,6 +302,105 @@ def reset_all_ratings_command(force, dry_run):
             db.session.rollback()
 
 
+@click.command("rebuild-rating-snapshots")
+@click.option(
+    "--workers", type=int, default=None, help="平行行程數（默認為 CPU 核心數）"
+)
+@with_appcontext
+def rebuild_rating_snapshots_command(workers):
+    """
+    重演全部比賽以重建每場比賽後的評分快照（歷史排行榜使用）
+
+    只重建快照，不修改球員目前的評分。
+    """
+    click.echo(click.style("🕒 重建評分快照", fg="blue", bold=True))
+    try:
+        start = time.perf_counter()
+        stats = RatingService.recalculate_all_ratings(
+            workers=workers, snapshots_only=True
+        )
+        db.session.commit()
+        click.echo(
+            click.style(
+                f"✅ 已重建 {stats['matches']} 場比賽的評分快照"
+                f"（{time.perf_counter() - start:.1f} 秒）",
+                fg="green",
+            )
+        )
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"❌ 重建失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"重建評分快照失敗: {e}")
+
+
+@click.command("rebuild-pair-ratings")
+@with_appcontext
+def rebuild_pair_ratings_command():
+    """依時間順序重演全部雙打比賽，重建組合評分（不影響個人評分）"""
+    click.echo(click.style("👥 重建雙打組合評分", fg="blue", bold=True))
+    try:
+        start = time.perf_counter()
+        count = RatingService.recalculate_pair_ratings()
+        db.session.commit()
+        click.echo(
+            click.style(
+                f"✅ 已重建 {count} 個組合的評分"
+                f"（{time.perf_counter() - start:.1f} 秒）",
+                fg="green",
+            )
+        )
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"❌ 重建失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"重建組合評分失敗: {e}")
+
+
+@click.command("rebuild-context-ratings")
+@with_appcontext
+def rebuild_context_ratings_command():
+    """依時間順序重演全部比賽，重建情境評分（場地材質 / 場地環境 / 比賽類型）"""
+    click.echo(click.style("🏟️ 重建情境評分", fg="blue", bold=True))
+    try:
+        start = time.perf_counter()
+        count = RatingService.recalculate_context_ratings()
+        db.session.commit()
+        click.echo(
+            click.style(
+                f"✅ 已重建 {count} 筆情境評分（{time.perf_counter() - start:.1f} 秒）",
+                fg="green",
+            )
+        )
+    except Exception as e:
+        db.session.rollback()
+        click.echo(click.style(f"❌ 重建失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"重建情境評分失敗: {e}")
+
+
+@click.command("create-season")
+@click.argument("name")
+@click.argument("start_date", type=click.DateTime(formats=["%Y-%m-%d"]))
+@click.argument("end_date", type=click.DateTime(formats=["%Y-%m-%d"]))
+@with_appcontext
+def create_season_command(name, start_date, end_date):
+    """建立賽季（排行榜 season 參數使用），日期格式 YYYY-MM-DD"""
+    if end_date < start_date:
+        click.echo(click.style("❌ 結束日期不能早於開始日期", fg="red"))
+        return
+    if Season.query.filter_by(name=name).first():
+        click.echo(click.style(f"❌ 賽季 '{name}' 已存在", fg="red"))
+        return
+
+    season = Season(name=name, start_date=start_date.date(), end_date=end_date.date())
+    db.session.add(season)
+    db.session.commit()
+    click.echo(
+        click.style(
+            f"✅ 已建立賽季 #{season.id} {name}（{season.start_date} ~ {season.end_date}）",
+            fg="green",
+        )
+    )
+
+
 @click.command("rating-stats")
 @with_appcontext
 def rating_stats_command():
@@ -311,3 +525,79 @@ def validate_ratings_command():
     except Exception as e:
         click.echo(click.style(f"❌ 驗證過程中發生錯誤: {str(e)}", fg="red"))
         current_app.logger.error(f"評分驗證失敗: {e}")
+
+
+def _parse_param_option(values):
+    """解析 --param name=v1,v2 選項為參數網格"""
+    grid = {}
+    for value in values:
+        name, _, raw_values = value.partition("=")
+        name = name.strip()
+        if name not in SIMULATION_PARAM_KEYS or not raw_values:
+            raise click.BadParameter(
+                f"格式應為 name=v1,v2，可用參數: {', '.join(SIMULATION_PARAM_KEYS)}",
+                param_hint="--param",
+            )
+        try:
+            grid[name] = [float(v) for v in raw_values.split(",") if v.strip()]
+        except ValueError as e:
+            raise click.BadParameter(
+                f"{name} 的值必須為數字", param_hint="--param"
+            ) from e
+    return grid
+
+
+@click.command("simulate-ratings")
+@click.option(
+    "--param",
+    "params",
+    multiple=True,
+    help="參數網格，格式 name=v1,v2（可重複指定），例如 --param gender_bonus_mu=0.4,0.6",
+)
+@click.option(
+    "--workers", type=int, default=None, help="平行行程數（默認為 CPU 核心數）"
+)
+@click.option("--top", default=10, help="每組參數顯示的排行榜人數")
+@click.option("--json", "as_json", is_flag=True, help="以 JSON 輸出完整結果")
+@with_appcontext
+def simulate_ratings_command(params, workers, top, as_json):
+    """
+    以不同參數模擬重算評分（唯讀，不修改數據庫）
+
+    在記憶體中重演全部歷史比賽，輸出各組參數的預測對數損失、
+    預測準確率與模擬排行榜，結果依對數損失由低到高排序。
+    """
+    param_sets = RatingSimulationService.expand_grid(_parse_param_option(params))
+
+    if not as_json:
+        click.echo(click.style("🧪 評分參數模擬", fg="blue", bold=True))
+        click.echo("=" * 50)
+        click.echo(f"參數組數: {len(param_sets)}")
+
+    try:
+        results = RatingSimulationService.run_grid(param_sets, workers=workers, top=top)
+    except Exception as e:
+        click.echo(click.style(f"❌ 模擬失敗: {str(e)}", fg="red"))
+        current_app.logger.error(f"評分模擬失敗: {e}")
+        return
+
+    if as_json:
+        click.echo(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    for index, result in enumerate(results, 1):
+        log_loss = result["log_loss"]
+        accuracy = result["accuracy"]
+        click.echo(
+            f"\n#{index} " + ", ".join(f"{k}={v}" for k, v in result["params"].items())
+        )
+        click.echo(
+            f"   比賽數: {result['evaluated_matches']}"
+            f"   log-loss: {log_loss if log_loss is not None else '-'}"
+            f"   準確率: {f'{accuracy:.2%}' if accuracy is not None else '-'}"
+        )
+        for entry in result["leaderboard"]:
+            click.echo(
+                f"   {entry['rank']:>3}. {entry['name']}: {entry['score']:.2f}"
+                f" (μ={entry['mu']:.2f}, σ={entry['sigma']:.2f})"
+            )
@@ -11,6 +11,26 @@ class Config:
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
     JWT_ACCESS_TOKEN_EXPIRES = datetime.timedelta(hours=1)  # Access Token 有效期
     JWT_REFRESH_TOKEN_EXPIRES = datetime.timedelta(days=30)  # Refresh Token 有效期
+    # 角色/啟用狀態快取秒數（token claims 同樣以此為信任期限）
+    PRINCIPAL_CACHE_TTL_SECONDS = 60
+
+    # 密碼雜湊：演算法/成本變更後，使用者下次登入時自動重新雜湊
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_SALT_LENGTH = int(os.environ.get("PASSWORD_SALT_LENGTH", 16))
+    # none / thread / process：雜湊運算是否交給有上限的執行池
+    PASSWORD_HASH_EXECUTOR = os.environ.get("PASSWORD_HASH_EXECUTOR", "none")
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 4))
+
+    # 評分更新模式：sync 在請求中同步更新；async 寫入 rating_jobs 由 rating-worker 處理
+    RATING_UPDATE_MODE = os.environ.get("RATING_UPDATE_MODE", "sync")
+
+    # 球員名錄快照：其他行程的變更最晚在此秒數後反映
+    PLAYER_DIRECTORY_TTL_SECONDS = 30
+
+    # 即時事件推播：memory 僅限同一行程；postgres 以 LISTEN/NOTIFY 跨行程
+    EVENT_BUS_BACKEND = os.environ.get("EVENT_BUS_BACKEND", "memory")
+    EVENT_BUS_CHANNEL = os.environ.get("EVENT_BUS_CHANNEL", "app_events")
+    EVENT_STREAM_MAX_SECONDS = 300  # 單一 SSE 連線最長時間，之後由瀏覽器自動重連
 
     # WTF_CSRF_ENABLED = False
     DEBUG = False
@@ -28,6 +48,7 @@ class TestingConfig(Config):
         os.environ.get("TEST_DATABASE_URL") or "sqlite:///:memory:"
     )
     WTF_CSRF_ENABLED = False
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"  # 測試時降低雜湊成本
 
 
 class ProductionConfig(Config):
@@ -40,6 +61,20 @@ class RatingCalculationConfig(Config):
     TRUESKILL_MIN_SIGMA = 1.0
     TRUESKILL_EXP_THRESHOLD = 10
 
+    # 閒置不確定度：最後一場比賽後超過寬限天數，每天以變異數累加 decay² 放大 σ
+    # （讀取時計算，不寫回 Member；上限為初始 σ）
+    INACTIVITY_GRACE_DAYS = 30
+    INACTIVITY_SIGMA_DECAY = 0.1
+
+    # 調整勝率（Beta 先驗平滑）：(勝場 + 平均 × 權重) / (場數 + 權重)，
+    # 相當於每位球員先有「權重」場勝率為「平均」的比賽
+    WIN_RATE_PRIOR_MEAN = 0.5
+    WIN_RATE_PRIOR_WEIGHT = 10
+
+    # 情境評分追蹤的 Match 欄位（court_surface / court_environment / match_type），
+    # 設為空 tuple 可停用
+    CONTEXT_RATING_DIMENSIONS = ("court_surface", "court_environment", "match_type")
+
 
 config_by_name = dict(
     development=DevelopmentConfig,
@@ -1,7 +1,19 @@
+from . import member_search_index  # noqa: F401  註冊搜尋索引 DDL
+from .change_log import ChangeLog
+from .context_rating import ContextRating
+from .leaderboard_snapshot import LeaderboardSnapshot
+from .live_match import LiveMatch, LivePointEvent
 from .match import Match
+from .match_game import MatchGame
 from .match_record import MatchRecord
 from .member import Member
+from .member_form import MemberForm
+from .member_performance import MemberPerformance
 from .organization import Organization
+from .pair_rating import PairRating
 from .player_stats import PlayerStats
 from .racket import Racket
+from .rating_job import RatingJob
+from .rating_snapshot import RatingSnapshot
+from .season import Season
 from .user import User
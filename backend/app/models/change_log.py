@@ -0,0 +1,55 @@
+# backend/app/models/change_log.py
+import datetime
+
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy import Integer
+
+from ..extensions import db
+from .enums.sync_enums import ChangeActionEnum, ChangeEntityEnum
+
+
+class ChangeLog(db.Model):
+    """
+    資料變更紀錄（離線同步用）
+
+    與資料變更在同一交易中寫入；version 於提交時依提交順序配置，即為同步版本號
+    （提交前為空）。客戶端保存最後取得的版本，下次只需取得 version 更大的紀錄。
+    """
+
+    __tablename__ = "change_log"
+
+    id = db.Column(Integer, primary_key=True, comment="變更紀錄ID")
+    version = db.Column(Integer, nullable=True, comment="同步版本號（提交順序）")
+    entity_type = db.Column(
+        SQLAlchemyEnum(
+            ChangeEntityEnum,
+            name="change_entity_enum",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="資料類型",
+    )
+    entity_id = db.Column(Integer, nullable=False, comment="資料ID")
+    action = db.Column(
+        SQLAlchemyEnum(
+            ChangeActionEnum,
+            name="change_action_enum",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="變更動作",
+    )
+    changed_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.now, comment="變更時間"
+    )
+
+    __table_args__ = (
+        db.Index("ix_change_log_entity", "entity_type", "entity_id"),
+        db.Index("ix_change_log_version", "version", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ChangeLog id={self.id} v{self.version}, {self.entity_type}:{self.entity_id} "
+            f"{self.action}>"
+        )
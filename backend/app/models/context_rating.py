@@ -0,0 +1,53 @@
+# backend/app/models/context_rating.py
+from sqlalchemy import Float, ForeignKey, Integer, String
+
+from ..config import RatingCalculationConfig
+from ..extensions import db
+from .enums import CourtEnvironmentEnum, CourtSurfaceEnum, MatchTypeEnum
+
+# 可建立情境評分的 Match 欄位與其列舉；情境以列舉值表示（各列舉的值互不重複）
+CONTEXT_DIMENSIONS = {
+    "court_surface": CourtSurfaceEnum,
+    "court_environment": CourtEnvironmentEnum,
+    "match_type": MatchTypeEnum,
+}
+
+
+def tracked_contexts() -> dict:
+    """目前追蹤的情境 {情境值: (Match 欄位, 列舉成員)}，依 CONTEXT_RATING_DIMENSIONS 設定"""
+    return {
+        member.value: (dimension, member)
+        for dimension in RatingCalculationConfig.CONTEXT_RATING_DIMENSIONS
+        for member in CONTEXT_DIMENSIONS[dimension]
+    }
+
+
+class ContextRating(db.Model):
+    """
+    情境評分（例如紅土 / 硬地、室內 / 室外、單打 / 雙打）
+
+    每位球員在每個情境一列，只計入該情境的比賽；與主評分在同一次更新中計算。
+    """
+
+    __tablename__ = "context_ratings"
+
+    context = db.Column(String(20), primary_key=True, comment="情境（列舉值）")
+    member_id = db.Column(
+        Integer,
+        ForeignKey(
+            "members.id", name="fk_context_ratings_member_id", ondelete="CASCADE"
+        ),
+        primary_key=True,
+        comment="球員ID",
+    )
+    mu = db.Column(Float, nullable=False, comment="情境 μ")
+    sigma = db.Column(Float, nullable=False, comment="情境 σ")
+    matches_played = db.Column(Integer, nullable=False, default=0, comment="比賽場數")
+
+    __table_args__ = (db.Index("ix_context_ratings_member_id", "member_id"),)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ContextRating {self.context} member={self.member_id}, "
+            f"mu={self.mu:.3f}, sigma={self.sigma:.3f}>"
+        )
@@ -1,6 +1,7 @@
 from .bio_enums import BloodTypeEnum, GenderEnum
 
 # 明確導出所有需要的 enum
+from .live_enums import LiveMatchStatusEnum
 from .match_enums import (
     CourtEnvironmentEnum,
     CourtSurfaceEnum,
@@ -13,6 +14,8 @@ from .match_enums import (
     MatchTypeEnum,
 )
 from .member_enums import GuestRoleEnum
+from .rating_enums import RatingJobTypeEnum, RatingStatusEnum
+from .sync_enums import ChangeActionEnum, ChangeEntityEnum
 from .user_enums import UserRoleEnum
 
 __all__ = [
@@ -29,4 +32,9 @@ __all__ = [
     BloodTypeEnum,
     GenderEnum,
     MatchStartServeEnum,
+    RatingStatusEnum,
+    RatingJobTypeEnum,
+    ChangeEntityEnum,
+    ChangeActionEnum,
+    LiveMatchStatusEnum,
 ]
@@ -0,0 +1,12 @@
+# your_app/enums/live_enums.py
+from __future__ import annotations
+
+from .base import BaseEnum
+
+
+class LiveMatchStatusEnum(BaseEnum):
+    """即時計分比賽狀態"""
+
+    IN_PROGRESS = "in_progress"  # 計分中
+    FINALIZED = "finalized"  # 已結束並寫入比賽記錄
+    ABANDONED = "abandoned"  # 中止，不寫入比賽記錄
@@ -0,0 +1,20 @@
+# your_app/enums/rating_enums.py
+from __future__ import annotations
+
+from .base import BaseEnum
+
+
+class RatingStatusEnum(BaseEnum):
+    """評分更新狀態"""
+
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class RatingJobTypeEnum(BaseEnum):
+    """評分工作類型"""
+
+    MATCH_UPDATE = "match_update"  # 單場比賽的增量更新
+    RECALCULATE = "recalculate"  # 指定球員的歷史重算
@@ -0,0 +1,20 @@
+# your_app/enums/sync_enums.py
+from __future__ import annotations
+
+from .base import BaseEnum
+
+
+class ChangeEntityEnum(BaseEnum):
+    """變更紀錄的資料類型"""
+
+    MATCH_RECORD = "match_record"
+    MEMBER = "member"
+    RATING = "rating"  # 球員評分 (mu / sigma)，entity_id 為 member id
+
+
+class ChangeActionEnum(BaseEnum):
+    """變更動作"""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
@@ -0,0 +1,37 @@
+# backend/app/models/leaderboard_snapshot.py
+from sqlalchemy import Date, Float, ForeignKey, Integer
+
+from ..extensions import db
+
+
+class LeaderboardSnapshot(db.Model):
+    """
+    每週排行榜快照（每位球員每期一列）
+
+    由 `flask snapshot-leaderboard` 定期寫入預設排行榜的名次與分數，
+    排行榜以最近一期快照計算名次與分數變化。
+    """
+
+    __tablename__ = "leaderboard_snapshots"
+
+    period_start = db.Column(Date, primary_key=True, comment="期別開始日（週一）")
+    member_id = db.Column(
+        Integer,
+        ForeignKey(
+            "members.id", name="fk_leaderboard_snapshots_member_id", ondelete="CASCADE"
+        ),
+        primary_key=True,
+        comment="球員ID",
+    )
+    rank = db.Column(Integer, nullable=False, comment="名次")
+    score = db.Column(Float, nullable=False, comment="保守分數 (μ - 3σ)")
+
+    __table_args__ = (
+        db.Index("ix_leaderboard_snapshots_member_period", "member_id", "period_start"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LeaderboardSnapshot {self.period_start} member={self.member_id}, "
+            f"rank={self.rank}, score={self.score:.2f}>"
+        )
@@ -0,0 +1,251 @@
+# backend/app/models/live_match.py
+import datetime
+
+from sqlalchemy import Date, ForeignKey, Integer, SmallInteger
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy.orm import relationship
+
+from ..extensions import db
+from .enums import (
+    CourtEnvironmentEnum,
+    CourtSurfaceEnum,
+    MatchFormatEnum,
+    MatchTimeSlotEnum,
+    MatchTypeEnum,
+)
+from .enums.live_enums import LiveMatchStatusEnum
+from .enums.match_enums import MatchStartServeEnum
+from .match_record import serve_side_for_game
+
+# 贏得比賽所需局數
+REQUIRED_GAMES_BY_FORMAT = {
+    MatchFormatEnum.GAMES_5: 3,
+    MatchFormatEnum.GAMES_7: 4,
+    MatchFormatEnum.GAMES_9: 5,
+}
+
+
+class LiveMatch(db.Model):
+    """
+    即時計分中的比賽（快照）
+
+    每一分寫入 LivePointEvent 的同時更新本列的目前比分，
+    讀取目前比分不需要重播整個事件紀錄。比賽結束後寫入 MatchRecord。
+    """
+
+    __tablename__ = "live_matches"
+
+    id = db.Column(Integer, primary_key=True, comment="即時比賽唯一識別碼")
+    status = db.Column(
+        SQLAlchemyEnum(
+            LiveMatchStatusEnum,
+            name="live_match_status_enum",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        default=LiveMatchStatusEnum.IN_PROGRESS,
+        index=True,
+        comment="計分狀態",
+    )
+
+    # --- 比賽資訊（結束時寫入 Match） ---
+    match_date = db.Column(Date, nullable=False, comment="比賽日期")
+    match_type = db.Column(
+        SQLAlchemyEnum(
+            MatchTypeEnum,
+            name="match_type_enum_matches",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="比賽類型",
+    )
+    match_format = db.Column(
+        SQLAlchemyEnum(
+            MatchFormatEnum,
+            name="match_format_enum_matches",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="比賽賽制",
+    )
+    match_time_slot = db.Column(
+        SQLAlchemyEnum(
+            MatchTimeSlotEnum,
+            name="match_time_slot_enum_matches",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=True,
+        comment="比賽時間段",
+    )
+    court_surface = db.Column(
+        SQLAlchemyEnum(
+            CourtSurfaceEnum,
+            name="court_surface_enum_matches",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=True,
+        comment="場地材質",
+    )
+    court_environment = db.Column(
+        SQLAlchemyEnum(
+            CourtEnvironmentEnum,
+            name="court_environment_enum_matches",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=True,
+        comment="場地環境",
+    )
+
+    player1_id = db.Column(
+        Integer,
+        ForeignKey("members.id", name="fk_live_matches_p1_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    player2_id = db.Column(
+        Integer,
+        ForeignKey("members.id", name="fk_live_matches_p2_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    player3_id = db.Column(
+        Integer,
+        ForeignKey("members.id", name="fk_live_matches_p3_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    player4_id = db.Column(
+        Integer,
+        ForeignKey("members.id", name="fk_live_matches_p4_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    first_serve_side = db.Column(
+        SQLAlchemyEnum(
+            MatchStartServeEnum,
+            name="serve_start_enum_match_records",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="第一局發球方",
+    )
+
+    # --- 目前比分快照 ---
+    current_game = db.Column(
+        SmallInteger, nullable=False, default=1, comment="目前進行中的局數"
+    )
+    a_points = db.Column(SmallInteger, nullable=False, default=0, comment="本局A方得分")
+    b_points = db.Column(SmallInteger, nullable=False, default=0, comment="本局B方得分")
+    a_games = db.Column(SmallInteger, nullable=False, default=0, comment="A方已贏局數")
+    b_games = db.Column(SmallInteger, nullable=False, default=0, comment="B方已贏局數")
+    completed_games = db.Column(
+        db.JSON, nullable=False, default=list, comment="已結束各局比分 [[a, b], ...]"
+    )
+    last_sequence = db.Column(
+        Integer, nullable=False, default=0, comment="最後一分的事件序號"
+    )
+
+    match_record_id = db.Column(
+        Integer,
+        ForeignKey(
+            "match_records.id",
+            name="fk_live_matches_match_record_id",
+            ondelete="SET NULL",
+        ),
+        nullable=True,
+        comment="結束後寫入的比賽記錄ID",
+    )
+    match_record = relationship("MatchRecord")
+
+    created_by_user_id = db.Column(
+        Integer,
+        ForeignKey("users.id", name="fk_live_matches_created_by", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+        comment="計分員（建立者）",
+    )
+
+    started_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.now, comment="開始時間"
+    )
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.datetime.now,
+        comment="最後更新時間",
+    )
+    finished_at = db.Column(db.DateTime, nullable=True, comment="結束時間")
+
+    def __repr__(self) -> str:
+        return (
+            f"<LiveMatch id={self.id}, game={self.current_game}, "
+            f"{self.a_games}-{self.b_games} ({self.a_points}-{self.b_points})>"
+        )
+
+    @property
+    def required_games(self) -> int:
+        return REQUIRED_GAMES_BY_FORMAT.get(self.match_format, 5)
+
+    @property
+    def is_final_game(self) -> bool:
+        """目前是否為決勝局"""
+        return self.current_game == self.required_games * 2 - 1
+
+    @property
+    def serve_side(self) -> str:
+        """目前這一局的發球方"""
+        return serve_side_for_game(self.first_serve_side, self.current_game)
+
+
+class LivePointEvent(db.Model):
+    """
+    即時計分的逐分事件（只新增不修改）
+
+    sequence 在同一場比賽內從 1 開始連續遞增，客戶端以此取得漏接的事件。
+    """
+
+    __tablename__ = "live_point_events"
+
+    id = db.Column(Integer, primary_key=True, comment="事件唯一識別碼")
+    live_match_id = db.Column(
+        Integer,
+        ForeignKey(
+            "live_matches.id",
+            name="fk_live_point_events_live_match_id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        comment="所屬即時比賽ID",
+    )
+    sequence = db.Column(Integer, nullable=False, comment="比賽內的事件序號")
+    game_number = db.Column(SmallInteger, nullable=False, comment="局數")
+    scoring_side = db.Column(
+        SQLAlchemyEnum(
+            MatchStartServeEnum,
+            name="serve_start_enum_match_records",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="得分方",
+    )
+    server_side = db.Column(
+        SQLAlchemyEnum(
+            MatchStartServeEnum,
+            name="serve_start_enum_match_records",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="發球方",
+    )
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.now, comment="記錄時間"
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "live_match_id", "sequence", name="uq_live_point_events_sequence"
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<LivePointEvent match={self.live_match_id}, #{self.sequence}, "
+            f"game={self.game_number}, {self.scoring_side}>"
+        )
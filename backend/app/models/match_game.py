@@ -0,0 +1,48 @@
+# backend/app/models/match_game.py
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy import ForeignKey, Integer, SmallInteger
+from sqlalchemy.orm import relationship
+
+from ..extensions import db
+from .enums.match_enums import MatchStartServeEnum
+
+
+class MatchGame(db.Model):
+    """
+    比賽的單局比分（每局一列）
+
+    只儲存有比分的局；局數與發球方可直接在 SQL 中彙總（例如 deuce 率、保發率）。
+    """
+
+    __tablename__ = "match_games"
+
+    match_record_id = db.Column(
+        Integer,
+        ForeignKey(
+            "match_records.id",
+            name="fk_match_games_match_record_id",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+        comment="所屬比賽記錄ID",
+    )
+    game_number = db.Column(SmallInteger, primary_key=True, comment="局數 (1-9)")
+    a_score = db.Column(SmallInteger, nullable=False, default=0, comment="A方得分")
+    b_score = db.Column(SmallInteger, nullable=False, default=0, comment="B方得分")
+    server_side = db.Column(
+        SQLAlchemyEnum(
+            MatchStartServeEnum,
+            name="serve_start_enum_match_records",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=True,
+        comment="本局發球方（未記錄第一局發球方時為空）",
+    )
+
+    match_record = relationship("MatchRecord", back_populates="games")
+
+    def __repr__(self) -> str:
+        return (
+            f"<MatchGame record={self.match_record_id}, game={self.game_number}, "
+            f"{self.a_score}-{self.b_score}>"
+        )
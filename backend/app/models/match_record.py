@@ -1,11 +1,50 @@
 # backend/app/models/match_record.py
 from sqlalchemy import Enum as SQLAlchemyEnum
-from sqlalchemy import ForeignKey, Integer
+from sqlalchemy import ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 from ..extensions import db
 from .enums import MatchOutcomeEnum
 from .enums.match_enums import MatchStartServeEnum
+from .enums.rating_enums import RatingStatusEnum
+from .match_game import MatchGame
+
+MAX_GAMES = 9
+
+
+def _game_score_property(game_number: int, side: str) -> property:
+    """以 gameN_a_score / gameN_b_score 屬性讀寫 games 中的單局比分"""
+    index = 0 if side == "a" else 1
+
+    def getter(self) -> int:
+        return self.get_game_score(game_number)[index]
+
+    def setter(self, value: int) -> None:
+        scores = list(self.get_game_score(game_number))
+        scores[index] = value or 0
+        self.set_game_score(game_number, *scores)
+
+    return property(getter, setter)
+
+
+def serve_side_for_game(first_serve_side: MatchStartServeEnum, game_number: int) -> str:
+    """
+    依第一局發球方推算指定局數的發球方
+
+    Returns:
+        str: 'side_a' / 'side_b'，局數超出範圍或未記錄第一局發球方時為 None
+    """
+    if not (1 <= game_number <= MAX_GAMES) or not first_serve_side:
+        return None
+
+    # 奇數局和第一局發球方相同，偶數局相反
+    if game_number % 2 == 1:
+        return first_serve_side.value
+    return (
+        MatchStartServeEnum.SIDE_B.value
+        if first_serve_side == MatchStartServeEnum.SIDE_A
+        else MatchStartServeEnum.SIDE_A.value
+    )
 
 
 class MatchRecord(db.Model):
@@ -79,6 +118,28 @@ class MatchRecord(db.Model):
         comment="A方視角的比賽結果 (勝/負)",
     )
 
+    # 客戶端冪等鍵：離線/重送時以此辨識同一場比賽，避免重複建立
+    idempotency_key = db.Column(
+        String(64), unique=True, nullable=True, comment="客戶端冪等鍵"
+    )
+    # 建立請求內容的 SHA-256：同一冪等鍵搭配不同內容時拒絕，而非回傳舊記錄
+    idempotency_fingerprint = db.Column(
+        String(64), nullable=True, comment="冪等請求內容指紋"
+    )
+
+    # 評分更新狀態（非同步模式下由 rating-worker 更新）
+    rating_status = db.Column(
+        SQLAlchemyEnum(
+            RatingStatusEnum,
+            name="rating_status_enum_match_records",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        default=RatingStatusEnum.DONE,
+        server_default=RatingStatusEnum.DONE.value,
+        comment="評分更新狀態",
+    )
+
     # --- 每局詳細比分欄位 ---
     first_serve_side = db.Column(
         SQLAlchemyEnum(
@@ -89,41 +150,14 @@ class MatchRecord(db.Model):
         nullable=True,
         comment="第一局發球方 (A方/B方)",
     )
-    # 第1局比分
-    game1_a_score = db.Column(Integer, nullable=True, default=0, comment="第1局A方得分")
-    game1_b_score = db.Column(Integer, nullable=True, default=0, comment="第1局B方得分")
-
-    # 第2局比分
-    game2_a_score = db.Column(Integer, nullable=True, default=0, comment="第2局A方得分")
-    game2_b_score = db.Column(Integer, nullable=True, default=0, comment="第2局B方得分")
-
-    # 第3局比分
-    game3_a_score = db.Column(Integer, nullable=True, default=0, comment="第3局A方得分")
-    game3_b_score = db.Column(Integer, nullable=True, default=0, comment="第3局B方得分")
-
-    # 第4局比分
-    game4_a_score = db.Column(Integer, nullable=True, default=0, comment="第4局A方得分")
-    game4_b_score = db.Column(Integer, nullable=True, default=0, comment="第4局B方得分")
-
-    # 第5局比分
-    game5_a_score = db.Column(Integer, nullable=True, default=0, comment="第5局A方得分")
-    game5_b_score = db.Column(Integer, nullable=True, default=0, comment="第5局B方得分")
-
-    # 第6局比分
-    game6_a_score = db.Column(Integer, nullable=True, default=0, comment="第6局A方得分")
-    game6_b_score = db.Column(Integer, nullable=True, default=0, comment="第6局B方得分")
-
-    # 第7局比分
-    game7_a_score = db.Column(Integer, nullable=True, default=0, comment="第7局A方得分")
-    game7_b_score = db.Column(Integer, nullable=True, default=0, comment="第7局B方得分")
-
-    # 第8局比分
-    game8_a_score = db.Column(Integer, nullable=True, default=0, comment="第8局A方得分")
-    game8_b_score = db.Column(Integer, nullable=True, default=0, comment="第8局B方得分")
-
-    # 第9局比分
-    game9_a_score = db.Column(Integer, nullable=True, default=0, comment="第9局A方得分")
-    game9_b_score = db.Column(Integer, nullable=True, default=0, comment="第9局B方得分")
+    # 每局比分存於 match_games（每局一列）
+    games = relationship(
+        "MatchGame",
+        back_populates="match_record",
+        order_by="MatchGame.game_number",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     # --- 關聯到選手統計（保留）---
     player_stats_entries = relationship(
@@ -133,8 +167,41 @@ class MatchRecord(db.Model):
     def __repr__(self) -> str:
         return f"<MatchRecord id={self.id}, {self.a_games}-{self.b_games}>"
 
+    # --- 每局比分欄位（API 相容，實際存於 games）---
+    game1_a_score = _game_score_property(1, "a")
+    game1_b_score = _game_score_property(1, "b")
+    game2_a_score = _game_score_property(2, "a")
+    game2_b_score = _game_score_property(2, "b")
+    game3_a_score = _game_score_property(3, "a")
+    game3_b_score = _game_score_property(3, "b")
+    game4_a_score = _game_score_property(4, "a")
+    game4_b_score = _game_score_property(4, "b")
+    game5_a_score = _game_score_property(5, "a")
+    game5_b_score = _game_score_property(5, "b")
+    game6_a_score = _game_score_property(6, "a")
+    game6_b_score = _game_score_property(6, "b")
+    game7_a_score = _game_score_property(7, "a")
+    game7_b_score = _game_score_property(7, "b")
+    game8_a_score = _game_score_property(8, "a")
+    game8_b_score = _game_score_property(8, "b")
+    game9_a_score = _game_score_property(9, "a")
+    game9_b_score = _game_score_property(9, "b")
+
     # --- 🔥 新增：每局比分便利方法 ---
 
+    def _get_game(self, game_number: int):
+        for game in self.games:
+            if game.game_number == game_number:
+                return game
+        return None
+
+    def _played_games(self) -> list:
+        """有比分的局，依局數排序"""
+        return sorted(
+            (game for game in self.games if game.a_score or game.b_score),
+            key=lambda game: game.game_number,
+        )
+
     def get_game_score(self, game_number: int) -> tuple[int, int]:
         """
         獲取指定局數的比分
@@ -145,34 +212,45 @@ class MatchRecord(db.Model):
         Returns:
             tuple: (A方得分, B方得分)
         """
-        if not (1 <= game_number <= 9):
+        game = self._get_game(game_number)
+        if game is None:
             return (0, 0)
-
-        a_score_attr = f"game{game_number}_a_score"
-        b_score_attr = f"game{game_number}_b_score"
-
-        a_score = getattr(self, a_score_attr, 0) or 0
-        b_score = getattr(self, b_score_attr, 0) or 0
-
-        return (a_score, b_score)
+        return (game.a_score or 0, game.b_score or 0)
 
     def set_game_score(self, game_number: int, a_score: int, b_score: int) -> None:
         """
-        設置指定局數的比分
+        設置指定局數的比分；雙方皆為 0 視為未進行，刪除該局
 
         Args:
             game_number: 局數 (1-9)
             a_score: A方得分
             b_score: B方得分
         """
-        if not (1 <= game_number <= 9):
+        if not (1 <= game_number <= MAX_GAMES):
+            return
+
+        a_score, b_score = a_score or 0, b_score or 0
+        game = self._get_game(game_number)
+        if not a_score and not b_score:
+            if game is not None:
+                self.games.remove(game)
             return
 
-        a_score_attr = f"game{game_number}_a_score"
-        b_score_attr = f"game{game_number}_b_score"
+        if game is None:
+            game = MatchGame(game_number=game_number)
+            self.games.append(game)
+        game.a_score = a_score
+        game.b_score = b_score
+        game.server_side = self._serve_side_enum(game_number)
+
+    def _serve_side_enum(self, game_number: int):
+        serve_side = self.get_serve_side_for_game(game_number)
+        return MatchStartServeEnum(serve_side) if serve_side else None
 
-        setattr(self, a_score_attr, a_score)
-        setattr(self, b_score_attr, b_score)
+    def update_game_servers(self) -> None:
+        """第一局發球方變更後，重新計算每局發球方"""
+        for game in self.games:
+            game.server_side = self._serve_side_enum(game.game_number)
 
     def get_all_games_scores(self) -> list[dict]:
         """
@@ -182,26 +260,22 @@ class MatchRecord(db.Model):
             list: [{"game": 1, "a_score": 11, "b_score": 9, "winner": "A"}, ...]
         """
         games = []
-        for game_num in range(1, 10):
-            a_score, b_score = self.get_game_score(game_num)
-
-            # 只返回有進行的局（雙方得分不全為0）
-            if a_score > 0 or b_score > 0:
-                winner = None
-                if a_score > b_score:
-                    winner = "A"
-                elif b_score > a_score:
-                    winner = "B"
-
-                games.append(
-                    {
-                        "game": game_num,
-                        "a_score": a_score,
-                        "b_score": b_score,
-                        "winner": winner,
-                        "is_completed": winner is not None,
-                    }
-                )
+        for game in self._played_games():
+            winner = None
+            if game.a_score > game.b_score:
+                winner = "A"
+            elif game.b_score > game.a_score:
+                winner = "B"
+
+            games.append(
+                {
+                    "game": game.game_number,
+                    "a_score": game.a_score,
+                    "b_score": game.b_score,
+                    "winner": winner,
+                    "is_completed": winner is not None,
+                }
+            )
 
         return games
 
@@ -212,17 +286,8 @@ class MatchRecord(db.Model):
         Returns:
             tuple: (A方贏得局數, B方贏得局數)
         """
-        a_games_won = 0
-        b_games_won = 0
-
-        for game_num in range(1, 10):
-            a_score, b_score = self.get_game_score(game_num)
-
-            if a_score > b_score and a_score > 0:
-                a_games_won += 1
-            elif b_score > a_score and b_score > 0:
-                b_games_won += 1
-
+        a_games_won = sum(1 for game in self.games if game.a_score > game.b_score)
+        b_games_won = sum(1 for game in self.games if game.b_score > game.a_score)
         return (a_games_won, b_games_won)
 
     def update_games_total(self) -> None:
@@ -267,11 +332,7 @@ class MatchRecord(db.Model):
         Returns:
             bool: 是否有任何局的詳細比分
         """
-        for game_num in range(1, 10):
-            a_score, b_score = self.get_game_score(game_num)
-            if a_score > 0 or b_score > 0:
-                return True
-        return False
+        return bool(self._played_games())
 
     # --- 原有方法保持不變 ---
 
@@ -333,39 +394,19 @@ class MatchRecord(db.Model):
 
     def get_all_games_scores_with_serve(self) -> list[dict]:
         """獲取所有局的比分詳情（包含發球資訊）"""
-        games = []
-        for game_num in range(1, 10):
-            a_score, b_score = self.get_game_score(game_num)
-
-            # 只返回有進行的局（雙方得分不全為0）
-            if a_score > 0 or b_score > 0:
-                winner = None
-                if a_score > b_score:
-                    winner = "A"
-                elif b_score > a_score:
-                    winner = "B"
-
-                game_detail = {
-                    "game": game_num,
-                    "a_score": a_score,
-                    "b_score": b_score,
-                    "winner": winner,
-                    "is_completed": winner is not None,
-                }
-
-                # 🔥 新增發球資訊
-                serve_side = self.get_serve_side_for_game(game_num)
-                if serve_side:
-                    game_detail.update(
-                        {
-                            "serve_side": serve_side,
-                            "serve_side_display": "A方"
-                            if serve_side == "side_a"
-                            else "B方",
-                        }
-                    )
-
-                games.append(game_detail)
+        games = self.get_all_games_scores()
+        for game_detail in games:
+            # 🔥 新增發球資訊
+            serve_side = self.get_serve_side_for_game(game_detail["game"])
+            if serve_side:
+                game_detail.update(
+                    {
+                        "serve_side": serve_side,
+                        "serve_side_display": "A方"
+                        if serve_side == "side_a"
+                        else "B方",
+                    }
+                )
 
         return games
 
@@ -406,18 +447,7 @@ class MatchRecord(db.Model):
 
     def get_serve_side_for_game(self, game_number: int) -> str:
         """獲取指定局數的發球方"""
-        if not (1 <= game_number <= 9) or not self.first_serve_side:
-            return None
-
-        # 奇數局和第一局發球方相同，偶數局相反
-        if game_number % 2 == 1:
-            return self.first_serve_side.value
-        else:
-            return (
-                MatchStartServeEnum.SIDE_B.name
-                if self.first_serve_side == MatchStartServeEnum.SIDE_A
-                else MatchStartServeEnum.SIDE_A.name
-            )
+        return serve_side_for_game(self.first_serve_side, game_number)
 
     def get_serving_players_for_game(self, game_number: int) -> list:
         """
@@ -449,7 +479,7 @@ class MatchRecord(db.Model):
         """
         serve_details = []
 
-        for game_num in range(1, 10):
+        for game_num in range(1, MAX_GAMES + 1):
             serve_side = self.get_serve_side_for_game(game_num)
             if not serve_side:
                 continue
@@ -458,8 +488,7 @@ class MatchRecord(db.Model):
             serving_players = self.get_serving_players_for_game(game_num)
 
             # 檢查該局是否有比分記錄
-            a_score, b_score = self.get_game_score(game_num)
-            has_score = a_score > 0 or b_score > 0
+            has_score = any(self.get_game_score(game_num))
 
             serve_details.append(
                 {
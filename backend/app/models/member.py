@@ -1,7 +1,18 @@
 from datetime import datetime, timezone
 from typing import Any, Dict
 
-from sqlalchemy import Boolean, Date, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    literal_column,
+)
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
 
@@ -563,45 +574,16 @@ class Member(db.Model):
         cls, query_text: str, include_guests=True, created_by_user_id=None
     ):
         """
-        類方法：搜尋球員
+        類方法：搜尋球員（使用搜尋索引，依相關度排序）
         """
-        from .user import User
+        from ..services.member_search_service import MemberSearchService
 
-        search_like = f"%{query_text}%"
-        results = []
-
-        # 搜尋正式會員
-        members_query = cls.query.join(User, cls.user_id == User.id).filter(
-            cls.is_guest == False,
-            User.is_active == True,
-            db.or_(
-                cls.name.ilike(search_like),
-                User.display_name.ilike(search_like),
-                User.username.ilike(search_like),
-                cls.student_id.ilike(search_like),
-            ),
+        return MemberSearchService.search(
+            query_text,
+            limit=None,
+            include_guests=include_guests,
+            created_by_user_id=created_by_user_id,
         )
-        results.extend(members_query.all())
-
-        # 搜尋訪客
-        if include_guests:
-            guests_query = cls.query.filter(cls.is_guest == True)
-
-            if created_by_user_id:
-                guests_query = guests_query.filter(
-                    cls.created_by_user_id == created_by_user_id
-                )
-
-            guests_query = guests_query.filter(
-                db.or_(
-                    cls.name.ilike(search_like),
-                    cls.guest_identifier.ilike(search_like),
-                    cls.guest_phone.ilike(search_like),
-                )
-            )
-            results.extend(guests_query.all())
-
-        return results
 
     # ===== 特殊方法 =====
     def __repr__(self) -> str:
@@ -614,3 +596,14 @@ class Member(db.Model):
         org_info = f" (Org: {org_name})" if org_name else ""
         player_type = " [訪客]" if self.is_guest else ""
         return f"<Member id={self.id}, name='{self.get_current_display_name()}'{player_type}{org_info}>"
+
+
+# 保守評分 μ - k*σ 的 SQL 運算式（k 以常數寫入，才能使用運算式索引）
+CONSERVATIVE_SCORE_EXPRESSION = (
+    Member.mu
+    - literal_column(repr(RatingCalculationConfig.TRUESKILL_CONSERVATIVE_K))
+    * Member.sigma
+)
+
+# 單一球員名次查詢：COUNT 分數較高者、以 (分數, id) keyset 取前後球員
+Index("ix_members_conservative_score", CONSERVATIVE_SCORE_EXPRESSION, Member.id)
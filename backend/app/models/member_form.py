@@ -0,0 +1,62 @@
+# backend/app/models/member_form.py
+import datetime
+
+from sqlalchemy import Date, ForeignKey, Integer, String
+
+from ..extensions import db
+
+# 近期戰績保留的場數
+RECENT_FORM_LENGTH = 10
+
+
+class MemberForm(db.Model):
+    """
+    球員近況（連勝 / 連敗、最長連勝、近 10 場戰績）
+
+    每位球員一列，新比賽結果由 MemberFormService 增量更新；
+    補登較早日期的比賽或重算時，以視窗函數依比賽順序重建。
+    """
+
+    __tablename__ = "member_forms"
+
+    member_id = db.Column(
+        Integer,
+        ForeignKey("members.id", name="fk_member_forms_member_id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="球員ID",
+    )
+    current_streak = db.Column(
+        Integer, nullable=False, default=0, comment="目前連勝（正數）/ 連敗（負數）場數"
+    )
+    longest_win_streak = db.Column(
+        Integer, nullable=False, default=0, comment="最長連勝"
+    )
+    longest_loss_streak = db.Column(
+        Integer, nullable=False, default=0, comment="最長連敗"
+    )
+    recent_results = db.Column(
+        String(RECENT_FORM_LENGTH),
+        nullable=False,
+        default="",
+        comment="近期戰績，W / L 由新到舊",
+    )
+    recent_wins = db.Column(
+        Integer, nullable=False, default=0, comment="近期戰績中的勝場"
+    )
+    last_match_date = db.Column(Date, nullable=True, comment="最後一場比賽日期")
+    last_match_record_id = db.Column(
+        Integer, nullable=True, comment="最後一場比賽記錄ID（同日比賽的先後）"
+    )
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.datetime.now,
+        onupdate=datetime.datetime.now,
+        comment="更新時間",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MemberForm member={self.member_id}, streak={self.current_streak}, "
+            f"recent={self.recent_results!r}>"
+        )
@@ -0,0 +1,51 @@
+# backend/app/models/member_performance.py
+from sqlalchemy import Date, ForeignKey, Integer, String
+
+from ..extensions import db
+
+# 可分組的比賽條件（與 Match 欄位同名）；未記錄的條件以 UNRECORDED 儲存
+PERFORMANCE_DIMENSIONS = (
+    "court_surface",
+    "court_environment",
+    "match_time_slot",
+    "match_format",
+)
+UNRECORDED = ""
+
+
+class MemberPerformance(db.Model):
+    """
+    球員表現彙總（每位球員、每個比賽日期、每種比賽條件組合一列）
+
+    比賽新增 / 修改 / 刪除時在同一交易中增減，查詢時依任意條件與日期區間再加總；
+    主鍵以 member_id、match_date 開頭，單一球員的查詢只掃描該球員的列。
+    """
+
+    __tablename__ = "member_performance"
+
+    member_id = db.Column(
+        Integer,
+        ForeignKey(
+            "members.id", name="fk_member_performance_member_id", ondelete="CASCADE"
+        ),
+        primary_key=True,
+        comment="球員ID",
+    )
+    match_date = db.Column(Date, primary_key=True, comment="比賽日期")
+    court_surface = db.Column(String(20), primary_key=True, comment="場地材質")
+    court_environment = db.Column(String(20), primary_key=True, comment="場地環境")
+    match_time_slot = db.Column(String(20), primary_key=True, comment="比賽時間段")
+    match_format = db.Column(String(20), primary_key=True, comment="賽制")
+
+    matches = db.Column(Integer, nullable=False, default=0, comment="比賽場數")
+    wins = db.Column(Integer, nullable=False, default=0, comment="勝場")
+    losses = db.Column(Integer, nullable=False, default=0, comment="敗場")
+    games_won = db.Column(Integer, nullable=False, default=0, comment="贏得局數")
+    games_lost = db.Column(Integer, nullable=False, default=0, comment="輸掉局數")
+
+    def __repr__(self) -> str:
+        return (
+            f"<MemberPerformance member={self.member_id} {self.match_date} "
+            f"{self.court_surface}/{self.court_environment}/{self.match_time_slot}/"
+            f"{self.match_format}, {self.wins}-{self.losses}>"
+        )
@@ -0,0 +1,111 @@
+# backend/app/models/member_search_index.py
+"""
+球員搜尋索引
+
+- PostgreSQL：pg_trgm 擴充 + GIN 三連字索引，ILIKE '%關鍵字%' 可直接走索引，
+  並可用 similarity() 排序。
+- SQLite：FTS5 trigram 虛擬表 member_search_fts（rowid = members.id），
+  由觸發器在 members / users 變更時同步維護。
+
+索引隨 db.create_all() 建立；既有資料庫由 migration 建立。
+"""
+
+from sqlalchemy import DDL, Index, event
+
+from ..extensions import db
+from .member import Member
+from .user import User
+
+# 搜尋欄位：(資料表, 欄位)
+SEARCH_COLUMNS = (
+    ("members", "name"),
+    ("users", "display_name"),
+    ("users", "username"),
+    ("members", "student_id"),
+    ("members", "guest_phone"),
+    ("members", "guest_identifier"),
+    ("members", "guest_notes"),
+)
+
+FTS_TABLE = "member_search_fts"
+
+# --- PostgreSQL: pg_trgm GIN 索引 ---
+event.listen(
+    db.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+for _model in (Member, User):
+    for _table_name, _column_name in SEARCH_COLUMNS:
+        if _table_name != _model.__tablename__:
+            continue
+        Index(
+            f"ix_{_table_name}_{_column_name}_trgm",
+            getattr(_model, _column_name),
+            postgresql_using="gin",
+            postgresql_ops={_column_name: "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql")
+
+
+# --- SQLite: FTS5 trigram 虛擬表與同步觸發器 ---
+_FTS_COLUMNS = ", ".join(column for _, column in SEARCH_COLUMNS)
+_MEMBER_VALUES = (
+    "{m}.name, u.display_name, u.username, {m}.student_id, "
+    "{m}.guest_phone, {m}.guest_identifier, {m}.guest_notes"
+)
+
+SQLITE_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    f"USING fts5({_FTS_COLUMNS}, tokenize='trigram')",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS members_search_ai AFTER INSERT ON members BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS})
+        SELECT new.id, {_MEMBER_VALUES.format(m="new")}
+        FROM (SELECT 1) LEFT JOIN users u ON u.id = new.user_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS members_search_au
+    AFTER UPDATE OF name, user_id, student_id, guest_phone, guest_identifier, guest_notes
+    ON members BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS})
+        SELECT new.id, {_MEMBER_VALUES.format(m="new")}
+        FROM (SELECT 1) LEFT JOIN users u ON u.id = new.user_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS members_search_ad AFTER DELETE ON members BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS users_search_au
+    AFTER UPDATE OF display_name, username ON users BEGIN
+        DELETE FROM {FTS_TABLE}
+        WHERE rowid IN (SELECT id FROM members WHERE user_id = new.id);
+        INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS})
+        SELECT m.id, {_MEMBER_VALUES.format(m="m")}
+        FROM members m JOIN users u ON u.id = m.user_id
+        WHERE m.user_id = new.id;
+    END
+    """,
+    f"""
+    INSERT INTO {FTS_TABLE}(rowid, {_FTS_COLUMNS})
+    SELECT m.id, {_MEMBER_VALUES.format(m="m")}
+    FROM members m LEFT JOIN users u ON u.id = m.user_id
+    WHERE m.id NOT IN (SELECT rowid FROM {FTS_TABLE})
+    """,
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Member.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+
+event.listen(
+    Member.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite"),
+)
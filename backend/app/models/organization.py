@@ -34,7 +34,17 @@ class Organization(db.Model):
             data["contact_phone"] = self.contact_phone
 
         if members_count:
-            data["members_count"] = len(self.members) if self.members else 0
+            # 優先使用彙總查詢附加的數值，否則以 COUNT 查詢取得，避免載入整個 members 關聯
+            count = getattr(self, "members_count", None)
+            if count is None:
+                from .member import Member
+
+                count = (
+                    db.session.query(db.func.count(Member.id))
+                    .filter(Member.organization_id == self.id)
+                    .scalar()
+                )
+            data["members_count"] = count
         return data
 
     def __repr__(self):
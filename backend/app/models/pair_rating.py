@@ -0,0 +1,104 @@
+# backend/app/models/pair_rating.py
+import datetime
+
+from sqlalchemy import (
+    CheckConstraint,
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    literal_column,
+)
+from sqlalchemy.orm import relationship
+
+from ..config import RatingCalculationConfig
+from ..extensions import db
+
+
+class PairRating(db.Model):
+    """
+    雙打組合評分（不分順序的兩位球員，member_low_id < member_high_id）
+
+    組合視為單一個體，以 TrueSkill 評分雙打比賽；由 RatingService 隨個人評分一起更新，
+    組合排行榜直接依運算式索引排序分頁。
+    """
+
+    __tablename__ = "pair_ratings"
+
+    member_low_id = db.Column(
+        Integer,
+        ForeignKey(
+            "members.id", name="fk_pair_ratings_member_low_id", ondelete="CASCADE"
+        ),
+        primary_key=True,
+        comment="組合中 ID 較小的球員",
+    )
+    member_high_id = db.Column(
+        Integer,
+        ForeignKey(
+            "members.id", name="fk_pair_ratings_member_high_id", ondelete="CASCADE"
+        ),
+        primary_key=True,
+        comment="組合中 ID 較大的球員",
+    )
+    mu = db.Column(Float, nullable=False, comment="組合 μ")
+    sigma = db.Column(Float, nullable=False, comment="組合 σ")
+    matches_played = db.Column(Integer, nullable=False, default=0, comment="比賽場數")
+    wins = db.Column(Integer, nullable=False, default=0, comment="勝場")
+    losses = db.Column(Integer, nullable=False, default=0, comment="敗場")
+    last_match_date = db.Column(Date, nullable=True, comment="最後比賽日期")
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        default=datetime.datetime.now,
+        onupdate=datetime.datetime.now,
+        comment="更新時間",
+    )
+
+    member_low = relationship("Member", foreign_keys=[member_low_id])
+    member_high = relationship("Member", foreign_keys=[member_high_id])
+
+    __table_args__ = (
+        CheckConstraint(
+            "member_low_id < member_high_id", name="ck_pair_ratings_member_order"
+        ),
+        Index("ix_pair_ratings_member_high_id", "member_high_id"),
+    )
+
+    @property
+    def conservative_score(self):
+        """保守評分 μ - k*σ（與個人排行榜相同的 k）"""
+        return self.mu - RatingCalculationConfig.TRUESKILL_CONSERVATIVE_K * self.sigma
+
+    @property
+    def win_rate(self):
+        if not self.matches_played:
+            return 0.0
+        return round(self.wins / self.matches_played * 100, 1)
+
+    @property
+    def members(self):
+        return [self.member_low, self.member_high]
+
+    def __repr__(self) -> str:
+        return (
+            f"<PairRating ({self.member_low_id}, {self.member_high_id}), "
+            f"mu={self.mu:.3f}, sigma={self.sigma:.3f}>"
+        )
+
+
+# 組合保守評分的 SQL 運算式（同 CONSERVATIVE_SCORE_EXPRESSION，k 以常數寫入）
+PAIR_CONSERVATIVE_SCORE_EXPRESSION = (
+    PairRating.mu
+    - literal_column(repr(RatingCalculationConfig.TRUESKILL_CONSERVATIVE_K))
+    * PairRating.sigma
+)
+
+# 組合排行榜：依 (分數, 組合) 排序分頁
+Index(
+    "ix_pair_ratings_conservative_score",
+    PAIR_CONSERVATIVE_SCORE_EXPRESSION,
+    PairRating.member_low_id,
+    PairRating.member_high_id,
+)
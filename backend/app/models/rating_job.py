@@ -0,0 +1,70 @@
+# backend/app/models/rating_job.py
+import datetime
+
+from sqlalchemy import Enum as SQLAlchemyEnum
+from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy.orm import relationship
+
+from ..extensions import db
+from .enums.rating_enums import RatingJobTypeEnum, RatingStatusEnum
+
+
+class RatingJob(db.Model):
+    """
+    評分更新工作佇列
+
+    比賽記錄寫入時在同一交易中新增工作，由 `flask rating-worker`
+    依 id 順序（即提交順序）取出處理，確保評分按比賽順序演算。
+    """
+
+    __tablename__ = "rating_jobs"
+
+    id = db.Column(Integer, primary_key=True, comment="工作唯一識別碼")
+    job_type = db.Column(
+        SQLAlchemyEnum(
+            RatingJobTypeEnum,
+            name="rating_job_type_enum",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        comment="工作類型",
+    )
+    status = db.Column(
+        SQLAlchemyEnum(
+            RatingStatusEnum,
+            name="rating_status_enum_rating_jobs",
+            values_callable=lambda x: [e.value for e in x],
+        ),
+        nullable=False,
+        default=RatingStatusEnum.PENDING,
+        index=True,
+        comment="處理狀態",
+    )
+
+    match_record_id = db.Column(
+        Integer,
+        ForeignKey(
+            "match_records.id",
+            name="fk_rating_jobs_match_record_id",
+            ondelete="SET NULL",
+        ),
+        nullable=True,
+        index=True,
+        comment="相關比賽記錄ID（刪除後為空）",
+    )
+    match_record = relationship("MatchRecord", backref="rating_jobs")
+
+    player_ids = db.Column(db.JSON, nullable=True, comment="需重算的球員ID")
+    attempts = db.Column(Integer, nullable=False, default=0, comment="嘗試次數")
+    last_error = db.Column(Text, nullable=True, comment="最後一次錯誤訊息")
+
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.now, comment="建立時間"
+    )
+    started_at = db.Column(db.DateTime, nullable=True, comment="開始處理時間")
+    finished_at = db.Column(db.DateTime, nullable=True, comment="完成時間")
+
+    def __repr__(self) -> str:
+        return (
+            f"<RatingJob id={self.id}, type='{self.job_type}', status='{self.status}'>"
+        )
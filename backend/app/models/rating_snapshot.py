@@ -0,0 +1,54 @@
+# backend/app/models/rating_snapshot.py
+from sqlalchemy import Date, Float, ForeignKey, Integer
+
+from ..extensions import db
+
+
+class RatingSnapshot(db.Model):
+    """
+    每場比賽後的球員評分快照
+
+    評分更新時（單場更新或重算）與球員評分一起寫入，
+    查詢某一天的排行榜時取每位球員在該日之前最後一筆快照，不需要重演比賽。
+    """
+
+    __tablename__ = "rating_snapshots"
+
+    id = db.Column(Integer, primary_key=True, comment="快照唯一識別碼")
+    member_id = db.Column(
+        Integer,
+        ForeignKey(
+            "members.id", name="fk_rating_snapshots_member_id", ondelete="CASCADE"
+        ),
+        nullable=False,
+        comment="球員ID",
+    )
+    match_record_id = db.Column(
+        Integer,
+        ForeignKey(
+            "match_records.id",
+            name="fk_rating_snapshots_match_record_id",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+        index=True,
+        comment="比賽記錄ID",
+    )
+    match_date = db.Column(Date, nullable=False, comment="比賽日期")
+    mu = db.Column(Float, nullable=False, comment="賽後 μ")
+    sigma = db.Column(Float, nullable=False, comment="賽後 σ")
+
+    __table_args__ = (
+        db.Index(
+            "ix_rating_snapshots_member_date",
+            "member_id",
+            "match_date",
+            "match_record_id",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RatingSnapshot member={self.member_id}, {self.match_date}, "
+            f"mu={self.mu:.3f}, sigma={self.sigma:.3f}>"
+        )
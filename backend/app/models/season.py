@@ -0,0 +1,23 @@
+# backend/app/models/season.py
+import datetime
+
+from sqlalchemy import Date, Integer, String
+
+from ..extensions import db
+
+
+class Season(db.Model):
+    """賽季：排行榜以賽季結束（或今天）時的評分排名"""
+
+    __tablename__ = "seasons"
+
+    id = db.Column(Integer, primary_key=True, comment="賽季唯一識別碼")
+    name = db.Column(String(50), nullable=False, unique=True, comment="賽季名稱")
+    start_date = db.Column(Date, nullable=False, comment="開始日期")
+    end_date = db.Column(Date, nullable=False, comment="結束日期")
+    created_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.datetime.now, comment="建立時間"
+    )
+
+    def __repr__(self) -> str:
+        return f"<Season id={self.id}, '{self.name}' {self.start_date}~{self.end_date}>"
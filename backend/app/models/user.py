@@ -2,9 +2,9 @@ import datetime  # 確保導入 datetime
 
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy import Integer, String
-from werkzeug.security import check_password_hash, generate_password_hash
 
 from ..extensions import db
+from ..tools.password_hashing import hash_password, needs_rehash, verify_password
 from .enums.user_enums import UserRoleEnum
 
 
@@ -60,7 +60,7 @@ class User(db.Model):
         設定使用者密碼。
         會將傳入的明文密碼雜湊化後儲存。
         """
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """
@@ -68,7 +68,13 @@ class User(db.Model):
         """
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        """
+        檢查儲存的雜湊是否使用與目前設定不同的參數。
+        """
+        return needs_rehash(self.password_hash)
 
     def to_dict(self):
         """
@@ -1,6 +1,20 @@
 # backend/app/schemas/leaderboard_schemas.py
 
-from marshmallow import Schema, fields, validate
+from marshmallow import (
+    EXCLUDE,
+    Schema,
+    ValidationError,
+    fields,
+    post_load,
+    validate,
+    validates_schema,
+)
+from marshmallow_enum import EnumField
+
+from ..models.context_rating import tracked_contexts
+from ..models.enums.match_enums import MatchFormatEnum, MatchTypeEnum
+from ..models.member_performance import PERFORMANCE_DIMENSIONS
+from ..services.leaderboard_snapshot_service import DEFAULT_HISTORY_LIMIT
 
 
 class LeaderboardPlayerSchema(Schema):
@@ -19,6 +33,12 @@ class LeaderboardPlayerSchema(Schema):
 
     # 排名和分數
     rank = fields.Method("get_rank", dump_only=True)
+    rank_change = fields.Method(
+        "get_rank_change",
+        dump_only=True,
+        metadata={"description": "與最近一期快照相比的名次變化（正數為上升）"},
+    )
+    score_change = fields.Method("get_score_change", dump_only=True)
     conservative_score = fields.Float(dump_only=True)
     official_rank_score = fields.Float(dump_only=True)
     score = fields.Float(dump_only=True)
@@ -38,14 +58,39 @@ class LeaderboardPlayerSchema(Schema):
     losses = fields.Method("get_losses", dump_only=True)
     total_matches = fields.Method("get_total_matches", dump_only=True)
     win_rate = fields.Method("get_win_rate", dump_only=True)
+    adjusted_win_rate = fields.Method(
+        "get_adjusted_win_rate",
+        dump_only=True,
+        metadata={"description": "Beta 先驗平滑後的勝率，場數少時趨近先驗平均"},
+    )
 
     # 為前端相容性提供的別名 (但邏輯相同)
     _total_matches = fields.Method("get_total_matches", dump_only=True)
     _wins = fields.Method("get_wins", dump_only=True)
     _losses = fields.Method("get_losses", dump_only=True)
 
+    # 近況
+    current_streak = fields.Method(
+        "get_current_streak",
+        dump_only=True,
+        metadata={"description": "目前連勝（正數）/ 連敗（負數）場數"},
+    )
+    longest_win_streak = fields.Method("get_longest_win_streak", dump_only=True)
+    longest_loss_streak = fields.Method("get_longest_loss_streak", dump_only=True)
+    recent_form = fields.Method(
+        "get_recent_form",
+        dump_only=True,
+        metadata={"description": "近 10 場戰績，W / L 由新到舊"},
+    )
+    recent_wins = fields.Method("get_recent_wins", dump_only=True)
+
     # 其他資訊
     last_match_date = fields.Method("get_last_match_date", dump_only=True)
+    idle_days = fields.Method(
+        "get_idle_days",
+        dump_only=True,
+        metadata={"description": "距最後一場比賽的天數（inactivity_adjusted 時提供）"},
+    )
     is_active = fields.Method("get_is_active", dump_only=True)
     is_guest = fields.Bool(dump_only=True)
     is_experienced_player = fields.Bool(dump_only=True)
@@ -78,6 +123,12 @@ class LeaderboardPlayerSchema(Schema):
     def get_rank(self, obj):
         return getattr(obj, "_rank", None)
 
+    def get_rank_change(self, obj):
+        return getattr(obj, "_rank_change", None)
+
+    def get_score_change(self, obj):
+        return getattr(obj, "_score_change", None)
+
     def get_wins(self, obj):
         return getattr(obj, "_wins", 0)
 
@@ -90,9 +141,30 @@ class LeaderboardPlayerSchema(Schema):
     def get_win_rate(self, obj):
         return getattr(obj, "_win_rate", 0.0)
 
+    def get_adjusted_win_rate(self, obj):
+        return getattr(obj, "_adjusted_win_rate", None)
+
+    def get_current_streak(self, obj):
+        return getattr(obj, "_current_streak", 0)
+
+    def get_longest_win_streak(self, obj):
+        return getattr(obj, "_longest_win_streak", 0)
+
+    def get_longest_loss_streak(self, obj):
+        return getattr(obj, "_longest_loss_streak", 0)
+
+    def get_recent_form(self, obj):
+        return getattr(obj, "_recent_form", "")
+
+    def get_recent_wins(self, obj):
+        return getattr(obj, "_recent_wins", 0)
+
     def get_last_match_date(self, obj):
         return getattr(obj, "_last_match_date", None)
 
+    def get_idle_days(self, obj):
+        return getattr(obj, "_idle_days", None)
+
     class Meta:
         ordered = True
 
@@ -153,8 +225,12 @@ class LeaderboardQuerySchema(Schema):
             [
                 "score",
                 "win_rate",
+                "adjusted_win_rate",
                 "total_matches",
                 "wins",
+                "current_streak",
+                "longest_win_streak",
+                "recent_form",
                 "experience",
                 "recent_activity",
                 "join_date",
@@ -176,6 +252,29 @@ class LeaderboardQuerySchema(Schema):
         allow_none=True, metadata={"description": "加入時間起始"}
     )
 
+    # 閒置調整
+    inactivity_adjusted = fields.Bool(
+        load_default=False,
+        metadata={"description": "依最後比賽日期放大 σ 後排序與篩選（不寫回資料庫）"},
+    )
+
+    # 情境評分
+    context = fields.Str(
+        allow_none=True,
+        validate=validate.OneOf(sorted(tracked_contexts())),
+        metadata={"description": "以情境評分排名，例如 clay_court、indoor、singles"},
+    )
+
+    # 歷史排行榜
+    as_of = fields.Date(
+        allow_none=True, metadata={"description": "以該日結束時的評分排名"}
+    )
+    season = fields.Int(
+        allow_none=True,
+        validate=validate.Range(min=1),
+        metadata={"description": "賽季ID，以賽季結束時的評分排名"},
+    )
+
 
 class PlayerComparisonSchema(Schema):
     """球員比較結果 Schema"""
@@ -203,6 +302,9 @@ class PlayerComparisonSchema(Schema):
     predicted_win_probability = fields.Float(
         dump_only=True, metadata={"description": "預測勝率 (0-1)"}
     )
+    match_quality = fields.Float(
+        dump_only=True, metadata={"description": "對戰品質 (0-1)"}
+    )
 
 
 class LeaderboardStatisticsSchema(Schema):
@@ -235,6 +337,177 @@ class LeaderboardResponseSchema(Schema):
     statistics = fields.Nested(LeaderboardStatisticsSchema, dump_only=True)
     config = fields.Dict(dump_only=True)
     query_params = fields.Dict(dump_only=True)
+    as_of = fields.Date(dump_only=True)
+
+
+class MemberRankQuerySchema(Schema):
+    """單一球員名次查詢參數（篩選與排行榜相同）"""
+
+    include_guests = fields.Bool(load_default=True)
+    include_inactive = fields.Bool(load_default=False)
+    organization_id = fields.Int(allow_none=True)
+    neighbors = fields.Int(
+        load_default=2,
+        validate=validate.Range(min=0, max=20),
+        metadata={"description": "前後各取幾名球員"},
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class RankHistoryQuerySchema(Schema):
+    limit = fields.Int(
+        load_default=DEFAULT_HISTORY_LIMIT,
+        validate=validate.Range(min=1, max=520),
+        metadata={"description": "最近幾期"},
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class RankHistorySchema(Schema):
+    """球員名次軌跡（每期一筆）"""
+
+    period_start = fields.Date(dump_only=True)
+    rank = fields.Int(dump_only=True)
+    score = fields.Float(dump_only=True)
+
+
+class PerformanceQuerySchema(Schema):
+    group_by = fields.Str(
+        load_default="",
+        metadata={
+            "description": "分組條件，以逗號分隔："
+            + ", ".join(PERFORMANCE_DIMENSIONS)
+            + "；空值只回傳總計"
+        },
+    )
+    start_date = fields.Date(allow_none=True, metadata={"description": "比賽日期起"})
+    end_date = fields.Date(allow_none=True, metadata={"description": "比賽日期迄"})
+
+    @validates_schema
+    def validate_query(self, data, **kwargs):
+        unknown = [
+            name
+            for name in data["group_by"].split(",")
+            if name and name not in PERFORMANCE_DIMENSIONS
+        ]
+        if unknown:
+            raise ValidationError(
+                f"不支援的分組條件：{', '.join(unknown)}", field_name="group_by"
+            )
+        start_date, end_date = data.get("start_date"), data.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError("開始日期不能晚於結束日期", field_name="end_date")
+
+    @post_load
+    def split_group_by(self, data, **kwargs):
+        data["group_by"] = list(
+            dict.fromkeys(name for name in data["group_by"].split(",") if name)
+        )
+        return data
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class GameStatisticsQuerySchema(Schema):
+    start_date = fields.Date(allow_none=True, metadata={"description": "比賽日期起"})
+    end_date = fields.Date(allow_none=True, metadata={"description": "比賽日期迄"})
+    match_type = EnumField(MatchTypeEnum, by_value=True, required=False)
+    match_format = EnumField(MatchFormatEnum, by_value=True, required=False)
+
+    @validates_schema
+    def validate_dates(self, data, **kwargs):
+        start_date, end_date = data.get("start_date"), data.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise ValidationError("開始日期不能晚於結束日期", field_name="end_date")
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class PairLeaderboardQuerySchema(Schema):
+    page = fields.Int(load_default=1, validate=validate.Range(min=1))
+    per_page = fields.Int(load_default=50, validate=validate.Range(min=10, max=200))
+    min_matches = fields.Int(
+        load_default=1,
+        validate=validate.Range(min=0),
+        metadata={"description": "組合最少比賽場次"},
+    )
+    member_id = fields.Int(
+        allow_none=True, metadata={"description": "只顯示包含此球員的組合"}
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class RacketLeaderboardQuerySchema(Schema):
+    sort_by = fields.Str(
+        load_default="win_rate",
+        validate=validate.OneOf(
+            [
+                "win_rate",
+                "avg_score",
+                "avg_mu",
+                "rating_gain_per_match",
+                "players",
+                "matches",
+            ]
+        ),
+        metadata={"description": "排序依據"},
+    )
+    sort_order = fields.Str(
+        load_default="desc",
+        validate=validate.OneOf(["asc", "desc"]),
+        metadata={"description": "排序方向"},
+    )
+    min_matches = fields.Int(
+        load_default=0,
+        validate=validate.Range(min=0),
+        metadata={"description": "使用者比賽場數總和下限"},
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class PairMemberSchema(Schema):
+    id = fields.Int(dump_only=True)
+    display_name = fields.Str(dump_only=True)
+
+
+class PairRatingSchema(Schema):
+    """雙打組合排行榜 Schema"""
+
+    rank = fields.Method("get_rank", dump_only=True)
+    members = fields.Nested(PairMemberSchema, many=True, dump_only=True)
+    conservative_score = fields.Float(dump_only=True)
+    mu = fields.Float(dump_only=True)
+    sigma = fields.Float(dump_only=True)
+    matches_played = fields.Int(dump_only=True)
+    wins = fields.Int(dump_only=True)
+    losses = fields.Int(dump_only=True)
+    win_rate = fields.Float(dump_only=True)
+    last_match_date = fields.Date(dump_only=True)
+
+    def get_rank(self, obj):
+        return getattr(obj, "_rank", None)
+
+    class Meta:
+        ordered = True
+
+
+class SeasonSchema(Schema):
+    """賽季 Schema"""
+
+    id = fields.Int(dump_only=True)
+    name = fields.Str(dump_only=True)
+    start_date = fields.Date(dump_only=True)
+    end_date = fields.Date(dump_only=True)
 
 
 class PlayerDetailSchema(Schema):
@@ -0,0 +1,148 @@
+# backend/app/schemas/live_scoring_schemas.py
+from marshmallow import (
+    EXCLUDE,
+    Schema,
+    ValidationError,
+    fields,
+    validate,
+    validates_schema,
+)
+from marshmallow_enum import EnumField
+
+from ..models.enums import LiveMatchStatusEnum
+from ..models.enums.match_enums import (
+    CourtEnvironmentEnum,
+    CourtSurfaceEnum,
+    MatchFormatEnum,
+    MatchStartServeEnum,
+    MatchTimeSlotEnum,
+    MatchTypeEnum,
+)
+from ..services.live_scoring_service import DEFAULT_EVENTS_LIMIT
+
+
+class LiveMatchCreateSchema(Schema):
+    """開始即時計分"""
+
+    match_date = fields.Date(required=True)
+    match_type = EnumField(MatchTypeEnum, by_value=True, required=True)
+    match_format = EnumField(MatchFormatEnum, by_value=True, required=True)
+
+    player1_id = fields.Int(required=True, validate=validate.Range(min=1))
+    player2_id = fields.Int(
+        required=False, allow_none=True, validate=validate.Range(min=1)
+    )
+    player3_id = fields.Int(required=True, validate=validate.Range(min=1))
+    player4_id = fields.Int(
+        required=False, allow_none=True, validate=validate.Range(min=1)
+    )
+
+    first_serve_side = EnumField(MatchStartServeEnum, by_value=True, required=True)
+
+    court_surface = EnumField(
+        CourtSurfaceEnum, by_value=True, required=False, allow_none=True
+    )
+    court_environment = EnumField(
+        CourtEnvironmentEnum, by_value=True, required=False, allow_none=True
+    )
+    time_slot = EnumField(
+        MatchTimeSlotEnum, by_value=True, required=False, allow_none=True
+    )
+
+    @validates_schema
+    def validate_players_selection(self, data, **kwargs):
+        players = [data.get(f"player{index}_id") for index in range(1, 5)]
+        if data.get("match_type") == MatchTypeEnum.SINGLES:
+            if players[1] or players[3]:
+                raise ValidationError("單打模式下只能選擇2個球員。")
+        elif not all(players):
+            raise ValidationError("雙打模式下必須選擇4個球員。")
+
+        selected = [p_id for p_id in players if p_id]
+        if len(selected) != len(set(selected)):
+            raise ValidationError("同一位球員不能重複出現。")
+
+
+class LivePointCreateSchema(Schema):
+    """記錄一分"""
+
+    scoring_side = EnumField(MatchStartServeEnum, by_value=True, required=True)
+    server_side = EnumField(
+        MatchStartServeEnum,
+        by_value=True,
+        required=False,
+        allow_none=True,
+        metadata={"description": "發球方，未提供時依局數推算"},
+    )
+    expected_sequence = fields.Int(
+        required=False,
+        allow_none=True,
+        validate=validate.Range(min=0),
+        metadata={"description": "客戶端看到的最後事件序號，用於避免重複記分"},
+    )
+
+
+class LiveEventsQuerySchema(Schema):
+    after = fields.Int(
+        load_default=0,
+        validate=validate.Range(min=0),
+        metadata={"description": "只取得此序號之後的事件"},
+    )
+    limit = fields.Int(
+        load_default=DEFAULT_EVENTS_LIMIT,
+        validate=validate.Range(min=1, max=DEFAULT_EVENTS_LIMIT),
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class LiveMatchQuerySchema(Schema):
+    status = EnumField(LiveMatchStatusEnum, by_value=True, required=False)
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class LivePointEventSchema(Schema):
+    sequence = fields.Int(dump_only=True)
+    game_number = fields.Int(dump_only=True)
+    scoring_side = EnumField(MatchStartServeEnum, by_value=True, dump_only=True)
+    server_side = EnumField(MatchStartServeEnum, by_value=True, dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+
+
+class LiveMatchResponseSchema(Schema):
+    id = fields.Int(dump_only=True)
+    status = EnumField(LiveMatchStatusEnum, by_value=True, dump_only=True)
+
+    match_date = fields.Date(dump_only=True)
+    match_type = EnumField(MatchTypeEnum, by_value=True, dump_only=True)
+    match_format = EnumField(MatchFormatEnum, by_value=True, dump_only=True)
+    time_slot = EnumField(
+        MatchTimeSlotEnum, by_value=True, attribute="match_time_slot", dump_only=True
+    )
+    court_surface = EnumField(CourtSurfaceEnum, by_value=True, dump_only=True)
+    court_environment = EnumField(CourtEnvironmentEnum, by_value=True, dump_only=True)
+
+    player1_id = fields.Int(dump_only=True)
+    player2_id = fields.Int(dump_only=True)
+    player3_id = fields.Int(dump_only=True)
+    player4_id = fields.Int(dump_only=True)
+
+    first_serve_side = EnumField(MatchStartServeEnum, by_value=True, dump_only=True)
+    serve_side = fields.Str(dump_only=True)
+
+    current_game = fields.Int(dump_only=True)
+    a_points = fields.Int(dump_only=True)
+    b_points = fields.Int(dump_only=True)
+    a_games = fields.Int(dump_only=True)
+    b_games = fields.Int(dump_only=True)
+    completed_games = fields.List(fields.List(fields.Int()), dump_only=True)
+    last_sequence = fields.Int(dump_only=True)
+
+    match_record_id = fields.Int(dump_only=True)
+    created_by_user_id = fields.Int(dump_only=True)
+    started_at = fields.DateTime(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
+    finished_at = fields.DateTime(dump_only=True)
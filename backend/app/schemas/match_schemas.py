@@ -10,6 +10,9 @@ from ..models.enums.match_enums import (
     MatchTimeSlotEnum,
     MatchTypeEnum,
 )
+from ..models.enums.rating_enums import RatingStatusEnum
+
+MAX_BATCH_MATCHES = 200
 
 
 class MatchRecordCreateSchema(Schema):
@@ -48,6 +51,12 @@ class MatchRecordCreateSchema(Schema):
     match_notes = fields.Str(
         required=False, allow_none=True, validate=validate.Length(max=500)
     )
+    idempotency_key = fields.Str(
+        required=False,
+        allow_none=True,
+        validate=validate.Length(min=1, max=64),
+        metadata={"description": "客戶端冪等鍵，重送時不會重複建立"},
+    )
 
     @validates_schema
     def validate_players_selection(self, data, **kwargs):
@@ -155,6 +164,29 @@ class MatchRecordDetailedCreateSchema(MatchRecordCreateSchema):
                 )
 
 
+class MatchRecordBatchItemSchema(MatchRecordDetailedCreateSchema):
+    """批次提交中的單場比賽，冪等鍵為必填"""
+
+    idempotency_key = fields.Str(
+        required=True,
+        validate=validate.Length(min=1, max=64),
+        metadata={"description": "客戶端冪等鍵"},
+    )
+    recorded_at = fields.DateTime(
+        required=False,
+        allow_none=True,
+        metadata={"description": "客戶端記錄時間，用於同日同時段比賽排序"},
+    )
+
+
+class MatchRecordBatchSchema(Schema):
+    matches = fields.List(
+        fields.Nested(MatchRecordBatchItemSchema),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_BATCH_MATCHES),
+    )
+
+
 class MatchRecordUpdateSchema(Schema):
     match_date = fields.Date(required=False)
     match_type = EnumField(MatchTypeEnum, by_value=True, required=False)
@@ -274,6 +306,8 @@ class MatchRecordResponseSchema(Schema):
     a_games = fields.Int(dump_only=True)
     b_games = fields.Int(dump_only=True)
     side_a_outcome = fields.Str(dump_only=True)
+    rating_status = EnumField(RatingStatusEnum, by_value=True, dump_only=True)
+    idempotency_key = fields.Str(dump_only=True)
 
     court_surface = EnumField(
         CourtSurfaceEnum, by_value=True, attribute="match.court_surface", dump_only=True
@@ -502,6 +502,42 @@ class GuestQuerySchema(Schema):
         unknown = EXCLUDE
 
 
+# 球員搜尋 Schema（用於 typeahead 自動完成）：
+class PlayerSearchQuerySchema(Schema):
+    """球員搜尋參數 Schema"""
+
+    q = fields.Str(
+        required=True,
+        validate=validate.Length(min=1, max=50),
+        metadata={"description": "搜尋關鍵字"},
+    )
+    include_guests = fields.Bool(required=False, load_default=True)
+    limit = fields.Int(
+        required=False, validate=validate.Range(min=1, max=50), load_default=10
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class PlayerSearchResultSchema(Schema):
+    """球員搜尋結果 Schema（輕量欄位）"""
+
+    id = fields.Int(dump_only=True)
+    name = fields.Str(dump_only=True)
+    display_name = fields.Str(dump_only=True)
+    is_guest = fields.Bool(dump_only=True)
+    organization_short_name = fields.Method("get_organization_short_name")
+
+    def get_organization_short_name(self, obj):
+        if obj.organization:
+            return obj.organization.short_name or obj.organization.name
+        return None
+
+    class Meta:
+        ordered = True
+
+
 # 訪客選項 Schema（用於前端選擇器）：
 class GuestRoleOptionSchema(Schema):
     """訪客身份選項 Schema"""
@@ -16,8 +16,11 @@ class OrganizationSchema(Schema):
     contact_email = fields.Email(dump_only=True, allow_none=True)
     contact_phone = fields.Str(dump_only=True, allow_none=True)
 
-    # 這個欄位將由路由層在序列化前動態添加，這裡定義它的型別和預設值
+    # 以下統計欄位由服務層的彙總查詢在序列化前動態添加，這裡定義它的型別和預設值
     members_count = fields.Int(dump_only=True, dump_default=0)
+    active_members_count = fields.Int(dump_only=True, dump_default=0)
+    guest_members_count = fields.Int(dump_only=True, dump_default=0)
+    avg_conservative_score = fields.Float(dump_only=True, allow_none=True)
 
     class Meta:
         ordered = True
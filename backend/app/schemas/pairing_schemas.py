@@ -0,0 +1,45 @@
+# backend/app/schemas/pairing_schemas.py
+from marshmallow import Schema, fields, validate
+
+from ..services.pairing_service import (
+    DEFAULT_TIME_BUDGET_MS,
+    GENDER_RULE_NONE,
+    GENDER_RULES,
+)
+
+
+class PairingRequestSchema(Schema):
+    """練習賽配對請求"""
+
+    attendee_ids = fields.List(
+        fields.Int(validate=validate.Range(min=1)),
+        required=True,
+        validate=validate.Length(min=4, max=200),
+        metadata={"description": "出席球員 ID"},
+    )
+    courts = fields.Int(
+        allow_none=True,
+        validate=validate.Range(min=1, max=50),
+        metadata={"description": "可用場地數（預設排滿）"},
+    )
+    rounds = fields.Int(
+        load_default=1,
+        validate=validate.Range(min=1, max=12),
+        metadata={"description": "輪次數"},
+    )
+    gender_rule = fields.Str(
+        load_default=GENDER_RULE_NONE,
+        validate=validate.OneOf(GENDER_RULES),
+        metadata={"description": "性別配對規則"},
+    )
+    history_days = fields.Int(
+        allow_none=True,
+        validate=validate.Range(min=1, max=365),
+        metadata={"description": "納入最近 N 天比賽的重複搭檔/對手計算"},
+    )
+    time_budget_ms = fields.Int(
+        load_default=DEFAULT_TIME_BUDGET_MS,
+        validate=validate.Range(min=50, max=2000),
+        metadata={"description": "運算時間預算（毫秒）"},
+    )
+    seed = fields.Int(allow_none=True, metadata={"description": "隨機種子"})
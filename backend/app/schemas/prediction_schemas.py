@@ -0,0 +1,52 @@
+# backend/app/schemas/prediction_schemas.py
+from marshmallow import Schema, fields, validate
+
+from ..services.prediction_service import MAX_BATCH_LINEUPS, MAX_TEAM_SIZE
+
+
+class LineupSchema(Schema):
+    """單一對戰組合 (1v1 或 2v2)"""
+
+    team_a = fields.List(
+        fields.Int(validate=validate.Range(min=1)),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_TEAM_SIZE),
+        metadata={"description": "A 隊球員 ID"},
+    )
+    team_b = fields.List(
+        fields.Int(validate=validate.Range(min=1)),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_TEAM_SIZE),
+        metadata={"description": "B 隊球員 ID"},
+    )
+
+
+class BatchPredictionRequestSchema(Schema):
+    """批次預測請求"""
+
+    lineups = fields.List(
+        fields.Nested(LineupSchema),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_BATCH_LINEUPS),
+    )
+
+
+class PredictionResultSchema(Schema):
+    """預測結果"""
+
+    index = fields.Int(dump_only=True)
+    team_a = fields.List(fields.Int(), dump_only=True)
+    team_b = fields.List(fields.Int(), dump_only=True)
+    win_probability_a = fields.Float(
+        dump_only=True, metadata={"description": "A 隊預測勝率 (0-1)"}
+    )
+    win_probability_b = fields.Float(
+        dump_only=True, metadata={"description": "B 隊預測勝率 (0-1)"}
+    )
+    match_quality = fields.Float(
+        dump_only=True, metadata={"description": "對戰品質 (0-1，越高越勢均力敵)"}
+    )
+    error = fields.Str(dump_only=True)
+
+    class Meta:
+        ordered = True
@@ -0,0 +1,54 @@
+# backend/app/schemas/sync_schemas.py
+from marshmallow import EXCLUDE, Schema, fields, validate
+from marshmallow_enum import EnumField
+
+from ..models.enums import GenderEnum
+from ..services.change_log_service import DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT
+
+
+class SyncQuerySchema(Schema):
+    """增量同步查詢參數"""
+
+    since = fields.Int(
+        load_default=0,
+        validate=validate.Range(min=0),
+        metadata={"description": "客戶端最後同步的版本號"},
+    )
+    limit = fields.Int(
+        load_default=DEFAULT_SYNC_LIMIT,
+        validate=validate.Range(min=1, max=MAX_SYNC_LIMIT),
+        metadata={"description": "單次最多讀取的變更數"},
+    )
+
+    class Meta:
+        unknown = EXCLUDE
+
+
+class SyncMemberSchema(Schema):
+    """同步用的球員資料（不含統計欄位）"""
+
+    id = fields.Int(dump_only=True)
+    name = fields.Str(dump_only=True)
+    display_name = fields.Str(dump_only=True)
+    short_display_name = fields.Str(dump_only=True)
+    gender = EnumField(GenderEnum, by_value=True, dump_only=True)
+    is_guest = fields.Bool(dump_only=True)
+    organization_id = fields.Int(dump_only=True)
+    user_id = fields.Int(dump_only=True)
+    joined_date = fields.Date(dump_only=True)
+    leaved_date = fields.Date(dump_only=True)
+
+    class Meta:
+        ordered = True
+
+
+class SyncRatingSchema(Schema):
+    """同步用的評分資料"""
+
+    member_id = fields.Int(attribute="id", dump_only=True)
+    mu = fields.Float(dump_only=True)
+    sigma = fields.Float(dump_only=True)
+    conservative_score = fields.Float(dump_only=True)
+
+    class Meta:
+        ordered = True
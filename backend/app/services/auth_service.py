@@ -3,9 +3,11 @@ from flask_jwt_extended import create_access_token, create_refresh_token
 from sqlalchemy.exc import IntegrityError  # 用於捕捉資料庫唯一性衝突
 
 from ..extensions import db
+from ..models.enums import ChangeActionEnum, ChangeEntityEnum
 from ..models.enums.user_enums import UserRoleEnum
 from ..models.member import Member
 from ..models.user import User
+from ..tools.auth_utils import principal_claims
 from ..tools.exceptions import (
     UserAlreadyExistsError,
     InvalidCredentialsError,
@@ -16,6 +18,7 @@ from ..tools.exceptions import (
     TokenRefreshError,
     AppException,
 )
+from .change_log_service import ChangeLogService
 
 
 class AuthService:
@@ -55,8 +58,11 @@ class AuthService:
             )
             db.session.add(new_member)
 
-            # 預先 flush 以獲取 new_user.id (如果 JWT 生成需要)
-            # db.session.flush() # 如果 create_access_token 需要 user.id 且 user 是新物件
+            # flush 取得 new_member.id，在同一交易中寫入變更紀錄（離線同步）
+            db.session.flush()
+            ChangeLogService.record(
+                ChangeEntityEnum.MEMBER, new_member.id, ChangeActionEnum.CREATED
+            )
 
             db.session.commit()
 
@@ -71,7 +77,9 @@ class AuthService:
 
         # 6. 生成 Tokens
         # 確保 new_user.id 在 commit 後可用
-        access_token = create_access_token(identity=str(new_user.id))
+        access_token = create_access_token(
+            identity=str(new_user.id), additional_claims=principal_claims(new_user)
+        )
         refresh_token = create_refresh_token(identity=str(new_user.id))
 
         return {
@@ -95,7 +103,17 @@ class AuthService:
         if not user.is_active:
             raise UserInactiveError()
 
-        access_token = create_access_token(identity=str(user.id))
+        # 雜湊參數已調整時，趁持有明文密碼的機會重新雜湊
+        if user.password_needs_rehash():
+            user.set_password(password)
+            try:
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+
+        access_token = create_access_token(
+            identity=str(user.id), additional_claims=principal_claims(user)
+        )
         refresh_token = create_refresh_token(identity=str(user.id))
 
         return {
@@ -115,7 +133,9 @@ class AuthService:
         except ValueError:  # user_id_str 無法轉為 int
             raise TokenRefreshError(message="無效的使用者ID格式。")
 
-        new_access_token = create_access_token(identity=user_id, fresh=False)
+        new_access_token = create_access_token(
+            identity=str(user_id), fresh=False, additional_claims=principal_claims(user)
+        )
         return new_access_token
 
     @staticmethod
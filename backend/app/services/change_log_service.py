@@ -0,0 +1,216 @@
+# backend/app/services/change_log_service.py
+"""
+變更紀錄服務 - 記錄比賽/球員/評分的變更，提供離線客戶端增量同步
+
+寫入端（MatchRecordService / MemberService / RatingService）在同一交易中呼叫 record()，
+讀取端以 get_changes(since) 取得版本號之後的變更。
+
+版本號不是插入時的自增 id：較早插入的交易可能較晚提交，客戶端游標會越過它。
+record() 寫入的紀錄版本號為空，提交前（before_commit）才在交易層級的 advisory lock
+下依序配置；鎖持有到提交結束，因此版本號的順序即提交順序，看得到某個版本時，
+較小的版本都已提交。
+"""
+
+import datetime
+
+from sqlalchemy import event, func, insert, select, text, update
+from sqlalchemy.orm import Session, joinedload
+
+from ..extensions import db
+from ..models import ChangeLog, MatchRecord, Member
+from ..models.enums import ChangeActionEnum, ChangeEntityEnum
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+VERSION_LOCK_KEY = 727002  # 配置版本號的 PostgreSQL advisory lock 鍵值
+
+_PENDING_KEY = "change_log_pending"
+
+
+class ChangeLogService:
+    @staticmethod
+    def record(
+        entity_type: ChangeEntityEnum, entity_ids, action: ChangeActionEnum
+    ) -> None:
+        """
+        新增變更紀錄（不提交，隨呼叫端的交易一起提交，版本號於提交時配置）
+
+        Args:
+            entity_ids: 單一 ID 或 ID 列表；新建的資料需先 flush 取得 ID
+        """
+        if isinstance(entity_ids, int):
+            entity_ids = [entity_ids]
+        entity_ids = sorted({entity_id for entity_id in entity_ids if entity_id})
+        if not entity_ids:
+            return
+
+        now = datetime.datetime.now()
+        db.session.execute(
+            insert(ChangeLog),
+            [
+                {
+                    "entity_type": entity_type,
+                    "entity_id": entity_id,
+                    "action": action,
+                    "changed_at": now,
+                }
+                for entity_id in entity_ids
+            ],
+        )
+        db.session.info[_PENDING_KEY] = True
+
+    @staticmethod
+    def assign_versions(session) -> int:
+        """
+        為本交易寫入的變更紀錄配置版本號（提交前呼叫）
+
+        其他交易尚未提交的紀錄不可見，版本號為空且可見的只有本交易的紀錄。
+
+        Returns:
+            int: 配置的紀錄數
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            session.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": VERSION_LOCK_KEY}
+            )
+        ids = session.scalars(
+            select(ChangeLog.id)
+            .where(ChangeLog.version.is_(None))
+            .order_by(ChangeLog.id)
+        ).all()
+        if not ids:
+            return 0
+        # 持有鎖時先前配置版本號的交易都已提交，最大版本號即為目前最新
+        latest = session.scalar(select(func.max(ChangeLog.version))) or 0
+        session.execute(
+            update(ChangeLog),
+            [
+                {"id": change_id, "version": latest + offset}
+                for offset, change_id in enumerate(ids, start=1)
+            ],
+        )
+        return len(ids)
+
+    @staticmethod
+    def latest_version() -> int:
+        return db.session.query(func.max(ChangeLog.version)).scalar() or 0
+
+    @staticmethod
+    def _collapse(rows) -> dict:
+        """
+        將同一筆資料的多次變更合併為最後狀態
+
+        Returns:
+            {entity_type: {entity_id: action}}；先建立後更新仍視為 created
+        """
+        collapsed = {entity_type: {} for entity_type in ChangeEntityEnum}
+        for row in rows:
+            actions = collapsed[row.entity_type]
+            previous = actions.get(row.entity_id)
+            if (
+                previous == ChangeActionEnum.CREATED
+                and row.action == ChangeActionEnum.UPDATED
+            ):
+                continue
+            actions[row.entity_id] = row.action
+        return collapsed
+
+    @staticmethod
+    def _split(actions: dict, objects: dict) -> dict:
+        """依動作分組；已不存在（之後被刪除）的資料不放入 created / updated"""
+        result = {"created": [], "updated": [], "deleted": []}
+        for entity_id, action in actions.items():
+            if action == ChangeActionEnum.DELETED:
+                result["deleted"].append(entity_id)
+            elif entity_id in objects:
+                result[action.value].append(objects[entity_id])
+        return result
+
+    @staticmethod
+    def get_changes(
+        since: int = 0, limit: int = DEFAULT_SYNC_LIMIT, user_id: int = None
+    ) -> dict:
+        """
+        取得版本號 since 之後的變更
+
+        Args:
+            since: 客戶端最後同步的版本號，0 表示從頭開始
+            limit: 單次最多讀取的變更紀錄數，has_more 為 True 時以回傳的 version 繼續讀取
+            user_id: 目前使用者，只包含此使用者建立的訪客
+
+        Returns:
+            dict: version / has_more / reset / matches / members / ratings
+        """
+        limit = min(limit or DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT)
+
+        # 版本號大於目前最新版本（例如資料庫重建），要求客戶端重新完整同步
+        reset = since > ChangeLogService.latest_version()
+        if reset:
+            since = 0
+
+        rows = (
+            ChangeLog.query.filter(ChangeLog.version > since)
+            .order_by(ChangeLog.version.asc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        version = rows[-1].version if rows else since
+
+        collapsed = ChangeLogService._collapse(rows)
+        match_actions = collapsed[ChangeEntityEnum.MATCH_RECORD]
+        member_actions = collapsed[ChangeEntityEnum.MEMBER]
+        # 新建立的球員也需要帶上初始評分
+        rating_ids = sorted(
+            {
+                entity_id
+                for entity_id, action in collapsed[ChangeEntityEnum.RATING].items()
+                if action != ChangeActionEnum.DELETED
+            }
+            | {
+                entity_id
+                for entity_id, action in member_actions.items()
+                if action == ChangeActionEnum.CREATED
+            }
+        )
+
+        records = {}
+        if match_actions:
+            records = {
+                record.id: record
+                for record in MatchRecord.query.options(joinedload(MatchRecord.match))
+                .filter(MatchRecord.id.in_(list(match_actions)))
+                .all()
+            }
+
+        members = {}
+        member_ids = set(member_actions) | set(rating_ids)
+        if member_ids:
+            members = {
+                member.id: member
+                for member in Member.query.options(
+                    joinedload(Member.user), joinedload(Member.organization)
+                )
+                .filter(Member.id.in_(member_ids))
+                .all()
+                # 訪客只同步給建立者
+                if not member.is_guest or member.created_by_user_id == user_id
+            }
+
+        return {
+            "version": version,
+            "has_more": has_more,
+            "reset": reset,
+            "matches": ChangeLogService._split(match_actions, records),
+            "members": ChangeLogService._split(member_actions, members),
+            "ratings": [members[p_id] for p_id in rating_ids if p_id in members],
+        }
+
+
+@event.listens_for(Session, "before_commit")
+def _assign_change_versions(session):
+    # 回滾後旗標可能殘留，只會多一次查詢；不在 after_rollback 清除，
+    # 避免 savepoint 回滾時誤清外層交易的旗標
+    if session.info.pop(_PENDING_KEY, None):
+        ChangeLogService.assign_versions(session)
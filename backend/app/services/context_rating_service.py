@@ -0,0 +1,97 @@
+# backend/app/services/context_rating_service.py
+"""
+情境評分服務 - 依場地材質、場地環境、比賽類型分開的評分
+
+評分演算在 RatingService（與主評分同一次更新），本服務只負責儲存與查詢；
+排行榜與球員比較以 context 參數直接讀取儲存的情境評分。
+"""
+
+from sqlalchemy import delete, insert, tuple_
+
+from ..extensions import db
+from ..models import ContextRating, Match
+from ..models.context_rating import tracked_contexts
+from ..tools.exceptions import AppException
+
+
+class ContextRatingService:
+    @staticmethod
+    def contexts_of(match: Match) -> list[str]:
+        """比賽所屬的情境（未記錄的欄位不計）"""
+        return [
+            context
+            for context, (dimension, member) in tracked_contexts().items()
+            if getattr(match, dimension) == member
+        ]
+
+    @staticmethod
+    def match_condition(context: str):
+        """篩選該情境比賽的條件（需 join Match）"""
+        if context not in tracked_contexts():
+            raise AppException(
+                f"不支援的情境：{context}",
+                status_code=400,
+                error_code="invalid_context",
+            )
+        dimension, member = tracked_contexts()[context]
+        return getattr(Match, dimension) == member
+
+    @staticmethod
+    def get_or_create(keys: list[tuple], initial_rating: tuple) -> dict:
+        """
+        鎖定並取得情境評分，不存在時以 initial_rating 建立（不提交）
+
+        Args:
+            keys: [(context, member_id)]
+
+        Returns:
+            dict: {(context, member_id): ContextRating}
+        """
+        if not keys:
+            return {}
+        ratings = {
+            (rating.context, rating.member_id): rating
+            for rating in ContextRating.query.filter(
+                tuple_(ContextRating.context, ContextRating.member_id).in_(keys)
+            )
+            .with_for_update()
+            .all()
+        }
+        for context, member_id in keys:
+            if (context, member_id) not in ratings:
+                rating = ContextRating(
+                    context=context,
+                    member_id=member_id,
+                    mu=initial_rating[0],
+                    sigma=initial_rating[1],
+                    matches_played=0,
+                )
+                db.session.add(rating)
+                ratings[(context, member_id)] = rating
+        return ratings
+
+    @staticmethod
+    def get_ratings(context: str, member_ids: list[int] = None) -> dict:
+        """某情境的評分 {member_id: (mu, sigma)}；沒有該情境比賽的球員不在結果中"""
+        query = db.session.query(
+            ContextRating.member_id, ContextRating.mu, ContextRating.sigma
+        ).filter(ContextRating.context == context)
+        if member_ids is not None:
+            query = query.filter(ContextRating.member_id.in_(member_ids))
+        return {row.member_id: (row.mu, row.sigma) for row in query}
+
+    @staticmethod
+    def replace(rows: list[dict], player_ids: list[int] = None) -> None:
+        """
+        以重算結果取代既有情境評分（不提交）
+
+        Args:
+            rows: [{"context", "member_id", "mu", "sigma", "matches_played"}]
+            player_ids: 只取代這些球員的情境評分；None 表示全部
+        """
+        statement = delete(ContextRating)
+        if player_ids is not None:
+            statement = statement.where(ContextRating.member_id.in_(player_ids))
+        db.session.execute(statement)
+        if rows:
+            db.session.execute(insert(ContextRating), rows)
@@ -3,23 +3,41 @@
 排行榜服務層 - 重構版本，基於實際的數據庫結構
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import and_, case, func, or_, union_all
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from ..config import RatingCalculationConfig
 from ..extensions import db
-from ..models import Match, MatchRecord, Member, Organization
+from ..models import Match, MatchRecord, Member, Organization, Season
 from ..models.enums import MatchOutcomeEnum
+from ..models.member import CONSERVATIVE_SCORE_EXPRESSION
+from ..tools.exceptions import AppException
+from .context_rating_service import ContextRatingService
+from .leaderboard_snapshot_service import LeaderboardSnapshotService
+from .member_form_service import MemberFormService
+from .prediction_service import PredictionService
+from .rating_service import RatingService, trueskill_env
+from .rating_snapshot_service import RatingSnapshotService
+
+# 以 _attach_statistics 等方法附加的屬性排序的欄位
+ATTRIBUTE_SORT_KEYS = {
+    "adjusted_win_rate": "_adjusted_win_rate",
+    "win_rate": "_win_rate",
+    "total_matches": "_total_matches",
+    "wins": "_wins",
+    "current_streak": "_current_streak",
+    "longest_win_streak": "_longest_win_streak",
+}
 
 
 class LeaderboardService:
     """排行榜服務類 - 重構版本"""
 
     @staticmethod
-    def get_leaderboard(query_params: dict) -> Dict:
+    def get_leaderboard(query_params: dict) -> dict:
         """
         獲取排行榜數據
 
@@ -30,31 +48,115 @@ class LeaderboardService:
             包含排行榜數據和統計信息的字典
         """
         # 解析查詢參數
-        limit = query_params.get("limit", 50)
         page = query_params.get("page", 1)
         per_page = query_params.get("per_page", 50)
+
+        if query_params.get("sort_by") == "adjusted_win_rate":
+            # 在資料庫中排序分頁
+            paginated_members, total = LeaderboardService._get_adjusted_win_rate_page(
+                query_params, page, per_page
+            )
+            as_of = None
+        else:
+            sorted_members, as_of = LeaderboardService.get_ranked_members(query_params)
+            total = len(sorted_members)
+
+            # 分頁
+            start_idx = (page - 1) * per_page
+            end_idx = start_idx + per_page
+            paginated_members = sorted_members[start_idx:end_idx]
+
+        # 與最近一期快照比較名次與分數（歷史排行榜不比較）；
+        # 快照保存未調整的整體分數，閒置調整或情境評分的分數不與之比較
+        if as_of is None:
+            LeaderboardService._apply_rank_changes(
+                paginated_members,
+                compare_rank=LeaderboardService._is_default_ranking(query_params),
+                compare_score=not (
+                    query_params.get("inactivity_adjusted")
+                    or query_params.get("context")
+                ),
+            )
+
+        # 獲取統計信息
+        statistics = LeaderboardService.get_statistics()
+
+        return {
+            "data": paginated_members,
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": (total + per_page - 1) // per_page,
+            "statistics": statistics,
+            "config": Member.get_trueskill_config(),
+            "query_params": query_params,
+            "as_of": as_of.isoformat() if as_of else None,
+            "inactivity_adjusted": query_params.get("inactivity_adjusted", False),
+            "context": query_params.get("context"),
+        }
+
+    @staticmethod
+    def get_ranked_members(query_params: dict) -> tuple:
+        """
+        依查詢參數篩選、排序並設定 _rank
+
+        Returns:
+            tuple: (排序後的成員列表, as_of)；目前排行榜的 as_of 為 None
+        """
         include_guests = query_params.get("include_guests", True)
         include_inactive = query_params.get("include_inactive", False)
 
+        # 歷史排行榜（as_of / season）：(截止日期, 賽季開始日期)
+        as_of, season_start = LeaderboardService._resolve_history_window(query_params)
+        historical = as_of is not None
+        inactivity_adjusted = query_params.get("inactivity_adjusted", False)
+        context = query_params.get("context")
+        if context and historical:
+            raise AppException(
+                "情境排行榜不支援 as_of / season。",
+                status_code=400,
+                error_code="invalid_query",
+            )
+        # 歷史、閒置調整或情境模式的 σ 不是資料庫中的值，經驗等級改在記憶體中篩選
+        sigma_overridden = historical or inactivity_adjusted or bool(context)
+
         # 構建基礎查詢
         members_query = LeaderboardService._build_base_query(
             include_guests=include_guests, include_inactive=include_inactive
         )
 
         # 應用篩選條件
-        members_query = LeaderboardService._apply_filters(members_query, query_params)
+        members_query = LeaderboardService._apply_filters(
+            members_query, query_params, sigma_overridden=sigma_overridden
+        )
 
         # 獲取成員列表
         all_members = members_query.all()
 
+        # 歷史模式：以評分快照取代目前評分；情境模式：以情境評分取代
+        if historical:
+            all_members = LeaderboardService._apply_historical_ratings(
+                all_members, as_of, season_start
+            )
+        elif context:
+            all_members = LeaderboardService._apply_context_ratings(
+                all_members, context
+            )
+
         # 添加比賽統計
         enriched_members = LeaderboardService._enrich_members_with_match_stats(
-            all_members
+            all_members, start_date=season_start, end_date=as_of, context=context
         )
 
+        # 閒置調整：依最後比賽日期放大 σ（排序與篩選皆使用調整後的值）
+        if inactivity_adjusted:
+            LeaderboardService._apply_inactivity_sigma(
+                enriched_members, as_of or date.today()
+            )
+
         # 應用進階篩選（需要計算後的數據）
         filtered_members = LeaderboardService._apply_advanced_filters(
-            enriched_members, query_params
+            enriched_members, query_params, sigma_overridden=sigma_overridden
         )
 
         # 排序
@@ -68,51 +170,437 @@ class LeaderboardService:
         for i, member in enumerate(sorted_members, 1):
             member._rank = i
 
-        # 分頁
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_members = sorted_members[start_idx:end_idx]
+        return sorted_members, as_of
 
-        # 獲取統計信息
-        statistics = LeaderboardService.get_statistics()
+    @staticmethod
+    def adjusted_win_rate(wins: int, total_matches: int) -> float:
+        """Beta 先驗平滑後的勝率（百分比），與 _adjusted_win_rate_expression 相同"""
+        mean = RatingCalculationConfig.WIN_RATE_PRIOR_MEAN
+        weight = RatingCalculationConfig.WIN_RATE_PRIOR_WEIGHT
+        return round((wins + mean * weight) * 100 / (total_matches + weight), 2)
 
-        return {
-            "data": paginated_members,
-            "total": len(sorted_members),
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (len(sorted_members) + per_page - 1) // per_page,
-            "statistics": statistics,
-            "config": Member.get_trueskill_config(),
-            "query_params": query_params,
-        }
+    @staticmethod
+    def _adjusted_win_rate_expression(wins, total_matches):
+        mean = RatingCalculationConfig.WIN_RATE_PRIOR_MEAN
+        weight = RatingCalculationConfig.WIN_RATE_PRIOR_WEIGHT
+        return (wins + mean * weight) * 100.0 / (total_matches + weight)
+
+    @staticmethod
+    def member_match_totals():
+        """每位球員的勝敗場數與最後比賽日期（子查詢：member_id, wins, losses, last_match_date）"""
+        won_as_a = MatchRecord.side_a_outcome == MatchOutcomeEnum.WIN
+        lost_as_a = MatchRecord.side_a_outcome == MatchOutcomeEnum.LOSS
+        appearances = union_all(
+            *(
+                db.select(
+                    player_column.label("member_id"),
+                    case((won, 1), else_=0).label("win"),
+                    case((lost, 1), else_=0).label("loss"),
+                    Match.match_date.label("match_date"),
+                )
+                .join(Match, MatchRecord.match_id == Match.id)
+                .where(
+                    player_column.isnot(None),
+                    MatchRecord.side_a_outcome.in_(
+                        [MatchOutcomeEnum.WIN, MatchOutcomeEnum.LOSS]
+                    ),
+                )
+                for player_column, won, lost in (
+                    (MatchRecord.player1_id, won_as_a, lost_as_a),
+                    (MatchRecord.player2_id, won_as_a, lost_as_a),
+                    (MatchRecord.player3_id, lost_as_a, won_as_a),
+                    (MatchRecord.player4_id, lost_as_a, won_as_a),
+                )
+            )
+        ).subquery()
+        return (
+            db.select(
+                appearances.c.member_id,
+                func.sum(appearances.c.win).label("wins"),
+                func.sum(appearances.c.loss).label("losses"),
+                func.max(appearances.c.match_date).label("last_match_date"),
+            )
+            .group_by(appearances.c.member_id)
+            .subquery()
+        )
+
+    @staticmethod
+    def _get_adjusted_win_rate_page(params: dict, page: int, per_page: int) -> tuple:
+        """
+        依調整勝率排序的排行榜頁面（排序、篩選、分頁皆在 SQL 中完成）
+
+        調整勝率為彙總勝敗場數上的 Beta 先驗平滑運算式；同分時場數多者、id 小者在前。
+        只支援目前評分，與 as_of / season / context / inactivity_adjusted 不能同時使用。
+
+        Returns:
+            tuple: (本頁成員，已設定 _rank 與比賽統計, 總數)
+        """
+        if (
+            params.get("as_of")
+            or params.get("season")
+            or params.get("context")
+            or params.get("inactivity_adjusted")
+        ):
+            raise AppException(
+                "調整勝率排序只支援目前評分，不能與 as_of、season、context、"
+                "inactivity_adjusted 同時使用。",
+                status_code=400,
+                error_code="invalid_query",
+            )
+
+        totals = LeaderboardService.member_match_totals()
+        wins = func.coalesce(totals.c.wins, 0)
+        total_matches = wins + func.coalesce(totals.c.losses, 0)
+        adjusted = LeaderboardService._adjusted_win_rate_expression(wins, total_matches)
+
+        query = (
+            db.session.query(Member)
+            .outerjoin(totals, totals.c.member_id == Member.id)
+            .filter(
+                *LeaderboardService._member_filters(
+                    params.get("include_guests", True),
+                    params.get("include_inactive", False),
+                )
+            )
+        )
+        query = LeaderboardService._apply_filters(query, params)
+
+        # 與 _apply_advanced_filters 相同的篩選，改以 SQL 表示
+        if params.get("min_matches", 0) > 0:
+            query = query.filter(total_matches >= params["min_matches"])
+        if params.get("min_win_rate") is not None:
+            query = query.filter(
+                case((total_matches > 0, wins * 100.0 / total_matches), else_=0.0)
+                >= params["min_win_rate"]
+            )
+        if params.get("active_since"):
+            query = query.filter(totals.c.last_match_date >= params["active_since"])
+
+        total = query.order_by(None).count()
+
+        if params.get("sort_order", "desc") == "desc":
+            ordering = (adjusted.desc(), total_matches.desc(), Member.id.asc())
+        else:
+            ordering = (adjusted.asc(), total_matches.asc(), Member.id.asc())
+        members = (
+            query.options(joinedload(Member.user), joinedload(Member.organization))
+            .order_by(*ordering)
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+            .all()
+        )
+
+        members = LeaderboardService._enrich_members_with_match_stats(members)
+        for rank, member in enumerate(members, start=(page - 1) * per_page + 1):
+            member._rank = rank
+        return members, total
+
+    @staticmethod
+    def _is_default_ranking(params: dict) -> bool:
+        """是否為預設排行榜（與快照相同的篩選與排序，名次才可比較）"""
+        filter_keys = (
+            "organization_id",
+            "organization_ids",
+            "experience_level",
+            "min_matches",
+            "min_win_rate",
+            "active_since",
+            "joined_after",
+            "inactivity_adjusted",
+            "context",
+        )
+        return (
+            not any(params.get(key) for key in filter_keys)
+            and params.get("include_guests", True)
+            and not params.get("include_inactive", False)
+            and params.get("sort_by", "score") == "score"
+            and params.get("sort_order", "desc") == "desc"
+        )
+
+    @staticmethod
+    def _apply_rank_changes(
+        members: list[Member], compare_rank: bool = True, compare_score: bool = True
+    ) -> None:
+        """
+        設定 _rank_change（正數為名次上升）與 _score_change
+
+        只查詢本頁球員在最近一期快照的資料；沒有快照的球員為 None。
+        篩選或排序與快照不同時名次無法比較，只提供分數變化；
+        分數與快照的計算基礎不同時（compare_score=False）也不提供分數變化。
+        """
+        for member in members:
+            member._rank_change = None
+            member._score_change = None
+        if not (compare_rank or compare_score):
+            return
+
+        period_start = LeaderboardSnapshotService.get_latest_period()
+        if period_start is None:
+            return
+
+        previous = LeaderboardSnapshotService.get_period_rows(
+            period_start, [m.id for m in members]
+        )
+        for member in members:
+            if member.id not in previous:
+                continue
+            previous_rank, previous_score = previous[member.id]
+            if compare_rank:
+                member._rank_change = previous_rank - member._rank
+            if compare_score:
+                member._score_change = round(
+                    member.conservative_score - previous_score, 3
+                )
+
+    @staticmethod
+    def take_snapshot(day: date = None) -> tuple:
+        """
+        保存預設排行榜的名次與分數為 day 所在期別的快照（不提交）
+
+        Returns:
+            tuple: (期別開始日, 球員數)
+        """
+        period_start = LeaderboardSnapshotService.period_start(day or date.today())
+        ranked_members, _ = LeaderboardService.get_ranked_members({})
+        LeaderboardSnapshotService.save_period(
+            period_start,
+            [
+                {
+                    "member_id": member.id,
+                    "rank": member._rank,
+                    "score": member.conservative_score,
+                }
+                for member in ranked_members
+            ],
+        )
+        return period_start, len(ranked_members)
+
+    @staticmethod
+    def get_seasons() -> list[Season]:
+        return Season.query.order_by(Season.start_date.desc()).all()
+
+    @staticmethod
+    def _resolve_history_window(params: dict) -> tuple:
+        """
+        解析歷史排行榜參數
+
+        Returns:
+            tuple: (as_of, season_start)；目前排行榜為 (None, None)。
+                   賽季排行榜以賽季結束日（尚未結束則為今天）的評分排名，
+                   只包含賽季中有比賽的球員。
+        """
+        as_of = params.get("as_of")
+        season_id = params.get("season")
+        if not season_id:
+            return as_of, None
+
+        season = db.session.get(Season, season_id)
+        if not season:
+            raise AppException(
+                "找不到指定的賽季。", status_code=404, error_code="not_found"
+            )
+        season_end = min(season.end_date, date.today())
+        if as_of:
+            season_end = min(season_end, as_of)
+        return season_end, season.start_date
+
+    @staticmethod
+    def _apply_historical_ratings(
+        members: list[Member], as_of: date, season_start: date = None
+    ) -> list[Member]:
+        """
+        將成員的 mu/sigma 換成 as_of 當天的評分（讀取評分快照，不重演比賽）
+
+        以 set_committed_value 設定，不會被視為修改而寫回資料庫。
+        as_of 前沒有比賽的成員為初始評分；之後才加入的成員不列入。
+        """
+        ratings = RatingSnapshotService.get_ratings_as_of(
+            as_of, active_since=season_start
+        )
+        initial_rating = (trueskill_env.mu, trueskill_env.sigma)
+
+        historical_members = []
+        for member in members:
+            if season_start is not None and member.id not in ratings:
+                continue
+            if member.joined_date and member.joined_date > as_of:
+                continue
+
+            mu, sigma = ratings.get(member.id, initial_rating)
+            set_committed_value(member, "mu", mu)
+            set_committed_value(member, "sigma", sigma)
+            historical_members.append(member)
+        return historical_members
+
+    @staticmethod
+    def _apply_context_ratings(members: list[Member], context: str) -> list[Member]:
+        """
+        將成員的 mu/sigma 換成儲存的情境評分（同 _apply_historical_ratings 不寫回）
+
+        沒有該情境比賽的成員不列入。
+        """
+        ContextRatingService.match_condition(context)  # 驗證情境
+        ratings = ContextRatingService.get_ratings(context)
+
+        context_members = []
+        for member in members:
+            if member.id not in ratings:
+                continue
+            mu, sigma = ratings[member.id]
+            set_committed_value(member, "mu", mu)
+            set_committed_value(member, "sigma", sigma)
+            context_members.append(member)
+        return context_members
+
+    @staticmethod
+    def _apply_inactivity_sigma(members: list[Member], as_of: date) -> None:
+        """
+        以 RatingService.effective_sigma 覆寫 σ（需先設定 _last_match_date）
+
+        同 _apply_historical_ratings 以 set_committed_value 設定，不會寫回資料庫；
+        _idle_days 為距最後一場比賽的天數。
+        """
+        for member in members:
+            last_match_date = getattr(member, "_last_match_date", None)
+            member._idle_days = (
+                (as_of - last_match_date).days if last_match_date else None
+            )
+            set_committed_value(
+                member,
+                "sigma",
+                RatingService.effective_sigma(member.sigma, last_match_date, as_of),
+            )
 
     @staticmethod
     def _build_base_query(include_guests: bool = True, include_inactive: bool = False):
-        """構建基礎查詢"""
-        query = db.session.query(Member).options(
-            joinedload(Member.user), joinedload(Member.organization)
+        """構建基礎查詢（依 id 排序，同分時名次穩定）"""
+        return (
+            db.session.query(Member)
+            .options(joinedload(Member.user), joinedload(Member.organization))
+            .filter(
+                *LeaderboardService._member_filters(include_guests, include_inactive)
+            )
+            .order_by(Member.id.asc())
         )
 
+    @staticmethod
+    def _member_filters(
+        include_guests: bool = True, include_inactive: bool = False
+    ) -> list:
+        """排行榜成員範圍的篩選條件"""
+        conditions = []
+
         # 是否包含訪客
         if not include_guests:
-            query = query.filter(Member.is_guest == False)
+            conditions.append(Member.is_guest == False)
 
         # 是否包含非活躍成員
         if not include_inactive:
             # 活躍條件：未離隊且（是訪客或有關聯用戶）
-            query = query.filter(
-                Member.leaved_date.is_(None),
+            conditions.append(Member.leaved_date.is_(None))
+            conditions.append(
                 or_(
                     Member.is_guest == True,
                     and_(Member.is_guest == False, Member.user_id.isnot(None)),
-                ),
+                )
             )
 
-        return query
+        return conditions
 
     @staticmethod
-    def _apply_filters(query, params: dict):
+    def get_member_rank(member_id: int, params: dict) -> dict:
+        """
+        單一球員的名次、百分位與前後 N 名（不建立完整排行榜）
+
+        名次以 COUNT 分數較高者計算，前後球員以 (分數, id) keyset 查詢，
+        皆可使用 ix_members_conservative_score；同分時 id 小者在前，與排行榜一致。
+        """
+        conditions = LeaderboardService._member_filters(
+            params.get("include_guests", True), params.get("include_inactive", False)
+        )
+        if params.get("organization_id"):
+            conditions.append(Member.organization_id == params["organization_id"])
+
+        score = CONSERVATIVE_SCORE_EXPRESSION
+        member_score = (
+            db.session.query(score).filter(Member.id == member_id, *conditions).scalar()
+        )
+        if member_score is None:
+            if not db.session.get(Member, member_id):
+                raise AppException(
+                    "找不到指定的球員。", status_code=404, error_code="not_found"
+                )
+            raise AppException(
+                "該球員不在此排行榜範圍內。",
+                status_code=404,
+                error_code="not_ranked",
+            )
+
+        ranked_above = or_(
+            score > member_score, and_(score == member_score, Member.id < member_id)
+        )
+        ranked_below = or_(
+            score < member_score, and_(score == member_score, Member.id > member_id)
+        )
+        counts = (
+            db.session.query(
+                func.count(Member.id),
+                func.count(Member.id).filter(ranked_above),
+            )
+            .filter(*conditions)
+            .one()
+        )
+        total, above_count = counts
+        rank = above_count + 1
+
+        neighbors = params.get("neighbors", 2)
+        above = (
+            db.session.query(Member.id, score.label("score"))
+            .filter(ranked_above, *conditions)
+            .order_by(score.asc(), Member.id.desc())
+            .limit(neighbors)
+            .all()
+        )[::-1]
+        below = (
+            db.session.query(Member.id, score.label("score"))
+            .filter(ranked_below, *conditions)
+            .order_by(score.desc(), Member.id.asc())
+            .limit(neighbors)
+            .all()
+        )
+        members = {
+            m.id: m
+            for m in Member.query.options(joinedload(Member.user)).filter(
+                Member.id.in_([row.id for row in (*above, *below)])
+            )
+        }
+
+        def neighbor(row, neighbor_rank):
+            member = members[row.id]
+            return {
+                "id": row.id,
+                "display_name": member.display_name,
+                "rank": neighbor_rank,
+                "conservative_score": round(row.score, 2),
+            }
+
+        return {
+            "member_id": member_id,
+            "rank": rank,
+            "total": total,
+            "percentile": round((total - rank) / total * 100, 1),
+            "conservative_score": round(member_score, 2),
+            "above": [
+                neighbor(row, rank - len(above) + index)
+                for index, row in enumerate(above)
+            ],
+            "below": [
+                neighbor(row, rank + index + 1) for index, row in enumerate(below)
+            ],
+        }
+
+    @staticmethod
+    def _apply_filters(query, params: dict, sigma_overridden: bool = False):
         """應用基本篩選條件"""
         # 組織篩選
         if params.get("organization_id"):
@@ -120,8 +608,8 @@ class LeaderboardService:
         elif params.get("organization_ids"):
             query = query.filter(Member.organization_id.in_(params["organization_ids"]))
 
-        # 經驗等級篩選
-        if params.get("experience_level"):
+        # 經驗等級篩選（σ 被覆寫時改在 _apply_advanced_filters 篩選）
+        if params.get("experience_level") and not sigma_overridden:
             # 由於 experience_level 是計算屬性，這裡需要通過 sigma 值來篩選
             level_map = {
                 "新手": (7.0, float("inf")),
@@ -143,11 +631,17 @@ class LeaderboardService:
         return query
 
     @staticmethod
-    def _enrich_members_with_match_stats(members: List[Member]) -> List[Member]:
+    def _enrich_members_with_match_stats(
+        members: list[Member],
+        start_date: date = None,
+        end_date: date = None,
+        context: str = None,
+    ) -> list[Member]:
         """
         為成員添加比賽統計數據 - 簡化版本
 
-        只設置必要的屬性，不搞複雜的別名
+        只設置必要的屬性，不搞複雜的別名；start_date / end_date 限制統計的比賽日期，
+        context 只統計該情境的比賽。近況（連勝 / 近期戰績）一律為目前近況
         """
         if not members:
             return members
@@ -156,10 +650,17 @@ class LeaderboardService:
         print(f"🔍 [DEBUG] 正在為 {len(member_ids)} 個球員計算比賽統計")
 
         # 獲取比賽統計
-        match_stats = LeaderboardService._calculate_match_statistics(member_ids)
+        match_stats = LeaderboardService._calculate_match_statistics(
+            member_ids, start_date, end_date, context
+        )
 
         # 獲取最近比賽日期
-        last_match_dates = LeaderboardService._get_last_match_dates(member_ids)
+        last_match_dates = LeaderboardService._get_last_match_dates(
+            member_ids, end_date, context
+        )
+
+        # 獲取近況（已儲存，一次查詢）
+        forms = MemberFormService.get_forms(member_ids)
 
         # 🔧 簡化：只設置必要的屬性
         for member in members:
@@ -171,8 +672,18 @@ class LeaderboardService:
             member._losses = stats["losses"]
             member._total_matches = stats["total_matches"]
             member._win_rate = stats["win_rate"]
+            member._adjusted_win_rate = LeaderboardService.adjusted_win_rate(
+                stats["wins"], stats["total_matches"]
+            )
             member._last_match_date = last_match_dates.get(member.id)
 
+            form = forms.get(member.id)
+            member._current_streak = form.current_streak if form else 0
+            member._longest_win_streak = form.longest_win_streak if form else 0
+            member._longest_loss_streak = form.longest_loss_streak if form else 0
+            member._recent_form = form.recent_results if form else ""
+            member._recent_wins = form.recent_wins if form else 0
+
             # 🔍 調試輸出
             if stats["total_matches"] > 0:
                 print(
@@ -182,7 +693,26 @@ class LeaderboardService:
         return members
 
     @staticmethod
-    def _calculate_match_statistics(member_ids: List[int]) -> Dict:
+    def _match_records_in_range(start_date=None, end_date=None, condition=None):
+        """比賽記錄查詢，依比賽日期區間與情境條件篩選（無條件時不 join Match）"""
+        query = db.session.query(MatchRecord)
+        if start_date or end_date or condition is not None:
+            query = query.join(Match, MatchRecord.match_id == Match.id)
+            if start_date:
+                query = query.filter(Match.match_date >= start_date)
+            if end_date:
+                query = query.filter(Match.match_date <= end_date)
+            if condition is not None:
+                query = query.filter(condition)
+        return query
+
+    @staticmethod
+    def _calculate_match_statistics(
+        member_ids: list[int],
+        start_date: date = None,
+        end_date: date = None,
+        context: str = None,
+    ) -> dict:
         """
         計算球員的比賽統計 - 修復版本
 
@@ -198,28 +728,30 @@ class LeaderboardService:
 
         # 初始化統計字典
         stats = {member_id: {"wins": 0, "losses": 0} for member_id in member_ids}
+        context_condition = (
+            ContextRatingService.match_condition(context) if context else None
+        )
 
         try:
             # 🔧 關鍵修復：查詢有效的比賽記錄，排除 PENDING
-            matches = (
-                db.session.query(MatchRecord)
-                .filter(
-                    and_(
-                        # 球員篩選條件
-                        or_(
-                            MatchRecord.player1_id.in_(member_ids),
-                            MatchRecord.player2_id.in_(member_ids),
-                            MatchRecord.player3_id.in_(member_ids),
-                            MatchRecord.player4_id.in_(member_ids),
-                        ),
-                        # 🔧 重要：只包含有效的比賽結果
-                        MatchRecord.side_a_outcome.in_(
-                            [MatchOutcomeEnum.WIN, MatchOutcomeEnum.LOSS]
-                        ),
-                    )
-                )
-                .all()
+            query = LeaderboardService._match_records_in_range(
+                start_date, end_date, context_condition
             )
+            matches = query.filter(
+                and_(
+                    # 球員篩選條件
+                    or_(
+                        MatchRecord.player1_id.in_(member_ids),
+                        MatchRecord.player2_id.in_(member_ids),
+                        MatchRecord.player3_id.in_(member_ids),
+                        MatchRecord.player4_id.in_(member_ids),
+                    ),
+                    # 🔧 重要：只包含有效的比賽結果
+                    MatchRecord.side_a_outcome.in_(
+                        [MatchOutcomeEnum.WIN, MatchOutcomeEnum.LOSS]
+                    ),
+                )
+            ).all()
 
             print(f"🔍 [DEBUG] 查詢到 {len(matches)} 場有效比賽記錄")
 
@@ -288,40 +820,53 @@ class LeaderboardService:
         return stats
 
     @staticmethod
-    def _get_last_match_dates(member_ids: List[int]) -> Dict:
+    def _get_last_match_dates(
+        member_ids: list[int], end_date: date = None, context: str = None
+    ) -> dict:
         """
-        獲取球員最後比賽日期 - 修復版本
+        獲取球員最後比賽日期 - 單一彙總查詢
+
+        四個球員欄位以 UNION ALL 展開後依球員取 MAX(match_date)
         """
         if not member_ids:
             return {}
 
         last_dates = {}
+        conditions = [Match.match_date <= (end_date or date.max)]
+        if context:
+            conditions.append(ContextRatingService.match_condition(context))
 
         try:
-            # 🔧 修復：為每個球員查詢最後比賽日期
-            for member_id in member_ids:
-                # 查詢該球員參與的最新比賽
-                last_match = (
-                    db.session.query(Match.match_date)
-                    .join(MatchRecord, MatchRecord.match_id == Match.id)
-                    .filter(
-                        or_(
-                            MatchRecord.player1_id == member_id,
-                            MatchRecord.player2_id == member_id,
-                            MatchRecord.player3_id == member_id,
-                            MatchRecord.player4_id == member_id,
-                        ),
+            appearances = union_all(
+                *(
+                    db.select(
+                        player_column.label("member_id"),
+                        Match.match_date.label("match_date"),
+                    )
+                    .join(Match, MatchRecord.match_id == Match.id)
+                    .where(
+                        player_column.in_(member_ids),
                         # 只考慮有效的比賽
                         MatchRecord.side_a_outcome.in_(
                             [MatchOutcomeEnum.WIN, MatchOutcomeEnum.LOSS]
                         ),
+                        *conditions,
+                    )
+                    for player_column in (
+                        MatchRecord.player1_id,
+                        MatchRecord.player2_id,
+                        MatchRecord.player3_id,
+                        MatchRecord.player4_id,
                     )
-                    .order_by(desc(Match.match_date))
-                    .first()
                 )
+            ).subquery()
 
-                if last_match:
-                    last_dates[member_id] = last_match.match_date
+            rows = db.session.execute(
+                db.select(
+                    appearances.c.member_id, func.max(appearances.c.match_date)
+                ).group_by(appearances.c.member_id)
+            )
+            last_dates = {member_id: last_date for member_id, last_date in rows}
 
         except Exception as e:
             print(f"❌ [ERROR] 獲取最後比賽日期時發生錯誤: {e}")
@@ -329,10 +874,18 @@ class LeaderboardService:
         return last_dates
 
     @staticmethod
-    def _apply_advanced_filters(members: List[Member], params: dict) -> List[Member]:
+    def _apply_advanced_filters(
+        members: list[Member], params: dict, sigma_overridden: bool = False
+    ) -> list[Member]:
         """應用需要計算數據的進階篩選"""
         filtered = members
 
+        # 歷史或閒置調整模式的經驗等級以覆寫後的 σ 計算
+        if sigma_overridden and params.get("experience_level"):
+            filtered = [
+                m for m in filtered if m.experience_level == params["experience_level"]
+            ]
+
         # 最少比賽場次篩選
         if params.get("min_matches", 0) > 0:
             min_matches = params["min_matches"]
@@ -361,22 +914,24 @@ class LeaderboardService:
 
     @staticmethod
     def _sort_members(
-        members: List[Member], sort_by: str, sort_order: str
-    ) -> List[Member]:
+        members: list[Member], sort_by: str, sort_order: str
+    ) -> list[Member]:
         """排序成員列表"""
         reverse = sort_order == "desc"
 
-        if sort_by == "win_rate":
-            return sorted(
-                members, key=lambda m: getattr(m, "_win_rate", 0), reverse=reverse
-            )
-        elif sort_by == "total_matches":
+        if sort_by in ATTRIBUTE_SORT_KEYS:
+            attribute = ATTRIBUTE_SORT_KEYS[sort_by]
             return sorted(
-                members, key=lambda m: getattr(m, "_total_matches", 0), reverse=reverse
+                members, key=lambda m: getattr(m, attribute, 0), reverse=reverse
             )
-        elif sort_by == "wins":
+        elif sort_by == "recent_form":
             return sorted(
-                members, key=lambda m: getattr(m, "_wins", 0), reverse=reverse
+                members,
+                key=lambda m: (
+                    getattr(m, "_recent_wins", 0),
+                    getattr(m, "_current_streak", 0),
+                ),
+                reverse=reverse,
             )
         elif sort_by == "experience":
             exp_order = {"新手": 0, "初級": 1, "中級": 2, "高級": 3, "資深": 4}
@@ -399,19 +954,55 @@ class LeaderboardService:
             return sorted(members, key=lambda m: m.conservative_score, reverse=reverse)
 
     @staticmethod
-    def compare_players(member1_id: int, member2_id: int) -> Dict:
-        """比較兩位球員"""
+    def compare_players(member1_id: int, member2_id: int, context: str = None) -> dict:
+        """
+        比較兩位球員
+
+        context 指定時以儲存的情境評分比較（沒有該情境比賽者為初始評分），
+        比賽統計也只計入該情境的比賽
+        """
         member1 = Member.query.get_or_404(member1_id)
         member2 = Member.query.get_or_404(member2_id)
 
+        if context:
+            ContextRatingService.match_condition(context)  # 驗證情境
+            ratings = ContextRatingService.get_ratings(
+                context, [member1_id, member2_id]
+            )
+            for member in (member1, member2):
+                mu, sigma = ratings.get(
+                    member.id, (trueskill_env.mu, trueskill_env.sigma)
+                )
+                set_committed_value(member, "mu", mu)
+                set_committed_value(member, "sigma", sigma)
+
         # 獲取比賽統計
-        stats = LeaderboardService._calculate_match_statistics([member1_id, member2_id])
+        stats = LeaderboardService._calculate_match_statistics(
+            [member1_id, member2_id], context=context
+        )
 
         # 技能比較
         comparison = member1.compare_skill_with(member2)
 
+        # 預測勝率與對戰品質（單打情境）
+        prediction = PredictionService.evaluate_ratings(
+            [(member1.mu, member1.sigma)], [(member2.mu, member2.sigma)]
+        )
+        comparison.update(
+            {
+                "score_difference": round(
+                    member1.conservative_score - member2.conservative_score, 2
+                ),
+                "mu_difference": round(member1.mu - member2.mu, 3),
+                "sigma_difference": round(member1.sigma - member2.sigma, 3),
+                "predicted_win_probability": round(prediction["win_probability_a"], 4),
+                "match_quality": round(prediction["match_quality"], 4),
+            }
+        )
+
         return {
             "comparison": comparison,
+            "context": context,
             "member1": {
                 "id": member1.id,
                 "name": member1.display_name,
@@ -435,7 +1026,7 @@ class LeaderboardService:
         }
 
     @staticmethod
-    def get_statistics() -> Dict:
+    def get_statistics() -> dict:
         """獲取排行榜統計信息"""
         try:
             # 基本統計
@@ -471,7 +1062,7 @@ class LeaderboardService:
             return LeaderboardService._get_default_statistics()
 
     @staticmethod
-    def _get_basic_statistics() -> Dict:
+    def _get_basic_statistics() -> dict:
         """獲取基本統計信息"""
         # 總人數統計
         total_members = Member.query.filter_by(is_guest=False).count()
@@ -520,7 +1111,7 @@ class LeaderboardService:
         }
 
     @staticmethod
-    def _get_score_distribution() -> Dict:
+    def _get_score_distribution() -> dict:
         """獲取分數分佈"""
         # 使用 Member 的 get_active_players 方法（如果存在）
         active_members_query = Member.query.filter(
@@ -557,7 +1148,7 @@ class LeaderboardService:
         }
 
     @staticmethod
-    def _calculate_std_dev(values: List[float]) -> float:
+    def _calculate_std_dev(values: list[float]) -> float:
         """計算標準差"""
         if not values:
             return 0
@@ -566,7 +1157,7 @@ class LeaderboardService:
         return variance**0.5
 
     @staticmethod
-    def _get_experience_distribution() -> Dict:
+    def _get_experience_distribution() -> dict:
         """獲取經驗等級分佈"""
         # 由於 experience_level 是計算屬性，需要在 Python 中計算
         active_members = Member.query.filter(Member.leaved_date.is_(None)).all()
@@ -579,7 +1170,7 @@ class LeaderboardService:
         return distribution
 
     @staticmethod
-    def _get_organization_distribution() -> Dict:
+    def _get_organization_distribution() -> dict:
         """獲取組織分佈"""
         distribution = (
             db.session.query(Organization.name, func.count(Member.id).label("count"))
@@ -592,7 +1183,7 @@ class LeaderboardService:
         return {org: count for org, count in distribution}
 
     @staticmethod
-    def _get_activity_statistics() -> Dict:
+    def _get_activity_statistics() -> dict:
         """獲取活躍度統計"""
         now = datetime.now()
         last_week = now - timedelta(days=7)
@@ -626,7 +1217,7 @@ class LeaderboardService:
         }
 
     @staticmethod
-    def _get_default_statistics() -> Dict:
+    def _get_default_statistics() -> dict:
         """獲取預設統計信息（錯誤時使用）"""
         return {
             "total_players": 0,
@@ -0,0 +1,83 @@
+# backend/app/services/leaderboard_snapshot_service.py
+"""
+排行榜快照服務 - 保存每期（每週）的名次與分數
+
+快照由排程的 CLI 指令寫入；排行榜以最近一期快照計算名次變化，
+球員的名次軌跡以 (member_id, period_start) 索引一次查詢取得。
+"""
+
+import datetime
+
+from sqlalchemy import delete, func, insert
+
+from ..extensions import db
+from ..models import LeaderboardSnapshot
+
+DEFAULT_HISTORY_LIMIT = 52
+
+
+class LeaderboardSnapshotService:
+    @staticmethod
+    def period_start(day: datetime.date) -> datetime.date:
+        """day 所在期別的開始日（該週週一）"""
+        return day - datetime.timedelta(days=day.weekday())
+
+    @staticmethod
+    def save_period(period_start: datetime.date, rows: list[dict]) -> None:
+        """
+        寫入一期快照，取代該期既有的資料（同一週重跑時覆蓋，不提交）
+
+        Args:
+            rows: [{"member_id", "rank", "score"}]
+        """
+        db.session.execute(
+            delete(LeaderboardSnapshot).where(
+                LeaderboardSnapshot.period_start == period_start
+            )
+        )
+        if rows:
+            db.session.execute(
+                insert(LeaderboardSnapshot),
+                [{"period_start": period_start, **row} for row in rows],
+            )
+
+    @staticmethod
+    def get_latest_period(before: datetime.date = None) -> datetime.date:
+        """最近一期快照的開始日；before 限定在此日期之前（含），沒有快照時為 None"""
+        query = db.session.query(func.max(LeaderboardSnapshot.period_start))
+        if before is not None:
+            query = query.filter(LeaderboardSnapshot.period_start <= before)
+        return query.scalar()
+
+    @staticmethod
+    def get_period_rows(period_start: datetime.date, member_ids: list[int]) -> dict:
+        """
+        取得指定球員在某一期的快照
+
+        Returns:
+            dict: {member_id: (rank, score)}
+        """
+        if not member_ids:
+            return {}
+        rows = db.session.query(
+            LeaderboardSnapshot.member_id,
+            LeaderboardSnapshot.rank,
+            LeaderboardSnapshot.score,
+        ).filter(
+            LeaderboardSnapshot.period_start == period_start,
+            LeaderboardSnapshot.member_id.in_(member_ids),
+        )
+        return {row.member_id: (row.rank, row.score) for row in rows}
+
+    @staticmethod
+    def get_member_history(
+        member_id: int, limit: int = DEFAULT_HISTORY_LIMIT
+    ) -> list[LeaderboardSnapshot]:
+        """球員的名次軌跡，依期別由舊到新（取最近 limit 期）"""
+        snapshots = (
+            LeaderboardSnapshot.query.filter(LeaderboardSnapshot.member_id == member_id)
+            .order_by(LeaderboardSnapshot.period_start.desc())
+            .limit(limit)
+            .all()
+        )
+        return snapshots[::-1]
@@ -0,0 +1,290 @@
+# backend/app/services/live_scoring_service.py
+"""
+即時計分服務 - 計分員逐分記錄比賽
+
+每一分新增一筆 LivePointEvent（只新增不修改），同時更新 LiveMatch 快照列的目前比分；
+新增一分只需讀寫快照列與新增一筆事件，與比賽已進行的分數無關。
+最後一局結束時在同一交易中寫入 MatchRecord，並依一般比賽流程更新評分。
+"""
+
+import datetime
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import LiveMatch, LivePointEvent
+from ..models.enums import LiveMatchStatusEnum
+from ..models.enums.match_enums import MatchStartServeEnum
+from ..tools.event_bus import publish_after_commit
+from ..tools.exceptions import AppException
+from .match_service import MatchRecordService
+
+GAME_POINTS = 4  # 一般局先得 4 分（3:3 後須領先 2 分）
+FINAL_GAME_POINTS = 7  # 決勝局先得 7 分（6:6 後須領先 2 分）
+DEFAULT_EVENTS_LIMIT = 500
+
+
+class LiveScoringService:
+    @staticmethod
+    def _get_for_update(live_match_id: int, user_id: int) -> LiveMatch:
+        """鎖定快照列；只有建立者（計分員）可以修改"""
+        live_match = (
+            LiveMatch.query.filter(LiveMatch.id == live_match_id)
+            .with_for_update()
+            .first()
+        )
+        if not live_match:
+            raise AppException(
+                "找不到即時比賽。", status_code=404, error_code="not_found"
+            )
+        if live_match.created_by_user_id != user_id:
+            raise AppException(
+                "只有計分員可以記錄此比賽。",
+                status_code=403,
+                error_code="permission_denied",
+            )
+        if live_match.status != LiveMatchStatusEnum.IN_PROGRESS:
+            raise AppException(
+                "比賽已結束，無法再記錄。",
+                status_code=409,
+                error_code="live_match_closed",
+            )
+        return live_match
+
+    @staticmethod
+    def _publish(live_match: LiveMatch, event_type: str, **extra) -> None:
+        publish_after_commit(
+            db.session,
+            {
+                "type": event_type,
+                "live_match_id": live_match.id,
+                "status": live_match.status.value,
+                "current_game": live_match.current_game,
+                "a_points": live_match.a_points,
+                "b_points": live_match.b_points,
+                "a_games": live_match.a_games,
+                "b_games": live_match.b_games,
+                "last_sequence": live_match.last_sequence,
+                **extra,
+            },
+        )
+
+    @staticmethod
+    def get_live_match(live_match_id: int) -> LiveMatch:
+        live_match = db.session.get(LiveMatch, live_match_id)
+        if not live_match:
+            raise AppException(
+                "找不到即時比賽。", status_code=404, error_code="not_found"
+            )
+        return live_match
+
+    @staticmethod
+    def get_live_matches(status: LiveMatchStatusEnum = None) -> list[LiveMatch]:
+        query = LiveMatch.query
+        if status is not None:
+            query = query.filter(LiveMatch.status == status)
+        return query.order_by(LiveMatch.updated_at.desc()).limit(100).all()
+
+    @staticmethod
+    def get_events(
+        live_match_id: int, after: int = 0, limit: int = DEFAULT_EVENTS_LIMIT
+    ) -> list[LivePointEvent]:
+        """取得序號 after 之後的事件（客戶端補齊漏接的分數）"""
+        LiveScoringService.get_live_match(live_match_id)
+        return (
+            LivePointEvent.query.filter(
+                LivePointEvent.live_match_id == live_match_id,
+                LivePointEvent.sequence > after,
+            )
+            .order_by(LivePointEvent.sequence.asc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def start_match(data: dict, user_id: int) -> LiveMatch:
+        try:
+            live_match = LiveMatch(
+                match_date=data["match_date"],
+                match_type=data["match_type"],
+                match_format=data["match_format"],
+                match_time_slot=data.get("time_slot"),
+                court_surface=data.get("court_surface"),
+                court_environment=data.get("court_environment"),
+                player1_id=data["player1_id"],
+                player2_id=data.get("player2_id"),
+                player3_id=data["player3_id"],
+                player4_id=data.get("player4_id"),
+                first_serve_side=data["first_serve_side"],
+                current_game=1,
+                a_points=0,
+                b_points=0,
+                a_games=0,
+                b_games=0,
+                completed_games=[],
+                last_sequence=0,
+                created_by_user_id=user_id,
+            )
+            db.session.add(live_match)
+            db.session.flush()
+
+            LiveScoringService._publish(live_match, "live_started")
+            db.session.commit()
+            return live_match
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"建立即時比賽時出錯: {e}", exc_info=True)
+            raise AppException("建立即時比賽時發生未預期錯誤。") from e
+
+    @staticmethod
+    def _game_winner(live_match: LiveMatch) -> MatchStartServeEnum:
+        """本局勝方，尚未結束時為 None"""
+        target = FINAL_GAME_POINTS if live_match.is_final_game else GAME_POINTS
+        a_points, b_points = live_match.a_points, live_match.b_points
+        if a_points >= target and a_points - b_points >= 2:
+            return MatchStartServeEnum.SIDE_A
+        if b_points >= target and b_points - a_points >= 2:
+            return MatchStartServeEnum.SIDE_B
+        return None
+
+    @staticmethod
+    def _finalize(live_match: LiveMatch) -> None:
+        """比賽結束：寫入 MatchRecord（比分由 update_games_total 計算總局數）"""
+        data = {
+            "match_date": live_match.match_date,
+            "match_type": live_match.match_type,
+            "match_format": live_match.match_format,
+            "time_slot": live_match.match_time_slot,
+            "court_surface": live_match.court_surface,
+            "court_environment": live_match.court_environment,
+            "total_points": live_match.last_sequence,
+            "player1_id": live_match.player1_id,
+            "player2_id": live_match.player2_id,
+            "player3_id": live_match.player3_id,
+            "player4_id": live_match.player4_id,
+            "a_games": live_match.a_games,
+            "b_games": live_match.b_games,
+            "first_serve_side": live_match.first_serve_side,
+            "idempotency_key": f"live-{live_match.id}",
+        }
+        for game_number, (a_score, b_score) in enumerate(
+            live_match.completed_games, start=1
+        ):
+            data[f"game{game_number}_a_score"] = a_score
+            data[f"game{game_number}_b_score"] = b_score
+
+        record = MatchRecordService.add_match_record(data, detailed=True)
+        live_match.match_record_id = record.id
+        live_match.status = LiveMatchStatusEnum.FINALIZED
+        live_match.finished_at = datetime.datetime.now()
+
+    @staticmethod
+    def add_point(
+        live_match_id: int,
+        user_id: int,
+        scoring_side: MatchStartServeEnum,
+        server_side: MatchStartServeEnum = None,
+        expected_sequence: int = None,
+    ) -> tuple[LiveMatch, LivePointEvent]:
+        """
+        記錄一分
+
+        Args:
+            scoring_side: 得分方
+            server_side: 發球方，未提供時依局數推算（同 MatchRecord.get_serve_side_for_game）
+            expected_sequence: 客戶端看到的最後序號；與目前不同時回傳 409，避免重複記分
+
+        Returns:
+            (更新後的快照, 新增的事件)
+        """
+        live_match = LiveScoringService._get_for_update(live_match_id, user_id)
+        if (
+            expected_sequence is not None
+            and expected_sequence != live_match.last_sequence
+        ):
+            raise AppException(
+                "比分已被更新，請重新取得目前比分。",
+                status_code=409,
+                error_code="sequence_conflict",
+                payload={"last_sequence": live_match.last_sequence},
+            )
+
+        try:
+            point = LivePointEvent(
+                live_match_id=live_match.id,
+                sequence=live_match.last_sequence + 1,
+                game_number=live_match.current_game,
+                scoring_side=scoring_side,
+                server_side=server_side or MatchStartServeEnum(live_match.serve_side),
+            )
+            db.session.add(point)
+
+            live_match.last_sequence = point.sequence
+            if scoring_side == MatchStartServeEnum.SIDE_A:
+                live_match.a_points += 1
+            else:
+                live_match.b_points += 1
+
+            game_winner = LiveScoringService._game_winner(live_match)
+            if game_winner is not None:
+                live_match.completed_games = [
+                    *live_match.completed_games,
+                    [live_match.a_points, live_match.b_points],
+                ]
+                if game_winner == MatchStartServeEnum.SIDE_A:
+                    live_match.a_games += 1
+                else:
+                    live_match.b_games += 1
+                live_match.a_points = 0
+                live_match.b_points = 0
+
+                required = live_match.required_games
+                if max(live_match.a_games, live_match.b_games) >= required:
+                    LiveScoringService._finalize(live_match)
+                else:
+                    live_match.current_game += 1
+
+            live_match.updated_at = datetime.datetime.now()
+            LiveScoringService._publish(
+                live_match,
+                "live_point",
+                sequence=point.sequence,
+                game_number=point.game_number,
+                scoring_side=point.scoring_side.value,
+                server_side=point.server_side.value,
+                match_record_id=live_match.match_record_id,
+            )
+            db.session.commit()
+            return live_match, point
+
+        except IntegrityError:
+            # 同一序號已由另一個請求寫入
+            db.session.rollback()
+            raise AppException(
+                "比分已被更新，請重新取得目前比分。",
+                status_code=409,
+                error_code="sequence_conflict",
+            ) from None
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"記錄即時比分時出錯: {e}", exc_info=True)
+            if isinstance(e, AppException):
+                raise e
+            raise AppException("記錄比分時發生未預期錯誤。") from e
+
+    @staticmethod
+    def abandon_match(live_match_id: int, user_id: int) -> LiveMatch:
+        """中止比賽，不寫入比賽記錄"""
+        live_match = LiveScoringService._get_for_update(live_match_id, user_id)
+        try:
+            live_match.status = LiveMatchStatusEnum.ABANDONED
+            live_match.finished_at = datetime.datetime.now()
+            live_match.updated_at = live_match.finished_at
+            LiveScoringService._publish(live_match, "live_abandoned")
+            db.session.commit()
+            return live_match
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"中止即時比賽時出錯: {e}", exc_info=True)
+            raise AppException("中止比賽時發生未預期錯誤。") from e
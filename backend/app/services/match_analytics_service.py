@@ -1,24 +1,41 @@
 # backend/app/services/match_analytics_service.py
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import selectinload
 
-from ..models import Match, MatchRecord
+from ..extensions import db
+from ..models import Match, MatchGame, MatchRecord
+from ..models.enums import MatchFormatEnum
+from ..models.enums.match_enums import MatchStartServeEnum
+
+# 各賽制的決勝局局數（決勝局 6:6 才進入 deuce，一般局為 3:3）
+FINAL_GAME_BY_FORMAT = {
+    MatchFormatEnum.GAMES_5: 5,
+    MatchFormatEnum.GAMES_7: 7,
+    MatchFormatEnum.GAMES_9: 9,
+}
 
 
 class MatchAnalyticsService:
+    @staticmethod
+    def _filter_matches(query, args: dict = None):
+        """依 start_date / end_date / match_type / match_format 篩選（query 需已 join Match）"""
+        args = args or {}
+        if start_date := args.get("start_date"):
+            query = query.filter(Match.match_date >= start_date)
+        if end_date := args.get("end_date"):
+            query = query.filter(Match.match_date <= end_date)
+        if match_type := args.get("match_type"):
+            query = query.filter(Match.match_type == match_type)
+        if match_format := args.get("match_format"):
+            query = query.filter(Match.match_format == match_format)
+        return query
+
     @staticmethod
     def get_match_statistics(args: dict = None) -> dict:
         try:
-            query = MatchRecord.query.join(Match)
-
-            if args:
-                if start_date := args.get("start_date"):
-                    query = query.filter(Match.match_date >= start_date)
-                if end_date := args.get("end_date"):
-                    query = query.filter(Match.match_date <= end_date)
-                if match_type := args.get("match_type"):
-                    query = query.filter(Match.match_type == match_type)
-                if match_format := args.get("match_format"):
-                    query = query.filter(Match.match_format == match_format)
+            query = MatchAnalyticsService._filter_matches(
+                MatchRecord.query.join(Match), args
+            )
 
             total_matches = query.count()
             if total_matches == 0:
@@ -60,7 +77,8 @@ class MatchAnalyticsService:
     @staticmethod
     def analyze_member_serve_performance(member_id: int, limit: int = 10) -> dict:
         matches = (
-            MatchRecord.query.filter(
+            MatchRecord.query.options(selectinload(MatchRecord.games))
+            .filter(
                 and_(
                     or_(
                         MatchRecord.player1_id == member_id,
@@ -159,6 +177,105 @@ class MatchAnalyticsService:
             "recent_matches": match_details,
         }
 
+    @staticmethod
+    def get_game_statistics(member_id: int = None, args: dict = None) -> dict:
+        """
+        以 match_games 彙總每局統計（單一查詢）
+
+        Args:
+            member_id: 指定時只統計該球員的比賽，發球/接發以該球員所在方計算
+            args: start_date / end_date / match_type / match_format 篩選
+
+        Returns:
+            dict: 局數、deuce 局數與比率、發球局保發率；指定球員時另含接發局破發率
+        """
+        a_won = MatchGame.a_score > MatchGame.b_score
+        b_won = MatchGame.b_score > MatchGame.a_score
+        deuce_points = case(
+            (
+                MatchGame.game_number
+                == case(FINAL_GAME_BY_FORMAT, value=Match.match_format, else_=9),
+                6,
+            ),
+            else_=3,
+        )
+        is_deuce = and_(
+            MatchGame.a_score >= deuce_points, MatchGame.b_score >= deuce_points
+        )
+
+        if member_id is None:
+            is_serve = MatchGame.server_side.isnot(None)
+            is_hold = or_(
+                and_(MatchGame.server_side == MatchStartServeEnum.SIDE_A, a_won),
+                and_(MatchGame.server_side == MatchStartServeEnum.SIDE_B, b_won),
+            )
+            is_return = is_break = None
+        else:
+            on_side_a = or_(
+                MatchRecord.player1_id == member_id, MatchRecord.player2_id == member_id
+            )
+            serves_a = MatchGame.server_side == MatchStartServeEnum.SIDE_A
+            serves_b = MatchGame.server_side == MatchStartServeEnum.SIDE_B
+            own_won = or_(and_(on_side_a, a_won), and_(~on_side_a, b_won))
+            is_serve = or_(and_(on_side_a, serves_a), and_(~on_side_a, serves_b))
+            is_hold = and_(is_serve, own_won)
+            is_return = or_(and_(on_side_a, serves_b), and_(~on_side_a, serves_a))
+            is_break = and_(is_return, own_won)
+
+        def count_if(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        columns = [
+            func.count().label("total_games"),
+            count_if(is_deuce).label("deuce_games"),
+            count_if(is_serve).label("serve_games"),
+            count_if(is_hold).label("serve_holds"),
+        ]
+        if member_id is not None:
+            columns += [
+                count_if(is_return).label("return_games"),
+                count_if(is_break).label("return_breaks"),
+            ]
+
+        query = (
+            db.session.query(*columns)
+            .select_from(MatchGame)
+            .join(MatchRecord, MatchRecord.id == MatchGame.match_record_id)
+            .join(Match, Match.id == MatchRecord.match_id)
+        )
+        if member_id is not None:
+            query = query.filter(
+                or_(
+                    MatchRecord.player1_id == member_id,
+                    MatchRecord.player2_id == member_id,
+                    MatchRecord.player3_id == member_id,
+                    MatchRecord.player4_id == member_id,
+                )
+            )
+        row = MatchAnalyticsService._filter_matches(query, args).one()
+
+        def rate(count, total):
+            return round(count / total * 100, 1) if total else 0.0
+
+        result = {
+            "member_id": member_id,
+            "total_games": row.total_games,
+            "deuce_games": row.deuce_games,
+            "deuce_rate": rate(row.deuce_games, row.total_games),
+            "serve_games": row.serve_games,
+            "serve_holds": row.serve_holds,
+            "serve_hold_rate": rate(row.serve_holds, row.serve_games),
+        }
+        if member_id is not None:
+            result.update(
+                {
+                    "return_games": row.return_games,
+                    "return_breaks": row.return_breaks,
+                    "break_rate": rate(row.return_breaks, row.return_games),
+                }
+            )
+        return result
+
     @staticmethod
     def get_match_serve_analysis(record_id: int) -> dict:
         record = MatchRecord.query.get(record_id)
@@ -1,13 +1,44 @@
 # backend/app/services/match_service.py
+import datetime
+import hashlib
+import json
+
 from flask import current_app
 from sqlalchemy import asc, desc, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 
 from ..extensions import db
 from ..models import Match, MatchRecord
-from ..models.enums.match_enums import MatchOutcomeEnum, MatchStartServeEnum
+from ..models.enums import ChangeActionEnum, ChangeEntityEnum
+from ..models.enums.match_enums import (
+    MatchOutcomeEnum,
+    MatchStartServeEnum,
+    MatchTimeSlotEnum,
+)
+from ..models.match_record import MAX_GAMES
+from ..tools.event_bus import publish_after_commit
 from ..tools.exceptions import AppException, ValidationError
-from .rating_service import RatingService
+from .change_log_service import ChangeLogService
+from .performance_cube_service import PerformanceCubeService
+from .rating_job_service import RatingJobService
+
+# 同一天內的比賽以時段排序，未填時段的排在最後
+BATCH_TIME_SLOT_ORDER = {
+    MatchTimeSlotEnum.MORNING: 0,
+    MatchTimeSlotEnum.AFTERNOON: 1,
+    MatchTimeSlotEnum.EVENING: 2,
+}
+
+# 不影響比賽內容、不納入冪等請求指紋的欄位
+FINGERPRINT_EXCLUDED_FIELDS = ("idempotency_key", "recorded_at")
+
+# 建立/更新請求中的每局比分欄位
+GAME_SCORE_FIELDS = [
+    f"game{game_number}_{side}_score"
+    for game_number in range(1, MAX_GAMES + 1)
+    for side in ("a", "b")
+]
 
 
 class MatchRecordService:
@@ -16,99 +47,304 @@ class MatchRecordService:
         return MatchOutcomeEnum.WIN if games_a > games_b else MatchOutcomeEnum.LOSS
 
     @staticmethod
-    def create_match_record(data: dict) -> MatchRecord:
-        try:
-            new_match = Match(
-                match_date=data["match_date"],
-                match_type=data["match_type"],
-                match_format=data["match_format"],
-                court_surface=data.get("court_surface"),
-                court_environment=data.get("court_environment"),
-                match_time_slot=data.get("time_slot"),
-                total_points=data.get("total_points"),
-                duration_minutes=data.get("duration_minutes"),
-                youtube_url=data.get("youtube_url"),
-                notes=data.get("match_notes"),
-            )
-            db.session.add(new_match)
-
-            new_record = MatchRecord(
-                match=new_match,
-                player1_id=data["player1_id"],
-                player2_id=data.get("player2_id"),
-                player3_id=data["player3_id"],
-                player4_id=data.get("player4_id"),
-                a_games=data["a_games"],
-                b_games=data["b_games"],
+    def _build_match_record(data: dict, detailed: bool = False) -> MatchRecord:
+        """依驗證後的資料建立 Match 與 MatchRecord 並加入 session（不 flush）"""
+        new_match = Match(
+            match_date=data["match_date"],
+            match_type=data["match_type"],
+            match_format=data["match_format"],
+            court_surface=data.get("court_surface"),
+            court_environment=data.get("court_environment"),
+            match_time_slot=data.get("time_slot"),
+            total_points=data.get("total_points"),
+            duration_minutes=data.get("duration_minutes"),
+            youtube_url=data.get("youtube_url"),
+            notes=data.get("match_notes"),
+        )
+        db.session.add(new_match)
+
+        new_record = MatchRecord(
+            match=new_match,
+            player1_id=data["player1_id"],
+            player2_id=data.get("player2_id"),
+            player3_id=data["player3_id"],
+            player4_id=data.get("player4_id"),
+            a_games=data["a_games"],
+            b_games=data["b_games"],
+            idempotency_key=data.get("idempotency_key"),
+            idempotency_fingerprint=(
+                MatchRecordService.payload_fingerprint(data)
+                if data.get("idempotency_key")
+                else None
+            ),
+        )
+
+        if detailed:
+            MatchRecordService._set_detailed_scores(new_record, data)
+            MatchRecordService._set_serve_tracking(new_record, data)
+
+            if MatchRecordService._has_any_detailed_scores(data):
+                new_record.update_games_total()
+
+        new_record.side_a_outcome = MatchRecordService._calculate_outcome(
+            new_record.a_games, new_record.b_games
+        )
+        db.session.add(new_record)
+        return new_record
+
+    @staticmethod
+    def _record_change(record: MatchRecord, action: ChangeActionEnum) -> None:
+        """寫入變更紀錄，並在提交後推播比賽摘要事件"""
+        ChangeLogService.record(ChangeEntityEnum.MATCH_RECORD, record.id, action)
+
+        event_data = {"type": f"match_{action.value}", "record_id": record.id}
+        if action != ChangeActionEnum.DELETED:
+            event_data.update(
+                {
+                    "match_date": (
+                        record.match.match_date.isoformat() if record.match else None
+                    ),
+                    "side_a": [
+                        p_id for p_id in (record.player1_id, record.player2_id) if p_id
+                    ],
+                    "side_b": [
+                        p_id for p_id in (record.player3_id, record.player4_id) if p_id
+                    ],
+                    "a_games": record.a_games,
+                    "b_games": record.b_games,
+                    "side_a_won": record.side_a_outcome == MatchOutcomeEnum.WIN,
+                }
             )
-            new_record.side_a_outcome = MatchRecordService._calculate_outcome(
-                new_record.a_games, new_record.b_games
+        publish_after_commit(db.session, event_data)
+
+    @staticmethod
+    def add_match_record(data: dict, detailed: bool = False) -> MatchRecord:
+        """
+        新增比賽記錄、寫入變更紀錄並排程評分更新（不提交，由呼叫端提交）
+        """
+        new_record = MatchRecordService._build_match_record(data, detailed)
+        db.session.flush()
+
+        MatchRecordService._record_change(new_record, ChangeActionEnum.CREATED)
+        PerformanceCubeService.apply({}, [new_record])
+        RatingJobService.schedule_match_update(new_record)
+        return new_record
+
+    @staticmethod
+    def payload_fingerprint(data: dict) -> str:
+        """驗證後建立資料的 SHA-256（排除冪等鍵與記錄時間）"""
+        payload = {
+            key: value
+            for key, value in data.items()
+            if key not in FINGERPRINT_EXCLUDED_FIELDS and value is not None
+        }
+        canonical = json.dumps(
+            payload,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=lambda value: getattr(value, "value", str(value)),
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def _check_fingerprint(record: MatchRecord, data: dict) -> None:
+        """冪等鍵已被內容不同的請求使用時拋出 422（舊資料沒有指紋則不檢查）"""
+        if (
+            record.idempotency_fingerprint
+            and record.idempotency_fingerprint
+            != MatchRecordService.payload_fingerprint(data)
+        ):
+            raise AppException(
+                f"冪等鍵 '{record.idempotency_key}' 已用於內容不同的比賽。",
+                status_code=422,
+                error_code="idempotency_key_reused",
             )
-            db.session.add(new_record)
 
-            RatingService.update_ratings_from_match(new_record)
+    @staticmethod
+    def get_by_idempotency_key(key: str):
+        if not key:
+            return None
+        return MatchRecord.query.filter_by(idempotency_key=key).first()
+
+    @staticmethod
+    def find_existing(data: dict):
+        """
+        以冪等鍵取得先前建立的記錄；內容與先前的請求不同時拋出 422
+
+        Returns:
+            MatchRecord | None
+        """
+        existing = MatchRecordService.get_by_idempotency_key(
+            data.get("idempotency_key")
+        )
+        if existing:
+            MatchRecordService._check_fingerprint(existing, data)
+        return existing
+
+    @staticmethod
+    def _create(data: dict, detailed: bool) -> MatchRecord:
+        """建立單場比賽；冪等鍵已存在且內容相同時回傳既有記錄，不重複建立"""
+        existing = MatchRecordService.find_existing(data)
+        if existing:
+            return existing
+
+        try:
+            new_record = MatchRecordService.add_match_record(data, detailed)
             db.session.commit()
             return new_record
 
+        except IntegrityError as e:
+            # 同一冪等鍵的請求同時送達，另一個請求已先建立
+            db.session.rollback()
+            existing = MatchRecordService.find_existing(data)
+            if existing:
+                return existing
+            current_app.logger.error("創建比賽記錄時發生資料完整性錯誤", exc_info=True)
+            raise AppException("創建比賽記錄時發生未預期錯誤。") from e
         except Exception as e:
             db.session.rollback()
-            current_app.logger.error(f"創建比賽記錄時出錯: {e}", exc_info=True)
+            label = "詳細比賽記錄" if detailed else "比賽記錄"
+            current_app.logger.error(f"創建{label}時出錯: {e}", exc_info=True)
             if isinstance(e, ValidationError):
                 raise e
-            raise AppException("創建比賽記錄時發生未預期錯誤。")
+            raise AppException("創建比賽記錄時發生未預期錯誤。") from e
+
+    @staticmethod
+    def create_match_record(data: dict) -> MatchRecord:
+        return MatchRecordService._create(data, detailed=False)
 
     @staticmethod
     def create_match_record_detailed(data: dict) -> MatchRecord:
-        try:
-            new_match = Match(
-                match_date=data["match_date"],
-                match_type=data["match_type"],
-                match_format=data["match_format"],
-                court_surface=data.get("court_surface"),
-                court_environment=data.get("court_environment"),
-                match_time_slot=data.get("time_slot"),
-                total_points=data.get("total_points"),
-                duration_minutes=data.get("duration_minutes"),
-                youtube_url=data.get("youtube_url"),
-                notes=data.get("match_notes"),
-            )
-            db.session.add(new_match)
-
-            new_record = MatchRecord(
-                match=new_match,
-                player1_id=data["player1_id"],
-                player2_id=data.get("player2_id"),
-                player3_id=data["player3_id"],
-                player4_id=data.get("player4_id"),
-                a_games=data["a_games"],
-                b_games=data["b_games"],
+        return MatchRecordService._create(data, detailed=True)
+
+    @staticmethod
+    def _batch_sort_key(item: tuple):
+        """批次排序：比賽日期 → 時段 → 客戶端記錄時間 → 送出順序"""
+        index, data = item
+        recorded_at = data.get("recorded_at")
+        if recorded_at is not None and recorded_at.tzinfo is not None:
+            recorded_at = recorded_at.astimezone(datetime.timezone.utc).replace(
+                tzinfo=None
             )
+        return (
+            data["match_date"],
+            BATCH_TIME_SLOT_ORDER.get(
+                data.get("time_slot"), len(BATCH_TIME_SLOT_ORDER)
+            ),
+            recorded_at is None,
+            recorded_at or datetime.datetime.min,
+            index,
+        )
 
-            MatchRecordService._set_detailed_scores(new_record, data)
-            MatchRecordService._set_serve_tracking(new_record, data)
+    @staticmethod
+    def _split_batch_duplicates(items: list[dict], existing: dict) -> tuple:
+        """
+        區分批次中已提交過的比賽與待建立的比賽
+
+        Returns:
+            tuple: (results, pending)；results 依送出順序，重複的比賽為 duplicate
+                   結果、待建立的為 None；pending 為 [(index, data)]
+        """
+        results = [None] * len(items)
+        pending = []
+        seen_keys = {}
+        for index, data in enumerate(items):
+            key = data["idempotency_key"]
+            fingerprint = MatchRecordService.payload_fingerprint(data)
+            if key in existing:
+                MatchRecordService._check_fingerprint(existing[key], data)
+            elif key in seen_keys and seen_keys[key] != fingerprint:
+                raise AppException(
+                    f"冪等鍵 '{key}' 在批次中用於內容不同的比賽。",
+                    status_code=422,
+                    error_code="idempotency_key_reused",
+                )
+            if key in existing or key in seen_keys:
+                results[index] = {
+                    "index": index,
+                    "idempotency_key": key,
+                    "status": "duplicate",
+                }
+                continue
+            seen_keys[key] = fingerprint
+            pending.append((index, data))
+        return results, pending
 
-            if MatchRecordService._has_any_detailed_scores(data):
-                new_record.update_games_total()
+    @staticmethod
+    def create_match_records_batch(items: list[dict]) -> list[dict]:
+        """
+        批次建立離線記錄的比賽（單一交易）
+
+        - 以 idempotency_key 去除批次內與資料庫中已存在的重複比賽；
+          同一冪等鍵搭配不同內容時拒絕整個批次（422）
+        - 依比賽日期、時段與記錄時間排序後建立，評分依此順序只計算一次
+
+        Returns:
+            list: 依送出順序的結果 [{"index", "idempotency_key", "status", "record"}]，
+                  status 為 created / duplicate
+        """
+        keys = [item["idempotency_key"] for item in items]
+        existing = {
+            record.idempotency_key: record
+            for record in MatchRecord.query.filter(
+                MatchRecord.idempotency_key.in_(set(keys))
+            ).all()
+        }
 
-            new_record.side_a_outcome = MatchRecordService._calculate_outcome(
-                new_record.a_games, new_record.b_games
-            )
+        results, pending = MatchRecordService._split_batch_duplicates(items, existing)
+        pending.sort(key=MatchRecordService._batch_sort_key)
 
-            db.session.add(new_record)
-            RatingService.update_ratings_from_match(new_record)
+        try:
+            created = {}
+            for index, data in pending:
+                created[index] = MatchRecordService._build_match_record(
+                    data, detailed=True
+                )
+                # 依排序後的順序 flush，讓 id 順序與比賽時間順序一致
+                db.session.flush()
+
+            ordered_records = [created[index] for index, _ in pending]
+            for record in ordered_records:
+                MatchRecordService._record_change(record, ChangeActionEnum.CREATED)
+            PerformanceCubeService.apply({}, ordered_records)
+            RatingJobService.schedule_batch(ordered_records)
             db.session.commit()
-            return new_record
 
+        except IntegrityError as e:
+            db.session.rollback()
+            current_app.logger.warning("批次提交比賽時冪等鍵衝突", exc_info=True)
+            raise AppException(
+                "部分比賽正在由其他請求提交，請稍後重試。",
+                status_code=409,
+                error_code="idempotency_conflict",
+            ) from e
         except Exception as e:
             db.session.rollback()
-            current_app.logger.error(f"創建詳細比賽記錄時出錯: {e}", exc_info=True)
-            if isinstance(e, ValidationError):
+            current_app.logger.error(f"批次建立比賽記錄時出錯: {e}", exc_info=True)
+            if isinstance(e, (ValidationError, AppException)):
                 raise e
-            raise AppException("創建比賽記錄時發生未預期錯誤。")
+            raise AppException("批次建立比賽記錄時發生未預期錯誤。") from e
+
+        records_by_key = {
+            **existing,
+            **{r.idempotency_key: r for r in created.values()},
+        }
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {
+                    "index": index,
+                    "idempotency_key": keys[index],
+                    "status": "created",
+                    "record": created[index],
+                }
+            else:
+                result["record"] = records_by_key[result["idempotency_key"]]
+        return results
 
     @staticmethod
     def get_match_record_by_id(record_id: int):
         return MatchRecord.query.options(
+            selectinload(MatchRecord.games),
             joinedload(MatchRecord.player1),
             joinedload(MatchRecord.player2),
             joinedload(MatchRecord.player3),
@@ -136,6 +372,8 @@ class MatchRecordService:
         if not record:
             raise AppException("找不到要更新的比賽記錄。", status_code=404)
 
+        previous_player_ids = MatchRecordService._player_ids(record)
+        previous_performance = PerformanceCubeService.contributions([record])
         try:
             if record.match:
                 match_fields_mapping = {
@@ -170,7 +408,9 @@ class MatchRecordService:
                     record.a_games, record.b_games
                 )
 
-            MatchRecordService._handle_rating_updates(record, data)
+            MatchRecordService._record_change(record, ChangeActionEnum.UPDATED)
+            MatchRecordService._handle_rating_updates(record, data, previous_player_ids)
+            PerformanceCubeService.apply(previous_performance, [record])
             db.session.commit()
             return record
 
@@ -187,6 +427,8 @@ class MatchRecordService:
         if not record:
             raise AppException("找不到要更新的比賽記錄。", status_code=404)
 
+        previous_player_ids = MatchRecordService._player_ids(record)
+        previous_performance = PerformanceCubeService.contributions([record])
         try:
             if record.match:
                 match_fields_mapping = {
@@ -231,7 +473,9 @@ class MatchRecordService:
                     record.a_games, record.b_games
                 )
 
-            MatchRecordService._handle_rating_updates(record, data)
+            MatchRecordService._record_change(record, ChangeActionEnum.UPDATED)
+            MatchRecordService._handle_rating_updates(record, data, previous_player_ids)
+            PerformanceCubeService.apply(previous_performance, [record])
             db.session.commit()
             return record
 
@@ -247,20 +491,15 @@ class MatchRecordService:
         if not record:
             raise AppException("找不到要刪除的比賽記錄。", status_code=404)
 
-        affected_player_ids = [
-            p_id
-            for p_id in [
-                record.player1_id,
-                record.player2_id,
-                record.player3_id,
-                record.player4_id,
-            ]
-            if p_id
-        ]
+        affected_player_ids = MatchRecordService._player_ids(record)
 
         try:
+            MatchRecordService._record_change(record, ChangeActionEnum.DELETED)
+            PerformanceCubeService.apply(
+                PerformanceCubeService.contributions([record]), []
+            )
             db.session.delete(record)
-            RatingService.recalculate_ratings_for_players(affected_player_ids)
+            RatingJobService.schedule_recalculation(affected_player_ids)
             db.session.commit()
             return True
         except Exception as e:
@@ -331,55 +570,22 @@ class MatchRecordService:
 
     @staticmethod
     def _set_detailed_scores(record: MatchRecord, data: dict) -> None:
-        score_fields = [
-            "game1_a_score",
-            "game1_b_score",
-            "game2_a_score",
-            "game2_b_score",
-            "game3_a_score",
-            "game3_b_score",
-            "game4_a_score",
-            "game4_b_score",
-            "game5_a_score",
-            "game5_b_score",
-            "game6_a_score",
-            "game6_b_score",
-            "game7_a_score",
-            "game7_b_score",
-            "game8_a_score",
-            "game8_b_score",
-            "game9_a_score",
-            "game9_b_score",
-        ]
-
-        for field in score_fields:
-            if field in data:
-                setattr(record, field, data[field] or 0)
+        for game_number in range(1, MAX_GAMES + 1):
+            a_field = f"game{game_number}_a_score"
+            b_field = f"game{game_number}_b_score"
+            if a_field not in data and b_field not in data:
+                continue
+
+            a_score, b_score = record.get_game_score(game_number)
+            record.set_game_score(
+                game_number,
+                data.get(a_field, a_score) or 0,
+                data.get(b_field, b_score) or 0,
+            )
 
     @staticmethod
     def _has_any_detailed_scores(data: dict) -> bool:
-        score_fields = [
-            "game1_a_score",
-            "game1_b_score",
-            "game2_a_score",
-            "game2_b_score",
-            "game3_a_score",
-            "game3_b_score",
-            "game4_a_score",
-            "game4_b_score",
-            "game5_a_score",
-            "game5_b_score",
-            "game6_a_score",
-            "game6_b_score",
-            "game7_a_score",
-            "game7_b_score",
-            "game8_a_score",
-            "game8_b_score",
-            "game9_a_score",
-            "game9_b_score",
-        ]
-
-        return any(data.get(field, 0) > 0 for field in score_fields)
+        return any((data.get(field) or 0) > 0 for field in GAME_SCORE_FIELDS)
 
     @staticmethod
     def _set_serve_tracking(record: MatchRecord, data: dict) -> None:
@@ -388,25 +594,43 @@ class MatchRecordService:
                 record.first_serve_side = MatchStartServeEnum(data["first_serve_side"])
             else:
                 record.first_serve_side = None
+            record.update_game_servers()
 
     @staticmethod
-    def _handle_rating_updates(record: MatchRecord, data: dict) -> None:
-        player_fields_changed = any(
-            field in data
-            for field in ["player1_id", "player2_id", "player3_id", "player4_id"]
-        )
+    def _player_ids(record: MatchRecord) -> list[int]:
+        return [
+            p_id
+            for p_id in (
+                record.player1_id,
+                record.player2_id,
+                record.player3_id,
+                record.player4_id,
+            )
+            if p_id
+        ]
+
+    @staticmethod
+    def _handle_rating_updates(
+        record: MatchRecord, data: dict, previous_player_ids: list[int]
+    ) -> None:
+        """
+        修改比賽後排程評分重算
+
+        previous_player_ids 須在修改前取得：變更紀錄等查詢會觸發 autoflush，
+        清除屬性的變更歷史，無法再從 history 得知被換下的球員
+        """
+        player_fields = ["player1_id", "player2_id", "player3_id", "player4_id"]
+        player_fields_changed = any(field in data for field in player_fields)
         scores_changed = any(
             field in data for field in ["a_games", "b_games"]
         ) or MatchRecordService._has_any_detailed_scores(data)
 
         if player_fields_changed or scores_changed:
-            affected_player_ids = []
-            for field in ["player1_id", "player2_id", "player3_id", "player4_id"]:
-                player_id = getattr(record, field, None)
-                if player_id:
-                    affected_player_ids.append(player_id)
-
-            db.session.commit()
+            # 包含被換下的球員，他們的歷史評分也需要重算
+            affected_player_ids = [
+                *MatchRecordService._player_ids(record),
+                *previous_player_ids,
+            ]
 
-            if affected_player_ids:
-                RatingService.recalculate_ratings_for_players(affected_player_ids)
+            db.session.flush()
+            RatingJobService.schedule_recalculation(affected_player_ids, record)
@@ -0,0 +1,227 @@
+# backend/app/services/member_form_service.py
+"""
+球員近況服務 - 連勝 / 連敗、最長連勝與近 10 場戰績
+
+新比賽結果在 RatingService 更新評分時增量套用；補登較早日期的比賽或重算評分時，
+以視窗函數依每位球員的比賽順序（比賽日期、記錄 ID）重建，不在 Python 中逐場掃描。
+排行榜批次讀取已儲存的近況。
+"""
+
+from sqlalchemy import case, delete, func, insert, union_all
+
+from ..extensions import db
+from ..models import Match, MatchRecord, MemberForm
+from ..models.enums import MatchOutcomeEnum
+from ..models.member_form import RECENT_FORM_LENGTH
+
+
+class MemberFormService:
+    @staticmethod
+    def get_forms(member_ids: list[int]) -> dict:
+        """指定球員的近況 {member_id: MemberForm}，沒有比賽的球員不在結果中"""
+        if not member_ids:
+            return {}
+        return {
+            form.member_id: form
+            for form in MemberForm.query.filter(MemberForm.member_id.in_(member_ids))
+        }
+
+    @staticmethod
+    def record_result(match_record: MatchRecord) -> None:
+        """
+        套用單場比賽結果（不提交）
+
+        比賽排在球員最後一場之後時直接累加；補登的較早比賽、
+        或球員尚無近況資料時，改為重建這些球員的近況。
+        """
+        outcome = match_record.side_a_outcome
+        match = match_record.match
+        decided = (MatchOutcomeEnum.WIN, MatchOutcomeEnum.LOSS)
+        if match is None or outcome not in decided:
+            return
+
+        side_a_won = outcome == MatchOutcomeEnum.WIN
+        results = {
+            p_id: won
+            for p_ids, won in (
+                ((match_record.player1_id, match_record.player2_id), side_a_won),
+                ((match_record.player3_id, match_record.player4_id), not side_a_won),
+            )
+            for p_id in p_ids
+            if p_id
+        }
+        forms = {
+            form.member_id: form
+            for form in MemberForm.query.filter(MemberForm.member_id.in_(list(results)))
+            .with_for_update()
+            .all()
+        }
+
+        sequence_key = (match.match_date, match_record.id)
+        rebuild_ids = []
+        for p_id, won in results.items():
+            form = forms.get(p_id)
+            if (
+                form is None
+                or form.last_match_date is None
+                or (
+                    (form.last_match_date, form.last_match_record_id or 0)
+                    >= sequence_key
+                )
+            ):
+                rebuild_ids.append(p_id)
+                continue
+
+            sign = 1 if won else -1
+            if form.current_streak * sign > 0:
+                form.current_streak += sign
+            else:
+                form.current_streak = sign
+            form.longest_win_streak = max(form.longest_win_streak, form.current_streak)
+            form.longest_loss_streak = max(
+                form.longest_loss_streak, -form.current_streak
+            )
+            form.recent_results = (("W" if won else "L") + form.recent_results)[
+                :RECENT_FORM_LENGTH
+            ]
+            form.recent_wins = form.recent_results.count("W")
+            form.last_match_date, form.last_match_record_id = sequence_key
+
+        if rebuild_ids:
+            MemberFormService.rebuild(rebuild_ids)
+
+    @staticmethod
+    def _match_sequence(player_ids: list[int] = None):
+        """
+        每位球員依比賽順序的結果序列（子查詢）
+
+        欄位：member_id, record_id, match_date, won,
+              recency（由新到舊的序號，1 為最後一場）、
+              island（同一段連勝 / 連敗的比賽有相同的值）
+        """
+        outcome = MatchRecord.side_a_outcome
+        won_as_a = case((outcome == MatchOutcomeEnum.WIN, 1), else_=0)
+        won_as_b = case((outcome == MatchOutcomeEnum.LOSS, 1), else_=0)
+        appearances = union_all(
+            *(
+                db.select(
+                    player_column.label("member_id"),
+                    MatchRecord.id.label("record_id"),
+                    Match.match_date.label("match_date"),
+                    won.label("won"),
+                )
+                .join(Match, MatchRecord.match_id == Match.id)
+                .where(
+                    player_column.isnot(None),
+                    outcome.in_([MatchOutcomeEnum.WIN, MatchOutcomeEnum.LOSS]),
+                    *(() if player_ids is None else (player_column.in_(player_ids),)),
+                )
+                for player_column, won in (
+                    (MatchRecord.player1_id, won_as_a),
+                    (MatchRecord.player2_id, won_as_a),
+                    (MatchRecord.player3_id, won_as_b),
+                    (MatchRecord.player4_id, won_as_b),
+                )
+            )
+        ).subquery()
+
+        chronological = (appearances.c.match_date, appearances.c.record_id)
+        # 兩個 row_number 的差在同一段連續相同結果內固定不變（gaps and islands）
+        return db.select(
+            appearances.c.member_id,
+            appearances.c.record_id,
+            appearances.c.match_date,
+            appearances.c.won,
+            func.row_number()
+            .over(
+                partition_by=appearances.c.member_id,
+                order_by=(
+                    appearances.c.match_date.desc(),
+                    appearances.c.record_id.desc(),
+                ),
+            )
+            .label("recency"),
+            (
+                func.row_number().over(
+                    partition_by=appearances.c.member_id, order_by=chronological
+                )
+                - func.row_number().over(
+                    partition_by=(appearances.c.member_id, appearances.c.won),
+                    order_by=chronological,
+                )
+            ).label("island"),
+        ).subquery()
+
+    @staticmethod
+    def rebuild(player_ids: list[int] = None) -> int:
+        """
+        以視窗函數重建球員近況，取代既有資料（不提交）
+
+        Args:
+            player_ids: 只重建這些球員；None 表示全部球員
+
+        Returns:
+            int: 重建的球員數
+        """
+        sequence = MemberFormService._match_sequence(player_ids)
+
+        streaks = db.select(
+            sequence.c.member_id,
+            sequence.c.won,
+            func.count().label("length"),
+            func.min(sequence.c.recency).label("latest"),
+        ).group_by(sequence.c.member_id, sequence.c.won, sequence.c.island)
+        streaks = streaks.subquery()
+        forms = {
+            row.member_id: {
+                "member_id": row.member_id,
+                "current_streak": row.current_streak,
+                "longest_win_streak": row.longest_win_streak,
+                "longest_loss_streak": row.longest_loss_streak,
+                "recent_results": "",
+                "recent_wins": 0,
+            }
+            for row in db.session.execute(
+                db.select(
+                    streaks.c.member_id,
+                    func.max(
+                        case(
+                            (
+                                streaks.c.latest == 1,
+                                case(
+                                    (streaks.c.won == 1, streaks.c.length),
+                                    else_=-streaks.c.length,
+                                ),
+                            )
+                        )
+                    ).label("current_streak"),
+                    func.max(
+                        case((streaks.c.won == 1, streaks.c.length), else_=0)
+                    ).label("longest_win_streak"),
+                    func.max(
+                        case((streaks.c.won == 0, streaks.c.length), else_=0)
+                    ).label("longest_loss_streak"),
+                ).group_by(streaks.c.member_id)
+            )
+        }
+
+        recent = db.session.execute(
+            db.select(sequence)
+            .where(sequence.c.recency <= RECENT_FORM_LENGTH)
+            .order_by(sequence.c.member_id, sequence.c.recency)
+        )
+        for row in recent:
+            form = forms[row.member_id]
+            if row.recency == 1:
+                form["last_match_date"] = row.match_date
+                form["last_match_record_id"] = row.record_id
+            form["recent_results"] += "W" if row.won else "L"
+            form["recent_wins"] += row.won
+
+        statement = delete(MemberForm)
+        if player_ids is not None:
+            statement = statement.where(MemberForm.member_id.in_(player_ids))
+        db.session.execute(statement)
+        if forms:
+            db.session.execute(insert(MemberForm), list(forms.values()))
+        return len(forms)
@@ -0,0 +1,181 @@
+# backend/app/services/member_search_service.py
+"""
+球員搜尋服務 - 使用搜尋索引並依相關度排序
+
+排序規則（依序比較）：
+1. 姓名/暱稱完全相符 > 以關鍵字開頭（typeahead）> 其他
+2. 同一級內依索引相關度：PostgreSQL 為 similarity()，SQLite 為 FTS5 bm25()
+"""
+
+from sqlalchemy import case, column, func, literal, literal_column, or_, table, union
+from sqlalchemy.orm import joinedload
+
+from ..extensions import db
+from ..models import Member, User
+from ..models.member_search_index import FTS_TABLE
+
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+MIN_INDEXED_TERM_LENGTH = 3  # trigram 索引至少需要 3 個字元
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+
+class MemberSearchService:
+    @staticmethod
+    def _escape_like(term: str) -> str:
+        return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def _member_search_fields():
+        return [
+            Member.name,
+            Member.student_id,
+            Member.guest_phone,
+            Member.guest_identifier,
+            Member.guest_notes,
+        ]
+
+    @staticmethod
+    def _user_search_fields():
+        return [User.display_name, User.username]
+
+    @staticmethod
+    def _matching_member_ids(term: str):
+        """
+        任一搜尋欄位包含關鍵字的 member id（子查詢）
+
+        members 與 users 的欄位分開比對再 UNION：跨 outer join 的 OR 無法使用
+        各欄位的 gin_trgm_ops 索引，同一資料表內的 OR 則可合併為 BitmapOr
+        """
+        like = f"%{MemberSearchService._escape_like(term)}%"
+
+        def matches(fields):
+            return or_(*(field.ilike(like, escape="\\") for field in fields))
+
+        return union(
+            db.select(Member.id).where(
+                matches(MemberSearchService._member_search_fields())
+            ),
+            db.select(Member.id)
+            .join(User, Member.user_id == User.id)
+            .where(matches(MemberSearchService._user_search_fields())),
+        )
+
+    @staticmethod
+    def _prefix_rank(term: str):
+        """完全相符 / 前綴相符的加權分數"""
+        term_lower = term.lower()
+        prefix = f"{MemberSearchService._escape_like(term)}%"
+        return case(
+            (
+                or_(
+                    func.lower(Member.name) == term_lower,
+                    func.lower(User.display_name) == term_lower,
+                ),
+                3.0,
+            ),
+            (
+                or_(
+                    Member.name.ilike(prefix, escape="\\"),
+                    User.display_name.ilike(prefix, escape="\\"),
+                    User.username.ilike(prefix, escape="\\"),
+                ),
+                2.0,
+            ),
+            else_=0.0,
+        )
+
+    @staticmethod
+    def _apply_match(query, term: str):
+        """依資料庫類型套用搜尋條件，回傳 (query, 相關度表達式)，相關度越大越前面"""
+        dialect = db.session.get_bind().dialect.name
+        matching_ids = Member.id.in_(MemberSearchService._matching_member_ids(term))
+
+        if dialect == "postgresql":
+            # ILIKE 由 gin_trgm_ops 索引支援
+            similarity = func.greatest(
+                func.similarity(func.coalesce(Member.name, ""), term),
+                func.similarity(func.coalesce(User.display_name, ""), term),
+            )
+            return query.filter(matching_ids), similarity
+
+        if dialect == "sqlite" and len(term) >= MIN_INDEXED_TERM_LENGTH:
+            phrase = '"' + term.replace('"', '""') + '"'
+            query = query.join(_fts, _fts.c.rowid == Member.id).filter(
+                literal_column(FTS_TABLE).op("MATCH")(phrase)
+            )
+            # bm25 越小越相關
+            return query, -func.bm25(literal_column(FTS_TABLE))
+
+        return query.filter(matching_ids), literal(0.0)
+
+    @staticmethod
+    def search_ranked_ids(
+        term: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        include_members: bool = True,
+        include_guests: bool = True,
+        created_by_user_id: int = None,
+        active_only: bool = True,
+    ) -> list[int]:
+        """
+        搜尋球員，回傳依相關度排序的 member id
+
+        Args:
+            created_by_user_id: 只搜尋此使用者建立的訪客
+            active_only: 正式會員只包含帳號啟用中的
+        """
+        term = (term or "").strip()
+        if not term or not (include_members or include_guests):
+            return []
+
+        query = db.session.query(Member.id).outerjoin(User, Member.user_id == User.id)
+
+        type_filters = []
+        if include_members:
+            member_filter = Member.is_guest.is_(False)
+            if active_only:
+                member_filter = member_filter & User.is_active.is_(True)
+            type_filters.append(member_filter)
+        if include_guests:
+            guest_filter = Member.is_guest.is_(True)
+            if created_by_user_id:
+                guest_filter = guest_filter & (
+                    Member.created_by_user_id == created_by_user_id
+                )
+            type_filters.append(guest_filter)
+        query = query.filter(or_(*type_filters))
+
+        query, relevance = MemberSearchService._apply_match(query, term)
+        rows = (
+            query.add_columns(
+                MemberSearchService._prefix_rank(term).label("prefix_rank"),
+                relevance.label("relevance"),
+            )
+            .order_by(
+                literal_column("prefix_rank").desc(),
+                literal_column("relevance").desc(),
+                Member.name.asc(),
+                Member.id.asc(),
+            )
+            .limit(min(limit, MAX_SEARCH_LIMIT) if limit else None)
+            .all()
+        )
+        return [row.id for row in rows]
+
+    @staticmethod
+    def search(term: str, limit: int = DEFAULT_SEARCH_LIMIT, **filters) -> list[Member]:
+        """搜尋球員並依相關度回傳 Member 物件"""
+        ids = MemberSearchService.search_ranked_ids(term, limit, **filters)
+        if not ids:
+            return []
+        members = (
+            Member.query.options(
+                joinedload(Member.user), joinedload(Member.organization)
+            )
+            .filter(Member.id.in_(ids))
+            .all()
+        )
+        order = {member_id: index for index, member_id in enumerate(ids)}
+        return sorted(members, key=lambda member: order[member.id])
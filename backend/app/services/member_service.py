@@ -1,14 +1,21 @@
 # your_project/app/services/member_service.py
 from flask import current_app
 from flask_jwt_extended import create_access_token, create_refresh_token
-from sqlalchemy import or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 
 from ..extensions import db
 from ..models import MatchRecord, Member, User
-from ..models.enums import MatchOutcomeEnum, UserRoleEnum
+from ..models.enums import (
+    ChangeActionEnum,
+    ChangeEntityEnum,
+    MatchOutcomeEnum,
+    UserRoleEnum,
+)
+from ..tools.auth_utils import invalidate_principal, principal_claims
 from ..tools.exceptions import AppException, UserAlreadyExistsError, UserNotFoundError
+from .change_log_service import ChangeLogService
+from .member_search_service import MemberSearchService
 
 
 class MemberService:
@@ -102,16 +109,18 @@ class MemberService:
         if args.get("all", "false").lower() != "true":
             query = query.join(Member.user).filter(User.is_active == True)
 
+        ranked_ids = None
         if search_term := args.get("name"):
-            search_like = f"%{search_term}%"
-            query = query.join(Member.user, isouter=True).filter(
-                or_(
-                    Member.name.ilike(search_like),
-                    User.display_name.ilike(search_like),
-                    User.username.ilike(search_like),
-                    Member.student_id.ilike(search_like),
-                )
+            # 使用搜尋索引取得符合的 ID（已依相關度排序）
+            ranked_ids = MemberSearchService.search_ranked_ids(
+                search_term, limit=None, active_only=False
             )
+            query = query.filter(Member.id.in_(ranked_ids))
+
+        # 搜尋且未指定排序時，依相關度排序
+        if ranked_ids is not None and "sort_by" not in args:
+            order = {member_id: index for index, member_id in enumerate(ranked_ids)}
+            return sorted(query.all(), key=lambda member: order[member.id])
 
         sort_by = args.get("sort_by", "name")
         sort_order = args.get("sort_order", "asc")
@@ -154,10 +163,16 @@ class MemberService:
             # 創建 Member 物件並關聯
             new_member = Member(user=new_user, name=default_name)
             db.session.add(new_member)
+            db.session.flush()
+            ChangeLogService.record(
+                ChangeEntityEnum.MEMBER, new_member.id, ChangeActionEnum.CREATED
+            )
             db.session.commit()
 
             # --- 核心改動：註冊成功後，立即生成 Tokens ---
-            access_token = create_access_token(identity=str(new_user.id))
+            access_token = create_access_token(
+                identity=str(new_user.id), additional_claims=principal_claims(new_user)
+            )
             refresh_token = create_refresh_token(identity=str(new_user.id))
 
             return {
@@ -211,6 +226,10 @@ class MemberService:
                 notes=data.get("notes"),
             )
             db.session.add(new_member)
+            db.session.flush()
+            ChangeLogService.record(
+                ChangeEntityEnum.MEMBER, new_member.id, ChangeActionEnum.CREATED
+            )
             db.session.commit()
             return new_member
         except IntegrityError as e:
@@ -243,6 +262,7 @@ class MemberService:
                 setattr(member, field, data[field])
 
         # --- 2. 更新關聯的 User 模型欄位 ---
+        principal_changed = False
         if member.user:
             user_to_update = member.user
             user_fields = ["username", "email", "display_name", "role", "is_active"]
@@ -267,6 +287,12 @@ class MemberService:
                         f"電子郵件 '{data['email']}' 已被其他帳號使用。"
                     )
 
+            # 角色或啟用狀態變更時，需清除權限快取
+            principal_changed = any(
+                field in data and data[field] != getattr(user_to_update, field)
+                for field in ["role", "is_active"]
+            )
+
             # 更新欄位值
             for field in user_fields:
                 if field in data:
@@ -277,7 +303,12 @@ class MemberService:
             pass
 
         try:
+            ChangeLogService.record(
+                ChangeEntityEnum.MEMBER, member.id, ChangeActionEnum.UPDATED
+            )
             db.session.commit()
+            if principal_changed:
+                invalidate_principal(member.user.id)
             return member
         except IntegrityError as e:
             db.session.rollback()
@@ -296,10 +327,16 @@ class MemberService:
 
         try:
             # The cascade setting on the User->Member relationship should handle this
+            user_id = member.user.id if member.user else None
+            ChangeLogService.record(
+                ChangeEntityEnum.MEMBER, member.id, ChangeActionEnum.DELETED
+            )
             db.session.delete(member)
             if member.user:
                 db.session.delete(member.user)  # Ensure user is also deleted
             db.session.commit()
+            if user_id:
+                invalidate_principal(user_id)
             return True
         except Exception as e:
             db.session.rollback()
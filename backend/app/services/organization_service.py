@@ -1,8 +1,10 @@
 # backend/app/services/organization_service.py
+from sqlalchemy import and_, case, func, or_
 from sqlalchemy.exc import IntegrityError
 
+from ..config import RatingCalculationConfig
 from ..extensions import db
-from ..models import Organization  # 假設您的 Organization 模型在 models/__init__.py 或直接導入
+from ..models import Member, Organization, User  # 假設您的 Organization 模型在 models/__init__.py 或直接導入
 from ..tools.exceptions import AppException  # 假設您有自訂的 AppException
 
 
@@ -27,26 +29,93 @@ class OrganizationAlreadyExistsError(AppException):
 
 
 class OrganizationService:
+    # 成員統計欄位，可作為 sort_by 使用
+    MEMBER_STAT_FIELDS = (
+        "members_count",
+        "active_members_count",
+        "guest_members_count",
+        "avg_conservative_score",
+    )
+
+    @staticmethod
+    def _member_stats_query():
+        """
+        組織與成員統計的單一 GROUP BY 查詢，不載入 members 關聯
+
+        活躍判斷與 Member.is_active 相同：未離隊，且為訪客或帳號啟用中的會員。
+        """
+        k = RatingCalculationConfig.TRUESKILL_CONSERVATIVE_K
+        is_active_member = and_(
+            Member.leaved_date.is_(None),
+            or_(Member.is_guest.is_(True), User.is_active.is_(True)),
+        )
+        return (
+            db.session.query(
+                Organization,
+                func.count(Member.id).label("members_count"),
+                func.coalesce(func.sum(case((is_active_member, 1), else_=0)), 0).label(
+                    "active_members_count"
+                ),
+                func.coalesce(func.sum(case((Member.is_guest.is_(True), 1), else_=0)), 0).label(
+                    "guest_members_count"
+                ),
+                func.avg(Member.mu - k * Member.sigma).label("avg_conservative_score"),
+            )
+            .outerjoin(Member, Member.organization_id == Organization.id)
+            .outerjoin(User, Member.user_id == User.id)
+            .group_by(Organization.id)
+        )
+
+    @staticmethod
+    def _attach_member_stats(row) -> Organization:
+        """將統計結果附加到組織物件上，供 schema 序列化"""
+        org = row[0]
+        org.members_count = row.members_count
+        org.active_members_count = int(row.active_members_count)
+        org.guest_members_count = int(row.guest_members_count)
+        org.avg_conservative_score = (
+            round(row.avg_conservative_score, 2)
+            if row.avg_conservative_score is not None
+            else None
+        )
+        return org
+
     @staticmethod
     def get_all_organizations(args: dict):
         """
-        獲取所有組織，並支援排序。
+        獲取所有組織（含成員統計），並支援排序。
         'args' 是來自 request.args 的查詢參數字典。
         """
         sort_by = args.get("sort_by", "name")
         sort_order = args.get("sort_order", "asc")
 
+        query = OrganizationService._member_stats_query()
+
         # 安全地獲取排序屬性，若無效則預設為 Organization.name
-        sort_attr = getattr(Organization, sort_by, Organization.name)
+        if sort_by in OrganizationService.MEMBER_STAT_FIELDS:
+            sort_attr = db.literal_column(sort_by)
+        else:
+            sort_attr = getattr(Organization, sort_by, Organization.name)
 
-        query = Organization.query.order_by(sort_attr.desc() if sort_order == "desc" else sort_attr.asc())
-        return query.all()
+        query = query.order_by(sort_attr.desc() if sort_order == "desc" else sort_attr.asc())
+        return [OrganizationService._attach_member_stats(row) for row in query.all()]
 
     @staticmethod
     def get_organization_by_id(org_id: int) -> Organization | None:
         """根據 ID 查找組織。"""
         return db.session.get(Organization, org_id)
 
+    @staticmethod
+    def get_organization_with_stats(org_id: int) -> Organization | None:
+        """根據 ID 查找組織，並附加成員統計。"""
+        row = OrganizationService._member_stats_query().filter(Organization.id == org_id).first()
+        return OrganizationService._attach_member_stats(row) if row else None
+
+    @staticmethod
+    def count_members(org_id: int) -> int:
+        """計算組織成員數（不載入關聯）。"""
+        return db.session.query(func.count(Member.id)).filter(Member.organization_id == org_id).scalar()
+
     @staticmethod
     def create_organization(data: dict) -> Organization:
         """
@@ -114,9 +183,10 @@ class OrganizationService:
             raise OrganizationNotFoundError()
 
         # 業務邏輯：檢查是否有成員關聯到這個組織
-        if org.members:  # 檢查 'members' relationship 集合是否為空
+        members_count = OrganizationService.count_members(org.id)
+        if members_count:
             raise OrganizationInUseError(
-                f"無法刪除組織 '{org.name}'，因其尚有關聯的 {len(org.members)} 位成員。請先將成員移至其他組織。"
+                f"無法刪除組織 '{org.name}'，因其尚有關聯的 {members_count} 位成員。請先將成員移至其他組織。"
             )
 
         try:
@@ -0,0 +1,138 @@
+# backend/app/services/pair_rating_service.py
+"""
+雙打組合評分服務 - 組合評分的讀寫與組合排行榜
+
+評分演算在 RatingService（單場增量更新與依時間順序重算），本服務只負責儲存與查詢；
+組合以 (較小 ID, 較大 ID) 為鍵，不分前後。
+"""
+
+from sqlalchemy import delete, insert, or_
+from sqlalchemy.orm import joinedload
+
+from ..extensions import db
+from ..models import PairRating
+from ..models.pair_rating import PAIR_CONSERVATIVE_SCORE_EXPRESSION
+
+
+class PairRatingService:
+    @staticmethod
+    def pair_key(member_id: int, partner_id: int) -> tuple[int, int]:
+        return (min(member_id, partner_id), max(member_id, partner_id))
+
+    @staticmethod
+    def get_or_create(keys: list[tuple], initial_rating: tuple) -> dict:
+        """
+        鎖定並取得組合評分，不存在時以 initial_rating 建立（不提交）
+
+        Returns:
+            dict: {(low_id, high_id): PairRating}
+        """
+        pairs = {
+            (pair.member_low_id, pair.member_high_id): pair
+            for pair in PairRating.query.filter(
+                or_(
+                    *(
+                        db.and_(
+                            PairRating.member_low_id == low_id,
+                            PairRating.member_high_id == high_id,
+                        )
+                        for low_id, high_id in keys
+                    )
+                )
+            )
+            .with_for_update()
+            .all()
+        }
+        for low_id, high_id in keys:
+            if (low_id, high_id) not in pairs:
+                pair = PairRating(
+                    member_low_id=low_id,
+                    member_high_id=high_id,
+                    mu=initial_rating[0],
+                    sigma=initial_rating[1],
+                    matches_played=0,
+                    wins=0,
+                    losses=0,
+                )
+                db.session.add(pair)
+                pairs[(low_id, high_id)] = pair
+        return pairs
+
+    @staticmethod
+    def get_ratings(member_ids: list[int]) -> dict:
+        """包含任一指定球員的組合目前評分 {(low_id, high_id): (mu, sigma)}"""
+        if not member_ids:
+            return {}
+        rows = db.session.query(
+            PairRating.member_low_id,
+            PairRating.member_high_id,
+            PairRating.mu,
+            PairRating.sigma,
+        ).filter(
+            or_(
+                PairRating.member_low_id.in_(member_ids),
+                PairRating.member_high_id.in_(member_ids),
+            )
+        )
+        return {
+            (row.member_low_id, row.member_high_id): (row.mu, row.sigma) for row in rows
+        }
+
+    @staticmethod
+    def replace(rows: list[dict], player_ids: list[int] = None) -> None:
+        """
+        以重算結果取代既有組合評分（不提交）
+
+        Args:
+            rows: [{"member_low_id", "member_high_id", "mu", "sigma",
+                    "matches_played", "wins", "losses", "last_match_date"}]
+            player_ids: 只取代包含這些球員的組合；None 表示全部
+        """
+        statement = delete(PairRating)
+        if player_ids is not None:
+            statement = statement.where(
+                or_(
+                    PairRating.member_low_id.in_(player_ids),
+                    PairRating.member_high_id.in_(player_ids),
+                )
+            )
+        db.session.execute(statement)
+        if rows:
+            db.session.execute(insert(PairRating), rows)
+
+    @staticmethod
+    def get_leaderboard(
+        page: int = 1, per_page: int = 50, min_matches: int = 1, member_id: int = None
+    ) -> tuple[list[PairRating], int]:
+        """
+        組合排行榜（依保守評分排序，使用 ix_pair_ratings_conservative_score）
+
+        Returns:
+            tuple: (本頁組合，已設定 _rank, 總數)
+        """
+        query = PairRating.query.filter(PairRating.matches_played >= min_matches)
+        if member_id is not None:
+            query = query.filter(
+                or_(
+                    PairRating.member_low_id == member_id,
+                    PairRating.member_high_id == member_id,
+                )
+            )
+
+        total = query.count()
+        pairs = (
+            query.options(
+                joinedload(PairRating.member_low), joinedload(PairRating.member_high)
+            )
+            .order_by(
+                PAIR_CONSERVATIVE_SCORE_EXPRESSION.desc(),
+                PairRating.member_low_id.asc(),
+                PairRating.member_high_id.asc(),
+            )
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+            .all()
+        )
+        for index, pair in enumerate(pairs, start=(page - 1) * per_page + 1):
+            pair._rank = index
+        return pairs, total
@@ -0,0 +1,389 @@
+# backend/app/services/pairing_service.py
+"""
+練習賽雙打配對服務
+
+根據出席名單產生每個場地的 2v2 組合，目標是最大化 TrueSkill 對戰品質，
+同時避免同一場練習中重複的搭檔/對手，並可套用性別配對規則。
+
+演算法採用模擬退火 (simulated annealing)：
+1. 依輪休次數決定本輪上場球員（輪休較多者優先上場）
+2. 以實力蛇形排列作為初始解
+3. 隨機交換兩個位置，只重新計算受影響的場地成本
+4. 在時間預算內保留最佳解
+不需要窮舉排列，40 人以上的出席名單也能在數百毫秒內完成。
+"""
+
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import joinedload
+
+from ..models import Match, MatchRecord, Member
+from ..models.enums import GenderEnum
+from ..tools.exceptions import ValidationError
+from .prediction_service import PredictionService
+
+PLAYERS_PER_COURT = 4
+
+# 配對規則（對應 RatingService._apply_gender_adjustments 的觸發條件）
+GENDER_RULE_NONE = "none"  # 不限制
+GENDER_RULE_MIXED = "mixed"  # 每隊一男一女（混雙）
+GENDER_RULE_SAME_COMPOSITION = "same_composition"  # 同場兩隊性別組成相同，性別調整對稱
+GENDER_RULE_SINGLE_GENDER = "single_gender"  # 同場全男或全女，不觸發性別調整
+GENDER_RULES = [
+    GENDER_RULE_NONE,
+    GENDER_RULE_MIXED,
+    GENDER_RULE_SAME_COMPOSITION,
+    GENDER_RULE_SINGLE_GENDER,
+]
+
+# 成本權重：成本 = -品質 + 懲罰
+PARTNER_REPEAT_PENALTY = 0.35  # 重複搭檔（每次）
+OPPONENT_REPEAT_PENALTY = 0.12  # 重複對手（每次）
+GENDER_RULE_PENALTY = 5.0  # 違反性別規則（視為硬性限制）
+
+# 模擬退火參數
+DEFAULT_TIME_BUDGET_MS = 300
+MAX_ITERATIONS_PER_ROUND = 20000
+INITIAL_TEMPERATURE = 0.3
+COOLING_RATE = 0.9995
+STALE_ITERATIONS_LIMIT = 4000  # 連續無改善次數上限，提前結束
+
+
+def _pair_key(a: int, b: int) -> tuple:
+    return (a, b) if a < b else (b, a)
+
+
+class PairingService:
+    @staticmethod
+    def generate_session(
+        attendee_ids: list[int],
+        courts: Optional[int] = None,
+        rounds: int = 1,
+        gender_rule: str = GENDER_RULE_NONE,
+        history_days: Optional[int] = None,
+        time_budget_ms: int = DEFAULT_TIME_BUDGET_MS,
+        seed: Optional[int] = None,
+    ) -> dict:
+        """
+        產生一場練習的所有輪次配對
+
+        Args:
+            attendee_ids: 出席球員 ID 列表
+            courts: 可用場地數，預設為出席人數可排滿的最大場地數
+            rounds: 輪次數
+            gender_rule: 性別配對規則，見 GENDER_RULES
+            history_days: 將最近 N 天的正式比賽也納入重複搭檔/對手計算
+            time_budget_ms: 所有輪次合計的運算時間預算
+            seed: 隨機種子（方便重現結果）
+        """
+        attendee_ids = list(dict.fromkeys(attendee_ids))
+        if len(attendee_ids) < PLAYERS_PER_COURT:
+            raise ValidationError(
+                {"attendee_ids": ["至少需要 4 位出席球員才能排雙打。"]}
+            )
+        if gender_rule not in GENDER_RULES:
+            raise ValidationError({"gender_rule": [f"不支援的配對規則: {gender_rule}"]})
+
+        members = (
+            Member.query.options(joinedload(Member.user))
+            .filter(Member.id.in_(attendee_ids))
+            .all()
+        )
+        players = {m.id: m for m in members}
+        missing = [p_id for p_id in attendee_ids if p_id not in players]
+        if missing:
+            raise ValidationError({"attendee_ids": [f"找不到球員: {missing}"]})
+
+        max_courts = len(attendee_ids) // PLAYERS_PER_COURT
+        courts = min(courts or max_courts, max_courts)
+
+        partner_counts = defaultdict(int)
+        opponent_counts = defaultdict(int)
+        if history_days:
+            PairingService._load_recent_history(
+                attendee_ids, history_days, partner_counts, opponent_counts
+            )
+
+        rng = random.Random(seed)
+        sit_out_counts = {p_id: 0 for p_id in attendee_ids}
+        deadline_per_round = time_budget_ms / 1000.0 / rounds
+        started = time.perf_counter()
+
+        generated_rounds = []
+        total_iterations = 0
+        for round_no in range(1, rounds + 1):
+            playing, sitting_out = PairingService._select_players(
+                attendee_ids, courts, sit_out_counts, rng
+            )
+            slots, iterations = PairingService._anneal(
+                playing,
+                players,
+                gender_rule,
+                partner_counts,
+                opponent_counts,
+                deadline_per_round,
+                rng,
+            )
+            total_iterations += iterations
+
+            round_courts = []
+            for court_index in range(courts):
+                start = court_index * PLAYERS_PER_COURT
+                a1, a2, b1, b2 = slots[start : start + PLAYERS_PER_COURT]
+                prediction = PredictionService.evaluate_ratings(
+                    [
+                        (players[a1].mu, players[a1].sigma),
+                        (players[a2].mu, players[a2].sigma),
+                    ],
+                    [
+                        (players[b1].mu, players[b1].sigma),
+                        (players[b2].mu, players[b2].sigma),
+                    ],
+                )
+                round_courts.append(
+                    {
+                        "court": court_index + 1,
+                        "team_a": [
+                            PairingService._player_info(players[p]) for p in (a1, a2)
+                        ],
+                        "team_b": [
+                            PairingService._player_info(players[p]) for p in (b1, b2)
+                        ],
+                        "match_quality": round(prediction["match_quality"], 4),
+                        "win_probability_a": round(prediction["win_probability_a"], 4),
+                        "gender_rule_satisfied": PairingService._gender_violations(
+                            [players[a1].gender, players[a2].gender],
+                            [players[b1].gender, players[b2].gender],
+                            gender_rule,
+                        )
+                        == 0,
+                    }
+                )
+
+                # 記錄本輪組合，讓下一輪避開重複
+                partner_counts[_pair_key(a1, a2)] += 1
+                partner_counts[_pair_key(b1, b2)] += 1
+                for a in (a1, a2):
+                    for b in (b1, b2):
+                        opponent_counts[_pair_key(a, b)] += 1
+
+            for p_id in sitting_out:
+                sit_out_counts[p_id] += 1
+
+            generated_rounds.append(
+                {
+                    "round": round_no,
+                    "courts": round_courts,
+                    "sitting_out": [
+                        PairingService._player_info(players[p_id])
+                        for p_id in sitting_out
+                    ],
+                }
+            )
+
+        qualities = [c["match_quality"] for r in generated_rounds for c in r["courts"]]
+        return {
+            "rounds": generated_rounds,
+            "summary": {
+                "attendees": len(attendee_ids),
+                "courts": courts,
+                "rounds": rounds,
+                "gender_rule": gender_rule,
+                "average_quality": round(sum(qualities) / len(qualities), 4),
+                "min_quality": min(qualities),
+                "iterations": total_iterations,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            },
+        }
+
+    @staticmethod
+    def _select_players(attendee_ids, courts, sit_out_counts, rng):
+        """輪休次數最多者優先上場，同次數者隨機"""
+        order = list(attendee_ids)
+        rng.shuffle(order)
+        order.sort(key=lambda p_id: -sit_out_counts[p_id])
+        needed = courts * PLAYERS_PER_COURT
+        return order[:needed], order[needed:]
+
+    @staticmethod
+    def _anneal(
+        playing: list[int],
+        players: dict[int, Member],
+        gender_rule: str,
+        partner_counts: dict,
+        opponent_counts: dict,
+        time_budget: float,
+        rng: random.Random,
+    ):
+        """模擬退火搜尋單一輪次的最佳場地分配，回傳 (slots, 迭代次數)"""
+        ratings = {p_id: (players[p_id].mu, players[p_id].sigma) for p_id in playing}
+        genders = {p_id: players[p_id].gender for p_id in playing}
+
+        def court_cost(a1, a2, b1, b2):
+            quality = PredictionService.evaluate_ratings(
+                [ratings[a1], ratings[a2]], [ratings[b1], ratings[b2]]
+            )["match_quality"]
+            penalty = PARTNER_REPEAT_PENALTY * (
+                partner_counts.get(_pair_key(a1, a2), 0)
+                + partner_counts.get(_pair_key(b1, b2), 0)
+            )
+            penalty += OPPONENT_REPEAT_PENALTY * sum(
+                opponent_counts.get(_pair_key(a, b), 0)
+                for a in (a1, a2)
+                for b in (b1, b2)
+            )
+            penalty += GENDER_RULE_PENALTY * PairingService._gender_violations(
+                [genders[a1], genders[a2]], [genders[b1], genders[b2]], gender_rule
+            )
+            return penalty - quality
+
+        # 初始解：依 μ 排序後蛇形分配 (強弱搭配)
+        slots = PairingService._snake_seed(playing, ratings)
+        court_count = len(slots) // PLAYERS_PER_COURT
+        costs = [
+            court_cost(*slots[c * PLAYERS_PER_COURT : (c + 1) * PLAYERS_PER_COURT])
+            for c in range(court_count)
+        ]
+        current_total = sum(costs)
+        best_slots, best_total = list(slots), current_total
+
+        temperature = INITIAL_TEMPERATURE
+        deadline = time.perf_counter() + time_budget
+        iterations = 0
+        stale = 0
+        size = len(slots)
+
+        while iterations < MAX_ITERATIONS_PER_ROUND and stale < STALE_ITERATIONS_LIMIT:
+            if iterations % 256 == 0 and time.perf_counter() > deadline:
+                break
+            iterations += 1
+
+            i, j = rng.randrange(size), rng.randrange(size)
+            court_i, court_j = i // PLAYERS_PER_COURT, j // PLAYERS_PER_COURT
+            # 同一隊內交換位置沒有意義
+            if i == j or (court_i == court_j and (i % 4) // 2 == (j % 4) // 2):
+                continue
+
+            slots[i], slots[j] = slots[j], slots[i]
+            affected = {court_i, court_j}
+            new_costs = {
+                c: court_cost(
+                    *slots[c * PLAYERS_PER_COURT : (c + 1) * PLAYERS_PER_COURT]
+                )
+                for c in affected
+            }
+            delta = sum(new_costs[c] - costs[c] for c in affected)
+
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                for c, cost in new_costs.items():
+                    costs[c] = cost
+                current_total += delta
+                if current_total < best_total - 1e-9:
+                    best_slots, best_total = list(slots), current_total
+                    stale = 0
+                else:
+                    stale += 1
+            else:
+                slots[i], slots[j] = slots[j], slots[i]
+                stale += 1
+
+            temperature = max(temperature * COOLING_RATE, 1e-4)
+
+        return best_slots, iterations
+
+    @staticmethod
+    def _snake_seed(playing: list[int], ratings: dict) -> list[int]:
+        """
+        蛇形分配：最強與最弱搭檔，且各場地的兩隊實力接近
+        每 4 人一組：[強, 弱] vs [次強, 次弱]
+        """
+        ordered = sorted(playing, key=lambda p_id: -ratings[p_id][0])
+        court_count = len(ordered) // PLAYERS_PER_COURT
+        slots = []
+        for c in range(court_count):
+            top = ordered[2 * c : 2 * c + 2]
+            bottom = ordered[len(ordered) - 2 * c - 2 : len(ordered) - 2 * c]
+            slots.extend([top[0], bottom[-1], top[1], bottom[0]])
+        return slots
+
+    @staticmethod
+    def _gender_violations(team_a: list, team_b: list, gender_rule: str) -> int:
+        """計算單一場地違反性別規則的程度（未填性別視為任意）"""
+        if gender_rule == GENDER_RULE_NONE:
+            return 0
+
+        def count(team, gender):
+            return sum(1 for g in team if g == gender)
+
+        if gender_rule == GENDER_RULE_MIXED:
+            return sum(
+                1
+                for team in (team_a, team_b)
+                if count(team, GenderEnum.MALE) > 1
+                or count(team, GenderEnum.FEMALE) > 1
+            )
+
+        if gender_rule == GENDER_RULE_SAME_COMPOSITION:
+            return abs(
+                count(team_a, GenderEnum.FEMALE) - count(team_b, GenderEnum.FEMALE)
+            ) + abs(count(team_a, GenderEnum.MALE) - count(team_b, GenderEnum.MALE))
+
+        if gender_rule == GENDER_RULE_SINGLE_GENDER:
+            court = team_a + team_b
+            return min(count(court, GenderEnum.MALE), count(court, GenderEnum.FEMALE))
+
+        return 0
+
+    @staticmethod
+    def _load_recent_history(
+        attendee_ids, history_days, partner_counts, opponent_counts
+    ):
+        """將最近的正式比賽計入搭檔/對手次數"""
+        since = date.today() - timedelta(days=history_days)
+        attendee_set = set(attendee_ids)
+        records = (
+            MatchRecord.query.join(Match)
+            .filter(
+                Match.match_date >= since,
+                or_(
+                    MatchRecord.player1_id.in_(attendee_ids),
+                    MatchRecord.player2_id.in_(attendee_ids),
+                    MatchRecord.player3_id.in_(attendee_ids),
+                    MatchRecord.player4_id.in_(attendee_ids),
+                ),
+            )
+            .with_entities(
+                MatchRecord.player1_id,
+                MatchRecord.player2_id,
+                MatchRecord.player3_id,
+                MatchRecord.player4_id,
+            )
+            .all()
+        )
+        for p1, p2, p3, p4 in records:
+            side_a = [p for p in (p1, p2) if p in attendee_set]
+            side_b = [p for p in (p3, p4) if p in attendee_set]
+            if len(side_a) == 2:
+                partner_counts[_pair_key(*side_a)] += 1
+            if len(side_b) == 2:
+                partner_counts[_pair_key(*side_b)] += 1
+            for a in side_a:
+                for b in side_b:
+                    opponent_counts[_pair_key(a, b)] += 1
+
+    @staticmethod
+    def _player_info(member: Member) -> dict:
+        return {
+            "id": member.id,
+            "name": member.short_display_name,
+            "gender": member.gender.value if member.gender else None,
+            "mu": round(member.mu, 3),
+            "sigma": round(member.sigma, 3),
+            "conservative_score": round(member.conservative_score, 2),
+        }
@@ -0,0 +1,250 @@
+# backend/app/services/performance_cube_service.py
+"""
+球員表現彙總服務 - 依場地材質、場地環境、時段、賽制分組的勝率
+
+MatchRecordService 寫入比賽時在同一交易中增減 member_performance 的計數，
+查詢只需對單一球員的彙總列依指定條件與日期區間加總，不必載入每場比賽。
+"""
+
+from sqlalchemy import case, delete, func, insert, tuple_, union_all
+
+from ..extensions import db
+from ..models import Match, MatchRecord, MemberPerformance
+from ..models.enums import MatchOutcomeEnum
+from ..models.member_performance import PERFORMANCE_DIMENSIONS, UNRECORDED
+
+KEY_FIELDS = ("member_id", "match_date", *PERFORMANCE_DIMENSIONS)
+MEASURES = ("matches", "wins", "losses", "games_won", "games_lost")
+
+
+def _dimension_value(value) -> str:
+    """列舉（或更新請求中尚未轉換的字串）轉為儲存值"""
+    if value is None:
+        return UNRECORDED
+    return getattr(value, "value", value)
+
+
+class PerformanceCubeService:
+    @staticmethod
+    def contributions(records: list[MatchRecord]) -> dict:
+        """
+        比賽記錄對彙總的貢獻
+
+        Returns:
+            dict: {(member_id, match_date, *條件): (matches, wins, losses,
+                   games_won, games_lost)}
+        """
+        totals = {}
+        for record in records:
+            match = record.match
+            if match is None:
+                continue
+            conditions = tuple(
+                _dimension_value(getattr(match, dimension))
+                for dimension in PERFORMANCE_DIMENSIONS
+            )
+            side_a_won = record.side_a_outcome == MatchOutcomeEnum.WIN
+            side_b_won = record.side_a_outcome == MatchOutcomeEnum.LOSS
+            for p_ids, won, lost, games_won, games_lost in (
+                (
+                    (record.player1_id, record.player2_id),
+                    side_a_won,
+                    side_b_won,
+                    record.a_games,
+                    record.b_games,
+                ),
+                (
+                    (record.player3_id, record.player4_id),
+                    side_b_won,
+                    side_a_won,
+                    record.b_games,
+                    record.a_games,
+                ),
+            ):
+                for p_id in p_ids:
+                    if not p_id:
+                        continue
+                    key = (p_id, match.match_date, *conditions)
+                    values = (1, int(won), int(lost), games_won or 0, games_lost or 0)
+                    totals[key] = tuple(
+                        map(sum, zip(totals.get(key, (0,) * len(MEASURES)), values))
+                    )
+        return totals
+
+    @staticmethod
+    def apply(previous: dict, records: list[MatchRecord]) -> None:
+        """
+        以比賽記錄目前的貢獻取代 previous，只寫入有差異的彙總列（不提交）
+
+        新增比賽傳入 previous={}；刪除比賽傳入刪除前的 contributions 與空的 records；
+        修改比賽傳入修改前的 contributions。場數歸零的列會刪除。
+        """
+        deltas = PerformanceCubeService.contributions(records)
+        for key, values in previous.items():
+            current = deltas.get(key, (0,) * len(MEASURES))
+            deltas[key] = tuple(a - b for a, b in zip(current, values))
+        deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+        if not deltas:
+            return
+
+        rows = {
+            tuple(getattr(row, field) for field in KEY_FIELDS): row
+            for row in MemberPerformance.query.filter(
+                tuple_(
+                    *(getattr(MemberPerformance, field) for field in KEY_FIELDS)
+                ).in_(list(deltas))
+            )
+            .with_for_update()
+            .all()
+        }
+        for key, delta in deltas.items():
+            row = rows.get(key)
+            base = (
+                tuple(getattr(row, measure) for measure in MEASURES)
+                if row is not None
+                else (0,) * len(MEASURES)
+            )
+            values = dict(zip(MEASURES, (a + b for a, b in zip(base, delta))))
+            if values["matches"] <= 0:
+                if row is not None:
+                    db.session.delete(row)
+                continue
+            if row is None:
+                row = MemberPerformance(**dict(zip(KEY_FIELDS, key)))
+                db.session.add(row)
+            for measure, value in values.items():
+                setattr(row, measure, value)
+
+    @staticmethod
+    def rebuild(player_ids: list[int] = None) -> int:
+        """
+        以全部比賽記錄重建彙總，取代既有資料（不提交）
+
+        Args:
+            player_ids: 只重建這些球員；None 表示全部球員
+
+        Returns:
+            int: 寫入的彙總列數
+        """
+        outcome = MatchRecord.side_a_outcome
+        side_a_won = case((outcome == MatchOutcomeEnum.WIN, 1), else_=0)
+        side_b_won = case((outcome == MatchOutcomeEnum.LOSS, 1), else_=0)
+        sides = (
+            (
+                (MatchRecord.player1_id, MatchRecord.player2_id),
+                side_a_won,
+                side_b_won,
+                MatchRecord.a_games,
+                MatchRecord.b_games,
+            ),
+            (
+                (MatchRecord.player3_id, MatchRecord.player4_id),
+                side_b_won,
+                side_a_won,
+                MatchRecord.b_games,
+                MatchRecord.a_games,
+            ),
+        )
+        appearances = union_all(
+            *(
+                db.select(
+                    player_column.label("member_id"),
+                    Match.match_date.label("match_date"),
+                    *(
+                        getattr(Match, dimension).label(dimension)
+                        for dimension in PERFORMANCE_DIMENSIONS
+                    ),
+                    won.label("wins"),
+                    lost.label("losses"),
+                    games_won.label("games_won"),
+                    games_lost.label("games_lost"),
+                )
+                .join(Match, MatchRecord.match_id == Match.id)
+                .where(
+                    player_column.isnot(None),
+                    *(() if player_ids is None else (player_column.in_(player_ids),)),
+                )
+                for player_columns, won, lost, games_won, games_lost in sides
+                for player_column in player_columns
+            )
+        ).subquery()
+
+        key_columns = [appearances.c[field] for field in KEY_FIELDS]
+        rows = [
+            {
+                "member_id": row.member_id,
+                "match_date": row.match_date,
+                **{
+                    dimension: _dimension_value(getattr(row, dimension))
+                    for dimension in PERFORMANCE_DIMENSIONS
+                },
+                **{measure: getattr(row, measure) for measure in MEASURES},
+            }
+            for row in db.session.execute(
+                db.select(
+                    *key_columns,
+                    func.count().label("matches"),
+                    func.sum(appearances.c.wins).label("wins"),
+                    func.sum(appearances.c.losses).label("losses"),
+                    func.sum(appearances.c.games_won).label("games_won"),
+                    func.sum(appearances.c.games_lost).label("games_lost"),
+                ).group_by(*key_columns)
+            )
+        ]
+
+        statement = delete(MemberPerformance)
+        if player_ids is not None:
+            statement = statement.where(MemberPerformance.member_id.in_(player_ids))
+        db.session.execute(statement)
+        if rows:
+            db.session.execute(insert(MemberPerformance), rows)
+        return len(rows)
+
+    @staticmethod
+    def get_breakdown(
+        member_id: int,
+        group_by: list[str] = None,
+        start_date=None,
+        end_date=None,
+    ) -> list[dict]:
+        """
+        球員依指定條件分組的表現（一次查詢，使用主鍵的 member_id / match_date 前綴）
+
+        Args:
+            group_by: PERFORMANCE_DIMENSIONS 中的欄位；空值表示只回傳總計
+            start_date / end_date: 比賽日期區間（含）
+
+        Returns:
+            list: [{條件..., matches, wins, losses, win_rate, games_won, games_lost}]
+        """
+        group_by = list(group_by or [])
+        dimension_columns = [getattr(MemberPerformance, name) for name in group_by]
+        query = db.session.query(
+            *dimension_columns,
+            *(
+                func.coalesce(func.sum(getattr(MemberPerformance, measure)), 0).label(
+                    measure
+                )
+                for measure in MEASURES
+            ),
+        ).filter(MemberPerformance.member_id == member_id)
+        if start_date:
+            query = query.filter(MemberPerformance.match_date >= start_date)
+        if end_date:
+            query = query.filter(MemberPerformance.match_date <= end_date)
+        if dimension_columns:
+            query = query.group_by(*dimension_columns).order_by(*dimension_columns)
+
+        breakdown = []
+        for row in query:
+            if not row.matches:
+                continue
+            decided = row.wins + row.losses
+            breakdown.append(
+                {
+                    **{name: getattr(row, name) or None for name in group_by},
+                    **{measure: getattr(row, measure) for measure in MEASURES},
+                    "win_rate": round(row.wins / decided * 100, 1) if decided else 0.0,
+                }
+            )
+        return breakdown
@@ -0,0 +1,251 @@
+# backend/app/services/player_directory_service.py
+"""
+球員名錄服務 - 提供選手選擇器使用的精簡名錄
+
+名錄在記憶體中保存一份版本化快照：
+- 版本為快照內容的雜湊值，不同行程對相同資料會得到相同版本（可直接作為 ETag）
+- 本行程提交球員/使用者/組織/比賽變更後，下一次請求時重建
+- 其他行程的變更最晚在 PLAYER_DIRECTORY_TTL_SECONDS 後重建反映
+- 保留最近幾個版本的內容，客戶端可帶舊版本只取得差異
+
+每筆只帶自己的最後出賽日期（last_played），不帶全域排名：新增一場比賽只改變
+該場 2-4 位球員的內容，差異維持很小。排序鍵為 (last_played 由新到舊, id)，
+完整名錄依此排序，客戶端套用差異後以同一鍵重新排序。
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+from sqlalchemy import event, func, union_all
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import Match, MatchRecord, Member, Organization, User
+
+DEFAULT_DIRECTORY_TTL_SECONDS = 30
+MAX_DIRECTORY_HISTORY = 16
+
+# 這些模型的變更會影響名錄內容
+_DIRECTORY_MODELS = (Member, User, Organization, Match, MatchRecord)
+
+_lock = threading.Lock()
+_state = {"version": None, "entries": None, "built_at": 0.0, "dirty": True}
+_history: "OrderedDict[str, dict]" = OrderedDict()  # {version: entries}
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_session_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, _DIRECTORY_MODELS):
+            session.info["player_directory_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("player_directory_changed", False):
+        PlayerDirectoryService.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop("player_directory_changed", None)
+
+
+class PlayerDirectoryService:
+    @staticmethod
+    def invalidate():
+        """標記快照需要重建"""
+        _state["dirty"] = True
+
+    @staticmethod
+    def _last_played_dates() -> dict:
+        """每位球員最後一場比賽的日期：{member_id: date}"""
+        appearances = union_all(
+            *(
+                db.select(column.label("member_id"), MatchRecord.match_id)
+                for column in (
+                    MatchRecord.player1_id,
+                    MatchRecord.player2_id,
+                    MatchRecord.player3_id,
+                    MatchRecord.player4_id,
+                )
+            )
+        ).subquery()
+        rows = (
+            db.session.query(appearances.c.member_id, func.max(Match.match_date))
+            .join(Match, Match.id == appearances.c.match_id)
+            .filter(appearances.c.member_id.isnot(None))
+            .group_by(appearances.c.member_id)
+            .all()
+        )
+        return {member_id: last_date for member_id, last_date in rows}
+
+    @staticmethod
+    def _build_entries() -> dict:
+        """
+        從資料庫建立名錄內容：{member_id: entry}
+
+        只查詢需要的欄位，不載入 ORM 物件；顯示名稱規則與 Member.short_display_name 相同。
+        """
+        rows = (
+            db.session.query(
+                Member.id,
+                Member.name,
+                Member.is_guest,
+                Member.gender,
+                Member.created_by_user_id,
+                Member.last_used_at,
+                User.display_name,
+                Organization.id.label("organization_id"),
+                Organization.short_name,
+                Organization.name.label("organization_name"),
+            )
+            .outerjoin(User, Member.user_id == User.id)
+            .outerjoin(Organization, Member.organization_id == Organization.id)
+            .filter(
+                Member.leaved_date.is_(None),
+                db.or_(Member.is_guest.is_(True), User.is_active.is_(True)),
+            )
+            .all()
+        )
+        last_played = PlayerDirectoryService._last_played_dates()
+
+        entries = {}
+        for row in rows:
+            if row.is_guest:
+                short_name = f"{row.name}(訪)"
+            else:
+                short_name = row.display_name or row.name
+
+            # 訪客的最後使用時間也算在內
+            last_active = last_played.get(row.id)
+            if row.is_guest and row.last_used_at:
+                used_date = row.last_used_at.date()
+                last_active = max(last_active, used_date) if last_active else used_date
+
+            entries[row.id] = {
+                "id": row.id,
+                "short_display_name": short_name,
+                "gender": row.gender.value if row.gender else None,
+                "is_guest": bool(row.is_guest),
+                "organization": (
+                    {
+                        "id": row.organization_id,
+                        "short_name": row.short_name or row.organization_name,
+                    }
+                    if row.organization_id
+                    else None
+                ),
+                "last_played": last_active.isoformat() if last_active else None,
+                "_created_by_user_id": row.created_by_user_id,
+            }
+        return entries
+
+    @staticmethod
+    def _sort_by_recency(entries) -> list:
+        """名錄排序：最近出賽的在前，沒有出賽紀錄的在最後，同日依 id"""
+        ordered = sorted(entries, key=lambda entry: entry["id"])
+        # 穩定排序：反向排序時同一天的球員仍維持 id 順序
+        ordered.sort(key=lambda entry: entry["last_played"] or "", reverse=True)
+        return ordered
+
+    @staticmethod
+    def _compute_version(entries: dict) -> str:
+        payload = json.dumps(
+            [entries[member_id] for member_id in sorted(entries)],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def get_snapshot() -> tuple[str, dict]:
+        """取得 (版本, 名錄內容)，過期或有變更時重建"""
+        ttl = current_app.config.get(
+            "PLAYER_DIRECTORY_TTL_SECONDS", DEFAULT_DIRECTORY_TTL_SECONDS
+        )
+        with _lock:
+            now = time.time()
+            if (
+                _state["entries"] is not None
+                and not _state["dirty"]
+                and now - _state["built_at"] < ttl
+            ):
+                return _state["version"], _state["entries"]
+
+            _state["dirty"] = False
+            entries = PlayerDirectoryService._build_entries()
+            version = PlayerDirectoryService._compute_version(entries)
+            if version != _state["version"]:
+                _history[version] = entries
+                _history.move_to_end(version)
+                while len(_history) > MAX_DIRECTORY_HISTORY:
+                    _history.popitem(last=False)
+                _state["version"] = version
+                _state["entries"] = entries
+            _state["built_at"] = now
+            return _state["version"], _state["entries"]
+
+    @staticmethod
+    def _visible(entry: dict, user_id) -> bool:
+        """正式會員所有人可見；訪客只有建立者可見"""
+        return not entry["is_guest"] or (
+            user_id is not None and entry["_created_by_user_id"] == user_id
+        )
+
+    @staticmethod
+    def _public(entry: dict) -> dict:
+        return {key: value for key, value in entry.items() if not key.startswith("_")}
+
+    @staticmethod
+    def get_directory(user_id: int = None, since: str = None) -> dict:
+        """
+        取得名錄
+
+        Args:
+            user_id: 目前使用者，只包含此使用者建立的訪客
+            since: 客戶端已有的版本；若仍保留該版本則只回傳差異
+
+        Returns:
+            {"version", "full", "players", "removed"}
+        """
+        version, entries = PlayerDirectoryService.get_snapshot()
+        visible = {
+            member_id: entry
+            for member_id, entry in entries.items()
+            if PlayerDirectoryService._visible(entry, user_id)
+        }
+
+        previous = _history.get(since) if since else None
+        if previous is None:
+            players = PlayerDirectoryService._sort_by_recency(visible.values())
+            return {
+                "version": version,
+                "full": True,
+                "players": [PlayerDirectoryService._public(e) for e in players],
+                "removed": [],
+            }
+
+        previous_visible = {
+            member_id
+            for member_id, entry in previous.items()
+            if PlayerDirectoryService._visible(entry, user_id)
+        }
+        changed = [
+            PlayerDirectoryService._public(entry)
+            for member_id, entry in sorted(visible.items())
+            if previous.get(member_id) != entry or member_id not in previous_visible
+        ]
+        removed = sorted(previous_visible - visible.keys())
+        return {
+            "version": version,
+            "full": False,
+            "players": changed,
+            "removed": removed,
+        }
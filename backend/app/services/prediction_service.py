@@ -0,0 +1,157 @@
+# backend/app/services/prediction_service.py
+"""
+對戰預測服務 - 基於 TrueSkill 環境計算勝率與對戰品質
+
+兩隊對戰時 TrueSkill 的勝率與品質 (quality) 都有封閉解：
+    c² = n·β² + Σσ²
+    勝率 P(A 勝) = Φ((Σμ_A - Σμ_B) / c)
+    品質 quality = sqrt(n·β² / c²) · exp(-(Σμ_A - Σμ_B)² / (2c²))
+因此批次評估時只需一次查詢取回所有球員的 μ/σ，
+再以同一組公式逐組計算，不必為每組組合建立 TrueSkill 因子圖。
+"""
+
+import math
+from typing import Optional
+
+from ..extensions import db
+from ..models import Member
+from ..tools.exceptions import AppException, ValidationError
+from .rating_service import trueskill_env
+
+MAX_TEAM_SIZE = 2  # 軟式網球只有單打 (1v1) 與雙打 (2v2)
+MAX_BATCH_LINEUPS = 1000  # 單次批次評估的組合上限
+
+
+class PredictionService:
+    @staticmethod
+    def _load_ratings(member_ids) -> dict[int, tuple]:
+        """只查詢評分欄位，回傳 {member_id: (mu, sigma)}"""
+        member_ids = set(member_ids)
+        if not member_ids:
+            return {}
+        rows = (
+            db.session.query(Member.id, Member.mu, Member.sigma)
+            .filter(Member.id.in_(member_ids))
+            .all()
+        )
+        return {row.id: (row.mu, row.sigma) for row in rows}
+
+    @staticmethod
+    def _validate_lineup(team_a: list[int], team_b: list[int]) -> Optional[str]:
+        """檢查組合是否合法，回傳錯誤訊息或 None"""
+        if not team_a or not team_b:
+            return "兩隊都必須至少有一位球員。"
+        if len(team_a) > MAX_TEAM_SIZE or len(team_b) > MAX_TEAM_SIZE:
+            return f"每隊最多 {MAX_TEAM_SIZE} 位球員。"
+        if len(team_a) != len(team_b):
+            return "只支援單打 (1v1) 或雙打 (2v2) 組合。"
+        all_ids = list(team_a) + list(team_b)
+        if len(set(all_ids)) != len(all_ids):
+            return "同一位球員不能重複出現在組合中。"
+        return None
+
+    @staticmethod
+    def evaluate_ratings(
+        team_a_ratings: list[tuple], team_b_ratings: list[tuple]
+    ) -> dict:
+        """
+        根據兩隊的 (mu, sigma) 計算勝率與對戰品質
+
+        Returns:
+            dict: win_probability_a / win_probability_b / match_quality
+        """
+        beta_sq = trueskill_env.beta**2
+        n = len(team_a_ratings) + len(team_b_ratings)
+        mu_diff = sum(r[0] for r in team_a_ratings) - sum(r[0] for r in team_b_ratings)
+        variance = n * beta_sq + sum(r[1] ** 2 for r in team_a_ratings + team_b_ratings)
+
+        win_probability_a = trueskill_env.cdf(mu_diff / math.sqrt(variance))
+        quality = math.sqrt(n * beta_sq / variance) * math.exp(
+            -(mu_diff**2) / (2 * variance)
+        )
+
+        return {
+            "win_probability_a": win_probability_a,
+            "win_probability_b": 1 - win_probability_a,
+            "match_quality": quality,
+        }
+
+    @staticmethod
+    def evaluate_lineup(team_a: list[int], team_b: list[int]) -> dict:
+        """評估單一組合 (1v1 或 2v2)"""
+        error = PredictionService._validate_lineup(team_a, team_b)
+        if error:
+            raise ValidationError({"lineup": [error]}, message=error)
+
+        ratings = PredictionService._load_ratings(list(team_a) + list(team_b))
+        missing = [p_id for p_id in list(team_a) + list(team_b) if p_id not in ratings]
+        if missing:
+            raise AppException(
+                f"找不到球員: {missing}", status_code=404, error_code="member_not_found"
+            )
+
+        result = PredictionService.evaluate_ratings(
+            [ratings[p_id] for p_id in team_a], [ratings[p_id] for p_id in team_b]
+        )
+        return PredictionService._format_result(team_a, team_b, result)
+
+    @staticmethod
+    def evaluate_batch(lineups: list[dict]) -> list[dict]:
+        """
+        批次評估多組組合
+
+        所有組合的球員評分只查詢一次；無效的組合會在該筆結果中標示 error，
+        不影響其他組合的計算。
+
+        Args:
+            lineups: [{"team_a": [1, 2], "team_b": [3, 4]}, ...]
+        """
+        if len(lineups) > MAX_BATCH_LINEUPS:
+            raise ValidationError(
+                {"lineups": [f"單次最多評估 {MAX_BATCH_LINEUPS} 組組合。"]}
+            )
+
+        ratings = PredictionService._load_ratings(
+            p_id
+            for lineup in lineups
+            for p_id in list(lineup["team_a"]) + list(lineup["team_b"])
+        )
+
+        results = []
+        for index, lineup in enumerate(lineups):
+            team_a, team_b = lineup["team_a"], lineup["team_b"]
+            error = PredictionService._validate_lineup(team_a, team_b)
+            if not error:
+                missing = [
+                    p_id for p_id in list(team_a) + list(team_b) if p_id not in ratings
+                ]
+                if missing:
+                    error = f"找不到球員: {missing}"
+
+            if error:
+                results.append(
+                    {"index": index, "team_a": team_a, "team_b": team_b, "error": error}
+                )
+                continue
+
+            result = PredictionService.evaluate_ratings(
+                [ratings[p_id] for p_id in team_a], [ratings[p_id] for p_id in team_b]
+            )
+            results.append(
+                {
+                    "index": index,
+                    **PredictionService._format_result(team_a, team_b, result),
+                }
+            )
+
+        return results
+
+    @staticmethod
+    def _format_result(team_a: list[int], team_b: list[int], result: dict) -> dict:
+        return {
+            "team_a": list(team_a),
+            "team_b": list(team_b),
+            "win_probability_a": round(result["win_probability_a"], 4),
+            "win_probability_b": round(result["win_probability_b"], 4),
+            "match_quality": round(result["match_quality"], 4),
+        }
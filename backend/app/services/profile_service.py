@@ -3,7 +3,13 @@ from sqlalchemy.exc import IntegrityError
 
 from ..extensions import db
 from ..models import User
+from ..models.enums import ChangeActionEnum, ChangeEntityEnum
 from ..tools.exceptions import UserNotFoundError, UserAlreadyExistsError, AppException
+from .change_log_service import ChangeLogService
+
+# 個人資料中可更新的 Member 欄位；display_name 在 User 上，但同步時屬於球員資料
+MEMBER_PROFILE_FIELDS = ["name", "student_id", "gender", "position", "organization_id"]
+MEMBER_SYNC_FIELDS = ["display_name", *MEMBER_PROFILE_FIELDS]
 
 
 class ProfileService:
@@ -18,6 +24,18 @@ class ProfileService:
             raise UserNotFoundError("找不到使用者或帳號已被停用。")
         return user
 
+    @staticmethod
+    def _update_member_fields(member, data: dict) -> None:
+        """更新 Member 的個人資料欄位，有異動時記錄變更（離線客戶端才會同步）"""
+        # 遍歷 data 中的鍵，如果 Member 模型有對應的屬性，則更新
+        for field in MEMBER_PROFILE_FIELDS:  # 以及您在 Schema 中允許更新的其他欄位
+            if field in data:
+                setattr(member, field, data[field])
+        if not data.keys().isdisjoint(MEMBER_SYNC_FIELDS):
+            ChangeLogService.record(
+                ChangeEntityEnum.MEMBER, member.id, ChangeActionEnum.UPDATED
+            )
+
     @staticmethod
     def update_user_profile(user_id: int, data: dict) -> User:
         """
@@ -40,16 +58,7 @@ class ProfileService:
 
         # --- 更新 Member 模型的欄位 ---
         if member_to_update:
-            # 遍歷 data 中的鍵，如果 Member 模型有對應的屬性，則更新
-            for field in [
-                "name",
-                "student_id",
-                "gender",
-                "position",
-                "organization_id",
-            ]:  # 以及您在 Schema 中允許更新的其他欄位
-                if field in data:
-                    setattr(member_to_update, field, data[field])
+            ProfileService._update_member_fields(member_to_update, data)
         elif any(key in data for key in ["gender", "position", "organization_id"]):
             # 如果使用者嘗試更新 Member 欄位，但沒有 Member profile，可以選擇報錯或忽略
             # 這裡我們選擇忽略，只更新 User 部分
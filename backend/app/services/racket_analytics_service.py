@@ -0,0 +1,114 @@
+# backend/app/services/racket_analytics_service.py
+"""
+球拍分析服務 - 依球拍彙總使用者的勝率、平均評分與每場評分變化
+
+統計以單一 SQL 彙總（members × match_records × rackets）計算，不載入球員物件；
+結果依變更紀錄版本快取，比賽、球員或評分有變更時下一次請求才重新計算。
+"""
+
+import threading
+
+from sqlalchemy import func, literal_column
+
+from ..config import RatingCalculationConfig
+from ..extensions import db
+from ..models import Member, Racket
+from ..models.member import CONSERVATIVE_SCORE_EXPRESSION
+from .change_log_service import ChangeLogService
+from .leaderboard_service import LeaderboardService
+from .rating_service import trueskill_env
+
+_lock = threading.Lock()
+_cache = {"version": None, "rows": None}
+
+
+class RacketAnalyticsService:
+    @staticmethod
+    def _build_rows() -> list[dict]:
+        """
+        每支球拍的彙總（只含有球員使用的球拍）
+
+        評分變化以使用者目前評分與初始評分的差計算，歸給球員目前登記的球拍；
+        每場評分變化 = 使用者保守分數變化總和 / 使用者比賽場數總和
+        """
+        initial_score = (
+            trueskill_env.mu
+            - RatingCalculationConfig.TRUESKILL_CONSERVATIVE_K * trueskill_env.sigma
+        )
+        totals = LeaderboardService.member_match_totals()
+        wins = func.coalesce(totals.c.wins, 0)
+        losses = func.coalesce(totals.c.losses, 0)
+
+        query = (
+            db.session.query(
+                Racket.id,
+                Racket.brand,
+                Racket.model_name,
+                func.count(Member.id).label("players"),
+                func.avg(Member.mu).label("avg_mu"),
+                func.avg(CONSERVATIVE_SCORE_EXPRESSION).label("avg_score"),
+                func.sum(wins).label("wins"),
+                func.sum(losses).label("losses"),
+                func.sum(
+                    CONSERVATIVE_SCORE_EXPRESSION - literal_column(repr(initial_score))
+                ).label("score_gain"),
+            )
+            .join(Member, Member.racket_id == Racket.id)
+            .outerjoin(totals, totals.c.member_id == Member.id)
+            .group_by(Racket.id, Racket.brand, Racket.model_name)
+        )
+
+        rows = []
+        for row in query:
+            matches = row.wins + row.losses
+            rows.append(
+                {
+                    "racket_id": row.id,
+                    "brand": row.brand,
+                    "model_name": row.model_name,
+                    "players": row.players,
+                    "matches": matches,
+                    "wins": row.wins,
+                    "losses": row.losses,
+                    "win_rate": round(row.wins / matches * 100, 1) if matches else 0.0,
+                    "avg_mu": round(float(row.avg_mu), 2),
+                    "avg_score": round(float(row.avg_score), 2),
+                    "rating_gain_per_match": (
+                        round(row.score_gain / matches, 3) if matches else 0.0
+                    ),
+                }
+            )
+        return rows
+
+    @staticmethod
+    def get_statistics() -> tuple[int, list[dict]]:
+        """
+        取得 (資料版本, 各球拍統計)
+
+        資料版本為最新的變更紀錄 ID；版本未變時直接使用快取，不重新彙總。
+        """
+        version = ChangeLogService.latest_version()
+        with _lock:
+            if _cache["rows"] is None or _cache["version"] != version:
+                _cache["rows"] = RacketAnalyticsService._build_rows()
+                _cache["version"] = version
+            return _cache["version"], _cache["rows"]
+
+    @staticmethod
+    def get_leaderboard(
+        sort_by: str = "win_rate", sort_order: str = "desc", min_matches: int = 0
+    ) -> tuple[int, list[dict]]:
+        """
+        球拍排行榜（由快取的統計排序，同分時比賽場數多者在前）
+
+        Returns:
+            tuple: (資料版本, [球拍統計，含 rank])
+        """
+        version, rows = RacketAnalyticsService.get_statistics()
+        rows = [row for row in rows if row["matches"] >= min_matches]
+        rows.sort(key=lambda row: (row[sort_by], row["matches"]))
+        if sort_order == "desc":
+            rows.reverse()
+        return version, [
+            {"rank": rank, **row} for rank, row in enumerate(rows, start=1)
+        ]
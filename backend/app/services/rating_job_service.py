@@ -0,0 +1,349 @@
+# backend/app/services/rating_job_service.py
+"""
+評分更新工作佇列服務
+
+RATING_UPDATE_MODE=async 時，比賽記錄的新增/修改/刪除只在同一交易中寫入
+rating_jobs，HTTP 請求不再執行評分演算；`flask rating-worker` 依工作 id
+順序逐一處理。sync 模式（預設）則維持在請求中直接更新評分。
+
+同一時間只支援一個 worker：相鄰的工作可能共用球員，平行處理會以過期的評分
+覆寫彼此的結果，因此 worker 以 worker_lock() 取得單一執行鎖。
+"""
+
+import contextlib
+import datetime
+
+from flask import current_app
+from sqlalchemy import and_, or_, text
+
+from ..extensions import db
+from ..models import Match, MatchRecord, RatingJob
+from ..models.enums import ChangeActionEnum, ChangeEntityEnum
+from ..models.enums.rating_enums import RatingJobTypeEnum, RatingStatusEnum
+from ..tools.exceptions import AppException
+from .change_log_service import ChangeLogService
+from .rating_service import RatingService
+
+RATING_UPDATE_MODE_SYNC = "sync"
+RATING_UPDATE_MODE_ASYNC = "async"
+
+MAX_JOB_ATTEMPTS = 3  # 超過次數標記為 failed，讓佇列繼續前進
+STALE_JOB_MINUTES = 10  # processing 超過此時間視為 worker 中斷，重新排入佇列
+WORKER_LOCK_KEY = 727001  # PostgreSQL advisory lock 的鍵值
+
+
+class RatingJobService:
+    @staticmethod
+    def is_async() -> bool:
+        return (
+            current_app.config.get("RATING_UPDATE_MODE", RATING_UPDATE_MODE_SYNC)
+            == RATING_UPDATE_MODE_ASYNC
+        )
+
+    @staticmethod
+    def _record_player_ids(record: MatchRecord) -> list[int]:
+        return [
+            p_id
+            for p_id in [
+                record.player1_id,
+                record.player2_id,
+                record.player3_id,
+                record.player4_id,
+            ]
+            if p_id
+        ]
+
+    # ---- 排程（由 MatchRecordService 在交易內呼叫，不負責 commit）----
+
+    @staticmethod
+    def schedule_match_update(record: MatchRecord) -> None:
+        """
+        新比賽：同步模式直接更新評分，非同步模式寫入工作佇列
+
+        同步模式下補登的舊比賽與 worker 相同，改為重演受影響球員的歷史。
+        """
+        if not RatingJobService.is_async():
+            if RatingJobService._has_later_rated_match(record):
+                RatingService.recalculate_ratings_for_players(
+                    RatingJobService._record_player_ids(record)
+                )
+            else:
+                RatingService.update_ratings_from_match(record)
+            record.rating_status = RatingStatusEnum.DONE
+            return
+
+        record.rating_status = RatingStatusEnum.PENDING
+        db.session.add(
+            RatingJob(job_type=RatingJobTypeEnum.MATCH_UPDATE, match_record=record)
+        )
+
+    @staticmethod
+    def schedule_recalculation(
+        player_ids: list[int], record: MatchRecord = None
+    ) -> None:
+        """修改/刪除比賽：重算受影響球員的歷史評分"""
+        player_ids = sorted(set(player_ids))
+        if not player_ids:
+            return
+
+        if not RatingJobService.is_async():
+            RatingService.recalculate_ratings_for_players(player_ids)
+            if record is not None:
+                record.rating_status = RatingStatusEnum.DONE
+            return
+
+        if record is not None:
+            record.rating_status = RatingStatusEnum.PENDING
+        db.session.add(
+            RatingJob(
+                job_type=RatingJobTypeEnum.RECALCULATE,
+                match_record=record,
+                player_ids=player_ids,
+            )
+        )
+
+    @staticmethod
+    def schedule_batch(records: list[MatchRecord]) -> None:
+        """
+        批次新增的比賽（已依比賽時間排序並 flush）：評分依序只計算一次
+
+        同步模式下，若已有較晚且共用球員的比賽完成評分（補登），改為對批次內所有
+        球員重演一次歷史；否則依序增量更新。非同步模式依序寫入工作佇列。
+        """
+        if not records:
+            return
+
+        if RatingJobService.is_async():
+            for record in records:
+                RatingJobService.schedule_match_update(record)
+            return
+
+        player_ids = sorted(
+            {
+                p_id
+                for record in records
+                for p_id in RatingJobService._record_player_ids(record)
+            }
+        )
+        earliest_date = min(record.match.match_date for record in records)
+        later_rated = (
+            db.session.query(MatchRecord.id)
+            .join(MatchRecord.match)
+            .filter(
+                MatchRecord.id.notin_([record.id for record in records]),
+                MatchRecord.rating_status == RatingStatusEnum.DONE,
+                or_(
+                    MatchRecord.player1_id.in_(player_ids),
+                    MatchRecord.player2_id.in_(player_ids),
+                    MatchRecord.player3_id.in_(player_ids),
+                    MatchRecord.player4_id.in_(player_ids),
+                ),
+                Match.match_date > earliest_date,
+            )
+        )
+
+        if db.session.query(later_rated.exists()).scalar():
+            RatingService.recalculate_ratings_for_players(player_ids)
+        else:
+            for record in records:
+                RatingService.update_ratings_from_match(record)
+        for record in records:
+            record.rating_status = RatingStatusEnum.DONE
+
+    # ---- Worker ----
+
+    @staticmethod
+    @contextlib.contextmanager
+    def worker_lock():
+        """
+        取得 worker 的單一執行鎖，yield 是否取得成功
+
+        PostgreSQL 以 session 層級的 advisory lock 保存在獨立連線上，worker 結束
+        或連線中斷時自動釋放。其他資料庫（SQLite 開發環境）不加鎖。
+        """
+        if db.engine.dialect.name != "postgresql":
+            yield True
+            return
+
+        with db.engine.connect() as connection:
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": WORKER_LOCK_KEY}
+            ).scalar()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    connection.execute(
+                        text("SELECT pg_advisory_unlock(:key)"),
+                        {"key": WORKER_LOCK_KEY},
+                    )
+
+    @staticmethod
+    def requeue_stale_jobs() -> int:
+        """將 worker 中斷遺留的 processing 工作重新排入佇列"""
+        threshold = datetime.datetime.now() - datetime.timedelta(
+            minutes=STALE_JOB_MINUTES
+        )
+        count = RatingJob.query.filter(
+            RatingJob.status == RatingStatusEnum.PROCESSING,
+            RatingJob.started_at < threshold,
+        ).update(
+            {RatingJob.status: RatingStatusEnum.PENDING}, synchronize_session=False
+        )
+        db.session.commit()
+        return count
+
+    @staticmethod
+    def claim_next_job():
+        """
+        取出最早的待處理工作並標記為 processing
+
+        工作必須依序處理，呼叫端需持有 worker_lock()；SKIP LOCKED 只避免
+        其他交易鎖住佇列時阻塞，並不代表支援多個 worker 平行處理。
+        """
+        job = (
+            RatingJob.query.filter(RatingJob.status == RatingStatusEnum.PENDING)
+            .order_by(RatingJob.id.asc())
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            db.session.rollback()
+            return None
+
+        job.status = RatingStatusEnum.PROCESSING
+        job.started_at = datetime.datetime.now()
+        job.attempts = (job.attempts or 0) + 1
+        if job.match_record is not None:
+            job.match_record.rating_status = RatingStatusEnum.PROCESSING
+        db.session.commit()
+        return job
+
+    @staticmethod
+    def _has_later_rated_match(record: MatchRecord) -> bool:
+        """是否已有時間較晚、且共用球員的比賽完成評分（補登舊比賽的情況）"""
+        player_ids = RatingJobService._record_player_ids(record)
+        match_date = record.match.match_date
+        query = (
+            db.session.query(MatchRecord.id)
+            .join(MatchRecord.match)
+            .filter(
+                MatchRecord.id != record.id,
+                MatchRecord.rating_status == RatingStatusEnum.DONE,
+                or_(
+                    MatchRecord.player1_id.in_(player_ids),
+                    MatchRecord.player2_id.in_(player_ids),
+                    MatchRecord.player3_id.in_(player_ids),
+                    MatchRecord.player4_id.in_(player_ids),
+                ),
+                or_(
+                    Match.match_date > match_date,
+                    and_(Match.match_date == match_date, MatchRecord.id > record.id),
+                ),
+            )
+        )
+        return db.session.query(query.exists()).scalar()
+
+    @staticmethod
+    def process_job(job: RatingJob) -> bool:
+        """執行單一工作，回傳是否成功"""
+        job_id = job.id
+        try:
+            record = job.match_record
+            if job.job_type == RatingJobTypeEnum.MATCH_UPDATE:
+                if record is None:
+                    pass  # 比賽已刪除，刪除時另有重算工作
+                elif RatingJobService._has_later_rated_match(record):
+                    # 補登的舊比賽必須按時間順序重演，不能直接增量更新
+                    RatingService.recalculate_ratings_for_players(
+                        RatingJobService._record_player_ids(record)
+                    )
+                else:
+                    RatingService.update_ratings_from_match(record)
+            else:
+                RatingService.recalculate_ratings_for_players(job.player_ids or [])
+
+            job.status = RatingStatusEnum.DONE
+            job.finished_at = datetime.datetime.now()
+            job.last_error = None
+            if record is not None and not RatingJobService._has_newer_job(job):
+                record.rating_status = RatingStatusEnum.DONE
+                ChangeLogService.record(
+                    ChangeEntityEnum.MATCH_RECORD, record.id, ChangeActionEnum.UPDATED
+                )
+            db.session.commit()
+            return True
+
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"評分工作 {job_id} 執行失敗: {e}", exc_info=True)
+
+            job = db.session.get(RatingJob, job_id)
+            failed = job.attempts >= MAX_JOB_ATTEMPTS
+            job.status = RatingStatusEnum.FAILED if failed else RatingStatusEnum.PENDING
+            job.last_error = str(e)
+            if job.match_record is not None:
+                job.match_record.rating_status = job.status
+            db.session.commit()
+            return False
+
+    @staticmethod
+    def _has_newer_job(job: RatingJob) -> bool:
+        """同一場比賽是否還有較新的待處理工作"""
+        return db.session.query(
+            RatingJob.query.filter(
+                RatingJob.match_record_id == job.match_record_id,
+                RatingJob.id > job.id,
+                RatingJob.status.in_(
+                    [RatingStatusEnum.PENDING, RatingStatusEnum.PROCESSING]
+                ),
+            ).exists()
+        ).scalar()
+
+    @staticmethod
+    def run_pending(max_jobs: int = None) -> dict:
+        """處理目前佇列中的工作，回傳統計"""
+        stats = {"processed": 0, "failed": 0}
+        while max_jobs is None or stats["processed"] + stats["failed"] < max_jobs:
+            job = RatingJobService.claim_next_job()
+            if job is None:
+                break
+            if RatingJobService.process_job(job):
+                stats["processed"] += 1
+            else:
+                stats["failed"] += 1
+        return stats
+
+    # ---- 查詢 ----
+
+    @staticmethod
+    def get_rating_status(record_id: int) -> dict:
+        """查詢比賽記錄的評分更新狀態"""
+        record = db.session.get(MatchRecord, record_id)
+        if record is None:
+            raise AppException("找不到指定的比賽記錄。", status_code=404)
+
+        latest_job = (
+            RatingJob.query.filter(RatingJob.match_record_id == record_id)
+            .order_by(RatingJob.id.desc())
+            .first()
+        )
+        result = {
+            "match_record_id": record.id,
+            "rating_status": record.rating_status.value,
+            "jobs_ahead": 0,
+            "last_error": None,
+        }
+        if latest_job is not None:
+            if latest_job.status == RatingStatusEnum.PENDING:
+                result["jobs_ahead"] = RatingJob.query.filter(
+                    RatingJob.status.in_(
+                        [RatingStatusEnum.PENDING, RatingStatusEnum.PROCESSING]
+                    ),
+                    RatingJob.id < latest_job.id,
+                ).count()
+            result["last_error"] = latest_job.last_error
+            result["finished_at"] = (
+                latest_job.finished_at.isoformat() if latest_job.finished_at else None
+            )
+        return result
@@ -1,8 +1,25 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import trueskill
 
+from ..config import RatingCalculationConfig
 from ..extensions import db
 from ..models import Match, MatchRecord, Member
-from ..models.enums import GenderEnum, MatchOutcomeEnum
+from ..models.context_rating import tracked_contexts
+from ..models.enums import (
+    ChangeActionEnum,
+    ChangeEntityEnum,
+    GenderEnum,
+    MatchOutcomeEnum,
+)
+from ..tools.event_bus import publish_after_commit
+from .change_log_service import ChangeLogService
+from .context_rating_service import ContextRatingService
+from .member_form_service import MemberFormService
+from .pair_rating_service import PairRatingService
+from .rating_snapshot_service import RatingSnapshotService
 
 # 性別獎勵/懲罰參數
 GENDER_BONUS_MU = 0.6  # 女生贏男生時的額外加分
@@ -10,26 +27,155 @@ MALE_WIN_PENALTY = 0.3  # 男生贏有女生隊伍時的加分減少比例
 MALE_LOSE_PENALTY = 0.4  # 男生輸給有女生隊伍時的額外扣分
 FEMALE_LOSE_MITIGATION = 0.5  # 女生輸給男生時的扣分減輕比例
 MALE_WITH_FEMALE_LOSE_MITIGATION = 0.3  # 男生有女隊友輸球時的扣分減輕比例
-MALE_WITH_FEMALE_LOSE_MITIGATION = (
-    0.3  # 男生有女隊友輸球時的扣分減輕比例時的加分減少比例
-)
-MALE_LOSE_PENALTY = 0.4  # 男生輸給有女生隊伍時的額外扣分
-FEMALE_LOSE_MITIGATION = 0.5  # 女生輸給男生時的扣分減輕比例
+
+# 動態 Beta：分差比例對 Beta 的縮減係數
+DYNAMIC_BETA_SUSPENSE_FACTOR = 0.5
+
+# 評分演算參數的預設值（模擬沙盒可逐項覆寫）
+DEFAULT_RATING_PARAMS = {
+    "gender_bonus_mu": GENDER_BONUS_MU,
+    "male_win_penalty": MALE_WIN_PENALTY,
+    "male_lose_penalty": MALE_LOSE_PENALTY,
+    "female_lose_mitigation": FEMALE_LOSE_MITIGATION,
+    "male_with_female_lose_mitigation": MALE_WITH_FEMALE_LOSE_MITIGATION,
+    "dynamic_beta_suspense_factor": DYNAMIC_BETA_SUSPENSE_FACTOR,
+}
 
 trueskill_env = trueskill.TrueSkill(draw_probability=0)
 
+# 單一事件最多附帶的評分差異筆數，超過時改送 full_refresh
+MAX_RATING_EVENT_CHANGES = 100
+
+# 平行重算時，比賽數少於此值的工作不值得分派到子行程
+MIN_PARALLEL_MATCHES = 2000
+
 
 class RatingService:
     @staticmethod
     def _get_player_data(player_ids: list[int]) -> dict:
-        """批次獲取球員資料，回傳以 ID 為鍵的字典"""
+        """
+        批次獲取並鎖定球員資料，回傳以 ID 為鍵的字典
+
+        依 ID 順序鎖定，同時更新相同球員的交易會依序執行，不會以舊評分覆寫。
+        """
         if not player_ids:
             return {}
-        players = Member.query.filter(Member.id.in_(player_ids)).all()
+        players = (
+            Member.query.filter(Member.id.in_(player_ids))
+            .order_by(Member.id)
+            .with_for_update()
+            .all()
+        )
         return {p.id: p for p in players}
 
     @staticmethod
-    def _calculate_dynamic_beta(a_games: int, b_games: int) -> float:
+    def _get_player_genders(player_ids) -> dict:
+        """只查詢性別欄位，回傳 {player_id: GenderEnum}"""
+        player_ids = set(player_ids)
+        if not player_ids:
+            return {}
+        rows = (
+            db.session.query(Member.id, Member.gender)
+            .filter(Member.id.in_(player_ids))
+            .all()
+        )
+        return {row.id: row.gender for row in rows}
+
+    @staticmethod
+    def _load_match_history(
+        player_ids: list[int] = None,
+        with_keys: bool = False,
+        with_contexts: bool = False,
+    ) -> list[tuple]:
+        """
+        依時間順序載入比賽歷史，只取評分演算需要的欄位
+
+        Args:
+            with_keys: 每場比賽另外附上 (record_id, match_date)，供寫入評分快照
+            with_contexts: 最後再附上比賽所屬情境的 tuple，供重算情境評分
+
+        Returns:
+            list: (side_a_ids, side_b_ids, a_games, b_games, side_a_won) 組成的序列，
+                  皆為可序列化的基本型別，可直接傳給子行程
+        """
+        query = (
+            db.session.query(
+                MatchRecord.id,
+                Match.match_date,
+                MatchRecord.player1_id,
+                MatchRecord.player2_id,
+                MatchRecord.player3_id,
+                MatchRecord.player4_id,
+                MatchRecord.a_games,
+                MatchRecord.b_games,
+                MatchRecord.side_a_outcome,
+                Match.court_surface,
+                Match.court_environment,
+                Match.match_type,
+            )
+            .join(MatchRecord.match)
+            .order_by(Match.match_date.asc(), MatchRecord.id.asc())
+        )
+        contexts = tracked_contexts().items() if with_contexts else ()
+        if player_ids is not None:
+            query = query.filter(
+                db.or_(
+                    MatchRecord.player1_id.in_(player_ids),
+                    MatchRecord.player2_id.in_(player_ids),
+                    MatchRecord.player3_id.in_(player_ids),
+                    MatchRecord.player4_id.in_(player_ids),
+                )
+            )
+
+        return [
+            (
+                tuple(p_id for p_id in (row.player1_id, row.player2_id) if p_id),
+                tuple(p_id for p_id in (row.player3_id, row.player4_id) if p_id),
+                row.a_games,
+                row.b_games,
+                row.side_a_outcome == MatchOutcomeEnum.WIN,
+                *((row.id, row.match_date) if with_keys else ()),
+                *(
+                    (
+                        tuple(
+                            context
+                            for context, (dimension, member) in contexts
+                            if getattr(row, dimension) == member
+                        ),
+                    )
+                    if with_contexts
+                    else ()
+                ),
+            )
+            for row in query.all()
+        ]
+
+    @staticmethod
+    def effective_sigma(sigma: float, last_match_date, as_of) -> float:
+        """
+        考慮閒置時間的有效 σ（TrueSkill 的 tau 只在比賽時放大 σ）
+
+        σ_eff = sqrt(σ² + 閒置天數 × decay²)，閒置天數扣除寬限期，上限為初始 σ；
+        沒有比賽記錄時維持原值。
+        """
+        if last_match_date is None:
+            return sigma
+        idle_days = (
+            as_of - last_match_date
+        ).days - RatingCalculationConfig.INACTIVITY_GRACE_DAYS
+        if idle_days <= 0:
+            return sigma
+
+        decay = RatingCalculationConfig.INACTIVITY_SIGMA_DECAY
+        inflated = math.sqrt(sigma**2 + idle_days * decay**2)
+        return min(inflated, max(sigma, trueskill_env.sigma))
+
+    @staticmethod
+    def _calculate_dynamic_beta(
+        a_games: int,
+        b_games: int,
+        suspense_factor: float = DYNAMIC_BETA_SUSPENSE_FACTOR,
+    ) -> float:
         """
         根據比賽分差計算動態 Beta 值
         分差越大 → Beta 越小 → 評分變化越大
@@ -39,22 +185,24 @@ class RatingService:
             return trueskill_env.beta
 
         suspense_degree = abs(a_games - b_games) / total_games
-        return trueskill_env.beta * (1 - suspense_degree * 0.5)
+        return trueskill_env.beta * (1 - suspense_degree * suspense_factor)
 
     @staticmethod
     def _apply_gender_adjustments(
         final_ratings: dict,
         winning_team: list[int],
         losing_team: list[int],
-        players: dict,
+        genders: dict,
         base_ratings: dict,
+        params: dict = None,
     ):
         """
         應用性別獎勵/懲罰機制
-        只要場上有女生就會觸發調整
+        只要場上有女生就會觸發調整，只調整 final_ratings 中存在的球員
         """
-        winning_genders = {p_id: players[p_id].gender for p_id in winning_team}
-        losing_genders = {p_id: players[p_id].gender for p_id in losing_team}
+        params = params or DEFAULT_RATING_PARAMS
+        winning_genders = {p_id: genders.get(p_id) for p_id in winning_team}
+        losing_genders = {p_id: genders.get(p_id) for p_id in losing_team}
 
         winner_has_female = GenderEnum.FEMALE in winning_genders.values()
         winner_has_male = GenderEnum.MALE in winning_genders.values()
@@ -65,69 +213,76 @@ class RatingService:
         if not (winner_has_female or loser_has_female):
             return
 
+        def adjustable(team_genders: dict, gender: GenderEnum) -> list[int]:
+            return [
+                p_id
+                for p_id, g in team_genders.items()
+                if g == gender and p_id in final_ratings
+            ]
+
         # 情況1: 女生贏男生 - 女生額外加分
         if winner_has_female and loser_has_male:
-            for p_id, gender in winning_genders.items():
-                if gender == GenderEnum.FEMALE:
-                    final_ratings[p_id]["mu"] += GENDER_BONUS_MU
+            for p_id in adjustable(winning_genders, GenderEnum.FEMALE):
+                final_ratings[p_id]["mu"] += params["gender_bonus_mu"]
 
         # 情況2: 男生贏有女生的隊伍 - 男生加分減少
         if winner_has_male and loser_has_female:
-            for p_id, gender in winning_genders.items():
-                if gender == GenderEnum.MALE:
-                    mu_change = final_ratings[p_id]["mu"] - base_ratings[p_id]["mu"]
-                    if mu_change > 0:
-                        final_ratings[p_id]["mu"] -= mu_change * MALE_WIN_PENALTY
+            for p_id in adjustable(winning_genders, GenderEnum.MALE):
+                mu_change = final_ratings[p_id]["mu"] - base_ratings[p_id]["mu"]
+                if mu_change > 0:
+                    final_ratings[p_id]["mu"] -= mu_change * params["male_win_penalty"]
 
         # 情況3: 男生輸給有女生的隊伍 - 男生額外扣分
         if loser_has_male and winner_has_female:
-            for p_id, gender in losing_genders.items():
-                if gender == GenderEnum.MALE:
-                    final_ratings[p_id]["mu"] -= MALE_LOSE_PENALTY
+            for p_id in adjustable(losing_genders, GenderEnum.MALE):
+                final_ratings[p_id]["mu"] -= params["male_lose_penalty"]
 
         # 情況4: 女生輸給男生 - 女生扣分減輕
         if loser_has_female and winner_has_male:
-            for p_id, gender in losing_genders.items():
-                if gender == GenderEnum.FEMALE:
-                    mu_change = final_ratings[p_id]["mu"] - base_ratings[p_id]["mu"]
-                    if mu_change < 0:
-                        final_ratings[p_id]["mu"] += (
-                            abs(mu_change) * FEMALE_LOSE_MITIGATION
-                        )
+            for p_id in adjustable(losing_genders, GenderEnum.FEMALE):
+                mu_change = final_ratings[p_id]["mu"] - base_ratings[p_id]["mu"]
+                if mu_change < 0:
+                    final_ratings[p_id]["mu"] += (
+                        abs(mu_change) * params["female_lose_mitigation"]
+                    )
 
         # 情況5: 男生有女隊友輸球 - 男生扣分減輕
         if loser_has_female and loser_has_male:
-            for p_id, gender in losing_genders.items():
-                if gender == GenderEnum.MALE:
-                    mu_change = final_ratings[p_id]["mu"] - base_ratings[p_id]["mu"]
-                    if mu_change < 0:
-                        final_ratings[p_id]["mu"] += (
-                            abs(mu_change) * MALE_WITH_FEMALE_LOSE_MITIGATION
-                        )
+            for p_id in adjustable(losing_genders, GenderEnum.MALE):
+                mu_change = final_ratings[p_id]["mu"] - base_ratings[p_id]["mu"]
+                if mu_change < 0:
+                    final_ratings[p_id]["mu"] += (
+                        abs(mu_change) * params["male_with_female_lose_mitigation"]
+                    )
 
     @staticmethod
-    def update_ratings_from_match(match_record: MatchRecord):
+    def compute_match_update(
+        ratings: dict,
+        genders: dict,
+        side_a_ids,
+        side_b_ids,
+        a_games: int,
+        b_games: int,
+        side_a_won: bool,
+        params: dict = None,
+    ) -> dict:
         """
-        根據單場比賽結果更新所有參與者的評分
+        計算單場比賽後的新評分（純計算，不讀寫資料庫）
         包含：動態 Beta、性別調整、TrueSkill 實力差異
-        """
-        side_a_ids = [
-            p_id for p_id in [match_record.player1_id, match_record.player2_id] if p_id
-        ]
-        side_b_ids = [
-            p_id for p_id in [match_record.player3_id, match_record.player4_id] if p_id
-        ]
 
-        all_player_ids = side_a_ids + side_b_ids
-        players_data = RatingService._get_player_data(all_player_ids)
+        Args:
+            ratings: {player_id: (mu, sigma)}，只有在此字典中的球員會參與計算
+            genders: {player_id: GenderEnum}
+            params: 覆寫 DEFAULT_RATING_PARAMS 的參數
 
-        # 確認所有球員資料都存在
-        if len(players_data) != len(set(all_player_ids)):
-            return
+        Returns:
+            dict: {player_id: {"mu": ..., "sigma": ...}}，任一隊無可計算球員時為空
+        """
+        params = {**DEFAULT_RATING_PARAMS, **(params or {})}
 
         # 計算動態 Beta
         dynamic_beta = RatingService._calculate_dynamic_beta(
-            match_record.a_games, match_record.b_games
+            a_games, b_games, params["dynamic_beta_suspense_factor"]
         )
 
         # 建立動態 TrueSkill 環境
@@ -141,26 +296,26 @@ class RatingService:
 
         # 建立兩隊的當前評分
         team1_ratings = {
-            p_id: temp_env.create_rating(
-                mu=players_data[p_id].mu, sigma=players_data[p_id].sigma
-            )
+            p_id: temp_env.create_rating(mu=ratings[p_id][0], sigma=ratings[p_id][1])
             for p_id in side_a_ids
+            if p_id in ratings
         }
         team2_ratings = {
-            p_id: temp_env.create_rating(
-                mu=players_data[p_id].mu, sigma=players_data[p_id].sigma
-            )
+            p_id: temp_env.create_rating(mu=ratings[p_id][0], sigma=ratings[p_id][1])
             for p_id in side_b_ids
+            if p_id in ratings
         }
+        if not team1_ratings or not team2_ratings:
+            return {}
 
         # 保存原始評分用於性別調整計算
         base_ratings = {
-            p_id: {"mu": players_data[p_id].mu, "sigma": players_data[p_id].sigma}
-            for p_id in all_player_ids
+            p_id: {"mu": ratings[p_id][0], "sigma": ratings[p_id][1]}
+            for p_id in (*team1_ratings, *team2_ratings)
         }
 
         # 決定勝負隊伍
-        if match_record.side_a_outcome == MatchOutcomeEnum.WIN:
+        if side_a_won:
             ranks = [0, 1]  # A隊勝
             winning_team_ids, losing_team_ids = side_a_ids, side_b_ids
         else:
@@ -179,7 +334,152 @@ class RatingService:
 
         # 應用性別調整
         RatingService._apply_gender_adjustments(
-            final_ratings, winning_team_ids, losing_team_ids, players_data, base_ratings
+            final_ratings,
+            winning_team_ids,
+            losing_team_ids,
+            genders,
+            base_ratings,
+            params,
+        )
+
+        return final_ratings
+
+    @staticmethod
+    def replay_matches(
+        matches,
+        genders: dict,
+        params: dict = None,
+        ratings: dict = None,
+        before_match=None,
+        after_match=None,
+    ) -> dict:
+        """
+        在記憶體中依序重演比賽
+
+        Args:
+            matches: _load_match_history 格式的比賽序列
+            genders: {player_id: GenderEnum}
+            params: 覆寫 DEFAULT_RATING_PARAMS 的參數
+            ratings: 起始評分 {player_id: (mu, sigma)}；未出現的球員以初始評分加入
+            before_match: 可選回呼 before_match(match, ratings)，於每場計算前呼叫
+            after_match: 可選回呼 after_match(match, updated)，updated 為該場評分有變動的
+                         球員 {player_id: (mu, sigma)}
+
+        Returns:
+            dict: 最終評分 {player_id: (mu, sigma)}
+        """
+        ratings = dict(ratings or {})
+        initial_rating = (trueskill_env.mu, trueskill_env.sigma)
+
+        for match in matches:
+            side_a_ids, side_b_ids, a_games, b_games, side_a_won = match[:5]
+            for p_id in (*side_a_ids, *side_b_ids):
+                if p_id not in ratings:
+                    ratings[p_id] = initial_rating
+
+            if before_match is not None:
+                before_match(match, ratings)
+
+            updated = RatingService.compute_match_update(
+                ratings,
+                genders,
+                side_a_ids,
+                side_b_ids,
+                a_games,
+                b_games,
+                side_a_won,
+                params,
+            )
+            for p_id, new_rating in updated.items():
+                ratings[p_id] = (new_rating["mu"], new_rating["sigma"])
+
+            if after_match is not None:
+                after_match(match, {p_id: ratings[p_id] for p_id in updated})
+
+        return ratings
+
+    @staticmethod
+    def _record_rating_changes(previous: dict, updated: dict) -> None:
+        """
+        記錄評分變動：寫入變更紀錄，並在提交後推播評分差異事件
+
+        Args:
+            previous / updated: {player_id: (mu, sigma)}，只處理實際有變動的球員
+        """
+        changed_ids = sorted(
+            p_id for p_id, rating in updated.items() if previous.get(p_id) != rating
+        )
+        if not changed_ids:
+            return
+
+        ChangeLogService.record(
+            ChangeEntityEnum.RATING, changed_ids, ChangeActionEnum.UPDATED
+        )
+
+        if len(changed_ids) > MAX_RATING_EVENT_CHANGES:
+            # 大量重算時只通知客戶端重新載入
+            publish_after_commit(
+                db.session,
+                {
+                    "type": "ratings_changed",
+                    "full_refresh": True,
+                    "count": len(changed_ids),
+                },
+            )
+            return
+
+        k = RatingCalculationConfig.TRUESKILL_CONSERVATIVE_K
+        changes = []
+        for p_id in changed_ids:
+            old_mu, old_sigma = previous.get(p_id) or (
+                trueskill_env.mu,
+                trueskill_env.sigma,
+            )
+            mu, sigma = updated[p_id]
+            changes.append(
+                {
+                    "member_id": p_id,
+                    "mu": round(mu, 4),
+                    "sigma": round(sigma, 4),
+                    "conservative_score": round(mu - k * sigma, 4),
+                    "delta_mu": round(mu - old_mu, 4),
+                    "delta_conservative": round(
+                        (mu - k * sigma) - (old_mu - k * old_sigma), 4
+                    ),
+                }
+            )
+        publish_after_commit(
+            db.session, {"type": "ratings_changed", "changes": changes}
+        )
+
+    @staticmethod
+    def update_ratings_from_match(match_record: MatchRecord):
+        """
+        根據單場比賽結果更新所有參與者的評分
+        """
+        side_a_ids = [
+            p_id for p_id in [match_record.player1_id, match_record.player2_id] if p_id
+        ]
+        side_b_ids = [
+            p_id for p_id in [match_record.player3_id, match_record.player4_id] if p_id
+        ]
+
+        all_player_ids = side_a_ids + side_b_ids
+        players_data = RatingService._get_player_data(all_player_ids)
+
+        # 確認所有球員資料都存在
+        if len(players_data) != len(set(all_player_ids)):
+            return
+
+        previous_ratings = {p_id: (p.mu, p.sigma) for p_id, p in players_data.items()}
+        final_ratings = RatingService.compute_match_update(
+            previous_ratings,
+            {p_id: p.gender for p_id, p in players_data.items()},
+            side_a_ids,
+            side_b_ids,
+            match_record.a_games,
+            match_record.b_games,
+            match_record.side_a_outcome == MatchOutcomeEnum.WIN,
         )
 
         # 更新資料庫
@@ -188,6 +488,260 @@ class RatingService:
             if member:
                 member.mu = new_rating["mu"]
                 member.sigma = new_rating["sigma"]
+        updated_ratings = {
+            p_id: (r["mu"], r["sigma"]) for p_id, r in final_ratings.items()
+        }
+        RatingService._record_rating_changes(previous_ratings, updated_ratings)
+        match_date = match_record.match.match_date if match_record.match else None
+        if match_date is not None:
+            RatingSnapshotService.record_match(
+                match_record.id, match_date, updated_ratings
+            )
+
+        # 情境評分：只計入比賽所屬的情境，演算方式與主評分相同
+        contexts = (
+            ContextRatingService.contexts_of(match_record.match)
+            if match_record.match
+            else []
+        )
+        context_ratings = ContextRatingService.get_or_create(
+            [(context, p_id) for context in contexts for p_id in all_player_ids],
+            (trueskill_env.mu, trueskill_env.sigma),
+        )
+        for context in contexts:
+            context_final = RatingService.compute_match_update(
+                {
+                    p_id: (rating.mu, rating.sigma)
+                    for (rating_context, p_id), rating in context_ratings.items()
+                    if rating_context == context
+                },
+                {p_id: p.gender for p_id, p in players_data.items()},
+                side_a_ids,
+                side_b_ids,
+                match_record.a_games,
+                match_record.b_games,
+                match_record.side_a_outcome == MatchOutcomeEnum.WIN,
+            )
+            for p_id, new_rating in context_final.items():
+                rating = context_ratings[(context, p_id)]
+                rating.mu = new_rating["mu"]
+                rating.sigma = new_rating["sigma"]
+                rating.matches_played += 1
+
+        # 雙打組合評分
+        pair_keys = RatingService._pair_keys(side_a_ids, side_b_ids)
+        if pair_keys:
+            pairs = PairRatingService.get_or_create(
+                pair_keys, (trueskill_env.mu, trueskill_env.sigma)
+            )
+            pair_a, pair_b = (pairs[key] for key in pair_keys)
+            side_a_won = match_record.side_a_outcome == MatchOutcomeEnum.WIN
+            new_a, new_b = RatingService.compute_pair_update(
+                (pair_a.mu, pair_a.sigma),
+                (pair_b.mu, pair_b.sigma),
+                match_record.a_games,
+                match_record.b_games,
+                side_a_won,
+            )
+            for pair, (mu, sigma), won in (
+                (pair_a, new_a, side_a_won),
+                (pair_b, new_b, not side_a_won),
+            ):
+                pair.mu, pair.sigma = mu, sigma
+                pair.matches_played += 1
+                pair.wins += int(won)
+                pair.losses += int(not won)
+                if match_date and (
+                    pair.last_match_date is None or match_date > pair.last_match_date
+                ):
+                    pair.last_match_date = match_date
+
+        # 球員近況（連勝 / 連敗、近期戰績）
+        MemberFormService.record_result(match_record)
+
+    @staticmethod
+    def _pair_keys(side_a_ids, side_b_ids) -> tuple:
+        """雙打比賽兩隊的組合鍵；非 2 對 2 時為 None"""
+        if len(side_a_ids) != 2 or len(side_b_ids) != 2:
+            return None
+        return (
+            PairRatingService.pair_key(*side_a_ids),
+            PairRatingService.pair_key(*side_b_ids),
+        )
+
+    @staticmethod
+    def compute_pair_update(
+        rating_a: tuple,
+        rating_b: tuple,
+        a_games: int,
+        b_games: int,
+        side_a_won: bool,
+    ) -> tuple:
+        """
+        組合評分：兩個組合各視為單一個體的 1 對 1 TrueSkill（含動態 Beta，無性別調整）
+
+        Returns:
+            tuple: ((mu, sigma), (mu, sigma))
+        """
+        temp_env = trueskill.TrueSkill(
+            mu=trueskill_env.mu,
+            sigma=trueskill_env.sigma,
+            beta=RatingService._calculate_dynamic_beta(a_games, b_games),
+            tau=trueskill_env.tau,
+            draw_probability=trueskill_env.draw_probability,
+        )
+        team_a = (temp_env.create_rating(*rating_a),)
+        team_b = (temp_env.create_rating(*rating_b),)
+        (new_a,), (new_b,) = temp_env.rate(
+            [team_a, team_b], ranks=[0, 1] if side_a_won else [1, 0]
+        )
+        return (new_a.mu, new_a.sigma), (new_b.mu, new_b.sigma)
+
+    @staticmethod
+    def recalculate_context_ratings(player_ids: list[int] = None) -> int:
+        """
+        依時間順序重算情境評分（不提交）
+
+        Args:
+            player_ids: 只重算這些球員（同 recalculate_ratings_for_players，
+                        只有指定球員參與演算）；None 表示全部球員
+
+        Returns:
+            int: 重算的情境評分筆數
+        """
+        matches = RatingService._load_match_history(
+            player_ids, with_keys=True, with_contexts=True
+        )
+        genders = RatingService._get_player_genders(
+            p_id
+            for side_a_ids, side_b_ids, *_ in matches
+            for p_id in (*side_a_ids, *side_b_ids)
+        )
+        initial_rating = (trueskill_env.mu, trueskill_env.sigma)
+        rebuilt_ids = None if player_ids is None else set(player_ids)
+
+        ratings = {}  # {context: {player_id: (mu, sigma)}}
+        played = {}  # {(context, player_id): 場數}
+        for match in matches:
+            side_a_ids, side_b_ids, a_games, b_games, side_a_won = match[:5]
+            for context in match[7]:
+                context_ratings = ratings.setdefault(context, {})
+                for p_id in (*side_a_ids, *side_b_ids):
+                    if p_id not in context_ratings and (
+                        rebuilt_ids is None or p_id in rebuilt_ids
+                    ):
+                        context_ratings[p_id] = initial_rating
+
+                final_ratings = RatingService.compute_match_update(
+                    context_ratings,
+                    genders,
+                    side_a_ids,
+                    side_b_ids,
+                    a_games,
+                    b_games,
+                    side_a_won,
+                )
+                for p_id, new_rating in final_ratings.items():
+                    context_ratings[p_id] = (new_rating["mu"], new_rating["sigma"])
+                    played[(context, p_id)] = played.get((context, p_id), 0) + 1
+
+        ContextRatingService.replace(
+            [
+                {
+                    "context": context,
+                    "member_id": p_id,
+                    "mu": ratings[context][p_id][0],
+                    "sigma": ratings[context][p_id][1],
+                    "matches_played": matches_played,
+                }
+                for (context, p_id), matches_played in played.items()
+            ],
+            player_ids,
+        )
+        return len(played)
+
+    @staticmethod
+    def recalculate_pair_ratings(player_ids: list[int] = None) -> int:
+        """
+        依時間順序重算雙打組合評分（不提交）
+
+        Args:
+            player_ids: 只重算包含這些球員的組合；對手組合使用目前評分且不寫回。
+                        None 表示全部組合（一次順序重演全部雙打比賽）
+
+        Returns:
+            int: 重算的組合數
+        """
+        matches = RatingService._load_match_history(player_ids, with_keys=True)
+        initial_rating = (trueskill_env.mu, trueskill_env.sigma)
+
+        def is_rebuilt(key):
+            return player_ids is None or key[0] in player_ids or key[1] in player_ids
+
+        stored = {}
+        if player_ids is not None:
+            player_ids = set(player_ids)
+            stored = PairRatingService.get_ratings(
+                list(
+                    {
+                        p_id
+                        for side_a_ids, side_b_ids, *_ in matches
+                        for p_id in (*side_a_ids, *side_b_ids)
+                    }
+                )
+            )
+
+        ratings = {}
+        records = {}
+        for (
+            side_a_ids,
+            side_b_ids,
+            a_games,
+            b_games,
+            side_a_won,
+            _,
+            match_date,
+        ) in matches:
+            pair_keys = RatingService._pair_keys(side_a_ids, side_b_ids)
+            if not pair_keys:
+                continue
+            for key in pair_keys:
+                if key not in ratings:
+                    ratings[key] = (
+                        initial_rating
+                        if is_rebuilt(key)
+                        else stored.get(key, initial_rating)
+                    )
+
+            key_a, key_b = pair_keys
+            ratings[key_a], ratings[key_b] = RatingService.compute_pair_update(
+                ratings[key_a], ratings[key_b], a_games, b_games, side_a_won
+            )
+            for key, won in ((key_a, side_a_won), (key_b, not side_a_won)):
+                if not is_rebuilt(key):
+                    continue
+                record = records.setdefault(
+                    key, {"matches_played": 0, "wins": 0, "losses": 0}
+                )
+                record["matches_played"] += 1
+                record["wins"] += int(won)
+                record["losses"] += int(not won)
+                record["last_match_date"] = match_date
+
+        PairRatingService.replace(
+            [
+                {
+                    "member_low_id": low_id,
+                    "member_high_id": high_id,
+                    "mu": ratings[(low_id, high_id)][0],
+                    "sigma": ratings[(low_id, high_id)][1],
+                    **record,
+                }
+                for (low_id, high_id), record in records.items()
+            ],
+            None if player_ids is None else list(player_ids),
+        )
+        return len(records)
 
     @staticmethod
     def recalculate_ratings_for_players(player_ids: list[int]):
@@ -200,118 +754,226 @@ class RatingService:
 
         players_to_recalculate = RatingService._get_player_data(player_ids)
 
-        # 重設為初始評分
-        current_ratings = {}
-        for p_id, member in players_to_recalculate.items():
-            member.mu = trueskill_env.mu
-            member.sigma = trueskill_env.sigma
-            current_ratings[p_id] = trueskill_env.create_rating(
-                mu=member.mu, sigma=member.sigma
-            )
+        # 重設為初始評分，只有指定球員參與演算
+        current_ratings = {
+            p_id: (trueskill_env.mu, trueskill_env.sigma)
+            for p_id in players_to_recalculate
+        }
 
-        # 獲取所有相關比賽，按時間排序
-        relevant_matches = (
-            MatchRecord.query.join(MatchRecord.match)
-            .filter(
-                db.or_(
-                    MatchRecord.player1_id.in_(player_ids),
-                    MatchRecord.player2_id.in_(player_ids),
-                    MatchRecord.player3_id.in_(player_ids),
-                    MatchRecord.player4_id.in_(player_ids),
-                )
-            )
-            .order_by(Match.match_date.asc(), MatchRecord.id.asc())
-            .all()
+        # 獲取所有相關比賽（按時間排序）與比賽中所有球員的性別
+        relevant_matches = RatingService._load_match_history(player_ids, with_keys=True)
+        genders = RatingService._get_player_genders(
+            p_id
+            for side_a_ids, side_b_ids, *_ in relevant_matches
+            for p_id in (*side_a_ids, *side_b_ids)
         )
 
-        # 逐場重新計算
-        for match in relevant_matches:
-            side_a_ids = [p_id for p_id in [match.player1_id, match.player2_id] if p_id]
-            side_b_ids = [p_id for p_id in [match.player3_id, match.player4_id] if p_id]
-
-            all_match_player_ids = side_a_ids + side_b_ids
-            all_match_players_data = RatingService._get_player_data(
-                all_match_player_ids
-            )
-
-            # 計算動態 Beta
-            dynamic_beta = RatingService._calculate_dynamic_beta(
-                match.a_games, match.b_games
+        # 逐場重新計算，同時重建這些球員的評分快照
+        snapshot_rows = []
+        for *match, record_id, match_date in relevant_matches:
+            side_a_ids, side_b_ids, a_games, b_games, side_a_won = match
+            final_ratings = RatingService.compute_match_update(
+                current_ratings,
+                genders,
+                side_a_ids,
+                side_b_ids,
+                a_games,
+                b_games,
+                side_a_won,
             )
+            for p_id, new_rating in final_ratings.items():
+                current_ratings[p_id] = (new_rating["mu"], new_rating["sigma"])
+                snapshot_rows.append(
+                    {
+                        "member_id": p_id,
+                        "match_record_id": record_id,
+                        "match_date": match_date,
+                        "mu": new_rating["mu"],
+                        "sigma": new_rating["sigma"],
+                    }
+                )
+        RatingSnapshotService.replace(snapshot_rows, list(players_to_recalculate))
+        RatingService.recalculate_pair_ratings(list(players_to_recalculate))
+        RatingService.recalculate_context_ratings(list(players_to_recalculate))
+        MemberFormService.rebuild(list(players_to_recalculate))
 
-            # 建立動態環境
-            temp_env = trueskill.TrueSkill(
-                mu=trueskill_env.mu,
-                sigma=trueskill_env.sigma,
-                beta=dynamic_beta,
-                tau=trueskill_env.tau,
-                draw_probability=trueskill_env.draw_probability,
-            )
+        # 將最終評分寫入資料庫
+        previous_ratings = {}
+        for p_id, (mu, sigma) in current_ratings.items():
+            member = players_to_recalculate[p_id]
+            previous_ratings[p_id] = (member.mu, member.sigma)
+            member.mu = mu
+            member.sigma = sigma
+        RatingService._record_rating_changes(previous_ratings, current_ratings)
 
-            # 使用當前計算狀態的評分
-            team1_current_ratings = {}
-            team2_current_ratings = {}
+    @staticmethod
+    def _partition_matches(matches) -> list[list[tuple]]:
+        """
+        以球員–比賽關係圖的連通分量切分比賽
 
-            for p_id in side_a_ids:
-                if p_id in current_ratings:
-                    team1_current_ratings[p_id] = temp_env.create_rating(
-                        mu=current_ratings[p_id].mu, sigma=current_ratings[p_id].sigma
-                    )
+        不同分量的球員之間（直接或間接）從未交手，評分歷史彼此獨立，
+        可以分別重演。每個分量內仍保持原本的時間順序。
+        """
+        parent = {}
+
+        def find(p_id):
+            root = p_id
+            while parent[root] != root:
+                root = parent[root]
+            while parent[p_id] != root:
+                parent[p_id], p_id = root, parent[p_id]
+            return root
+
+        for side_a_ids, side_b_ids, *_ in matches:
+            player_ids = (*side_a_ids, *side_b_ids)
+            for p_id in player_ids:
+                parent.setdefault(p_id, p_id)
+            root = find(player_ids[0])
+            for p_id in player_ids[1:]:
+                other_root = find(p_id)
+                if other_root != root:
+                    parent[other_root] = root
+
+        components = {}
+        for match in matches:
+            side_a_ids, side_b_ids, *_ = match
+            components.setdefault(find((*side_a_ids, *side_b_ids)[0]), []).append(match)
+        return list(components.values())
 
-            for p_id in side_b_ids:
-                if p_id in current_ratings:
-                    team2_current_ratings[p_id] = temp_env.create_rating(
-                        mu=current_ratings[p_id].mu, sigma=current_ratings[p_id].sigma
-                    )
+    @staticmethod
+    def _pack_partitions(components: list[list[tuple]], bins: int) -> list[list]:
+        """將分量依比賽數分配到各工作，最大者優先放入目前最輕的工作"""
+        loads = [[0, []] for _ in range(bins)]
+        for component in sorted(components, key=len, reverse=True):
+            lightest = min(loads, key=lambda load: load[0])
+            lightest[0] += len(component)
+            lightest[1].append(component)
+        return [partition for _, partition in loads if partition]
 
-            if not team1_current_ratings or not team2_current_ratings:
-                continue
+    @staticmethod
+    def recalculate_all_ratings(
+        workers: int = None, snapshots_only: bool = False
+    ) -> dict:
+        """
+        依連通分量平行重算全部球員的評分，最後一次批次寫回（含評分快照）
 
-            # 保存評分更新前的狀態
-            base_ratings = {}
-            for p_id in all_match_player_ids:
-                if p_id in current_ratings:
-                    base_ratings[p_id] = {
-                        "mu": current_ratings[p_id].mu,
-                        "sigma": current_ratings[p_id].sigma,
-                    }
+        Args:
+            workers: 平行行程數，預設為 CPU 核心數；1 表示在本行程內執行
+            snapshots_only: 只重建評分快照，不修改球員目前的評分
 
-            # 決定勝負
-            if match.side_a_outcome == MatchOutcomeEnum.WIN:
-                ranks = [0, 1]
-                winning_team_ids, losing_team_ids = side_a_ids, side_b_ids
-            else:
-                ranks = [1, 0]
-                winning_team_ids, losing_team_ids = side_b_ids, side_a_ids
-
-            # 評分更新
-            new_team1_ratings, new_team2_ratings = temp_env.rate(
-                [team1_current_ratings, team2_current_ratings], ranks=ranks
+        Returns:
+            dict: players / matches / components / workers 統計
+        """
+        matches = [
+            match
+            for match in RatingService._load_match_history(with_keys=True)
+            if match[0] and match[1]
+        ]
+        components = RatingService._partition_matches(matches)
+        current = {
+            p_id: (gender, mu, sigma)
+            for p_id, gender, mu, sigma in db.session.query(
+                Member.id, Member.gender, Member.mu, Member.sigma
             )
+        }
+        genders = {p_id: gender for p_id, (gender, _, _) in current.items()}
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(components)))
+        if len(matches) < MIN_PARALLEL_MATCHES:
+            workers = 1
+
+        partitions = RatingService._pack_partitions(components, workers)
+        tasks = [
+            (
+                partition,
+                {
+                    p_id: genders.get(p_id)
+                    for component in partition
+                    for side_a_ids, side_b_ids, *_ in component
+                    for p_id in (*side_a_ids, *side_b_ids)
+                },
+            )
+            for partition in partitions
+        ]
 
-            # 合併結果
-            final_ratings = {}
-            for p_id, rating in {**new_team1_ratings, **new_team2_ratings}.items():
-                final_ratings[p_id] = {"mu": rating.mu, "sigma": rating.sigma}
-
-            # 應用性別調整
-            RatingService._apply_gender_adjustments(
-                final_ratings,
-                winning_team_ids,
-                losing_team_ids,
-                all_match_players_data,
-                base_ratings,
+        if workers == 1:
+            results = [_replay_partition(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_replay_partition, tasks))
+
+        # 合併結果，未參與任何比賽的球員回到初始評分
+        final_ratings = {
+            p_id: (trueskill_env.mu, trueskill_env.sigma) for p_id in genders
+        }
+        snapshot_rows = []
+        for ratings, snapshots in results:
+            final_ratings.update(ratings)
+            snapshot_rows.extend(
+                {
+                    "member_id": p_id,
+                    "match_record_id": record_id,
+                    "match_date": match_date,
+                    "mu": mu,
+                    "sigma": sigma,
+                }
+                for p_id, record_id, match_date, mu, sigma in snapshots
             )
+        RatingSnapshotService.replace(snapshot_rows)
 
-            # 更新當前評分狀態
-            for p_id, new_rating_values in final_ratings.items():
-                current_ratings[p_id] = trueskill_env.create_rating(
-                    mu=new_rating_values["mu"], sigma=new_rating_values["sigma"]
-                )
+        stats = {
+            "players": len(final_ratings),
+            "matches": len(matches),
+            "components": len(components),
+            "workers": workers,
+        }
+        if snapshots_only:
+            return stats
 
-        # 將最終評分寫入資料庫
-        for p_id, final_rating in current_ratings.items():
-            member = players_to_recalculate.get(p_id)
-            if member:
-                member.mu = final_rating.mu
-                member.sigma = final_rating.sigma
+        stats["pairs"] = RatingService.recalculate_pair_ratings()
+        stats["context_ratings"] = RatingService.recalculate_context_ratings()
+        stats["forms"] = MemberFormService.rebuild()
+
+        changed = {
+            p_id: rating
+            for p_id, rating in final_ratings.items()
+            if current[p_id][1:] != rating
+        }
+        db.session.bulk_update_mappings(
+            Member,
+            [
+                {"id": p_id, "mu": mu, "sigma": sigma}
+                for p_id, (mu, sigma) in changed.items()
+            ],
+        )
+        RatingService._record_rating_changes(
+            {p_id: values[1:] for p_id, values in current.items()}, changed
+        )
+        return stats
+
+
+def _replay_partition(task: tuple) -> tuple[dict, list]:
+    """
+    子行程工作：逐一重演分配到的連通分量
+
+    Returns:
+        tuple: (最終評分, 評分快照 [(player_id, record_id, match_date, mu, sigma)])
+    """
+    partition, genders = task
+    ratings = {}
+    snapshots = []
+
+    def collect_snapshots(match, updated):
+        record_id, match_date = match[5:7]
+        snapshots.extend(
+            (p_id, record_id, match_date, mu, sigma)
+            for p_id, (mu, sigma) in updated.items()
+        )
+
+    for component in partition:
+        ratings.update(
+            RatingService.replay_matches(
+                component, genders, after_match=collect_snapshots
+            )
+        )
+    return ratings, snapshots
@@ -0,0 +1,183 @@
+# backend/app/services/rating_simulation_service.py
+"""
+評分模擬沙盒 - 以不同參數在記憶體中重演全部歷史比賽
+
+只讀取資料庫一次（比賽歷史與球員性別），之後所有演算都在記憶體中進行，
+不會修改任何球員評分。參數網格中的每組參數各自獨立，
+因此可以分派到行程池平行執行。
+
+評估指標為預測對數損失 (log-loss)：每場比賽計算前，
+以當下評分預測 A 隊勝率，再與實際結果比較。
+"""
+
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ..config import RatingCalculationConfig
+from ..extensions import db
+from ..models import Member
+from ..tools.exceptions import ValidationError
+from .prediction_service import PredictionService
+from .rating_service import DEFAULT_RATING_PARAMS, RatingService
+
+# 可調整的參數：評分演算參數 + 排行榜保守分數係數
+SIMULATION_PARAM_KEYS = (*DEFAULT_RATING_PARAMS, "conservative_k")
+MAX_PARAM_SETS = 256  # 單次網格最多組數
+LOG_LOSS_EPSILON = 1e-12
+
+# 子行程共用的歷史資料（由 initializer 設定，避免每個任務重複序列化）
+_worker_history = None
+
+
+class RatingSimulationService:
+    @staticmethod
+    def default_params() -> dict:
+        """目前線上使用的參數"""
+        return {
+            **DEFAULT_RATING_PARAMS,
+            "conservative_k": RatingCalculationConfig.TRUESKILL_CONSERVATIVE_K,
+        }
+
+    @staticmethod
+    def expand_grid(grid: dict[str, list]) -> list[dict]:
+        """
+        將參數網格展開為參數組列表，未指定的參數使用目前線上值
+
+        例：{"gender_bonus_mu": [0.4, 0.6], "conservative_k": [2, 3]} → 4 組參數
+        """
+        unknown = set(grid) - set(SIMULATION_PARAM_KEYS)
+        if unknown:
+            raise ValidationError(
+                {"params": [f"不支援的參數: {', '.join(sorted(unknown))}"]}
+            )
+
+        keys = list(grid)
+        combinations = list(itertools.product(*(grid[key] for key in keys)))
+        if len(combinations) > MAX_PARAM_SETS:
+            message = f"參數組合過多（{len(combinations)}），上限為 {MAX_PARAM_SETS}"
+            raise ValidationError({"params": [message]})
+
+        defaults = RatingSimulationService.default_params()
+        if not combinations:
+            return [defaults]
+        return [{**defaults, **dict(zip(keys, values))} for values in combinations]
+
+    @staticmethod
+    def load_history() -> dict:
+        """一次載入模擬所需的全部資料，回傳可序列化的字典"""
+        matches = RatingService._load_match_history()
+        member_rows = db.session.query(Member.id, Member.name, Member.gender).all()
+        return {
+            "matches": matches,
+            "genders": {row.id: row.gender for row in member_rows},
+            "names": {row.id: row.name for row in member_rows},
+        }
+
+    @staticmethod
+    def simulate(history: dict, params: dict, top: int = 20) -> dict:
+        """
+        以單組參數重演歷史比賽
+
+        Returns:
+            dict: params / log_loss / accuracy / evaluated_matches / leaderboard
+        """
+        params = {**RatingSimulationService.default_params(), **params}
+        rating_params = {key: params[key] for key in DEFAULT_RATING_PARAMS}
+        metrics = {"loss": 0.0, "correct": 0, "count": 0}
+
+        def score_prediction(match, ratings):
+            side_a_ids, side_b_ids, _, _, side_a_won = match
+            if not side_a_ids or not side_b_ids:
+                return
+            prediction = PredictionService.evaluate_ratings(
+                [ratings[p_id] for p_id in side_a_ids],
+                [ratings[p_id] for p_id in side_b_ids],
+            )
+            p_actual = (
+                prediction["win_probability_a"]
+                if side_a_won
+                else prediction["win_probability_b"]
+            )
+            metrics["loss"] -= math.log(max(p_actual, LOG_LOSS_EPSILON))
+            metrics["correct"] += (prediction["win_probability_a"] >= 0.5) == side_a_won
+            metrics["count"] += 1
+
+        ratings = RatingService.replay_matches(
+            history["matches"],
+            history["genders"],
+            rating_params,
+            before_match=score_prediction,
+        )
+
+        k = params["conservative_k"]
+        ranked = sorted(
+            ratings.items(), key=lambda item: item[1][0] - k * item[1][1], reverse=True
+        )
+        names = history.get("names", {})
+        leaderboard = [
+            {
+                "rank": index,
+                "member_id": p_id,
+                "name": names.get(p_id),
+                "mu": round(mu, 3),
+                "sigma": round(sigma, 3),
+                "score": round(mu - k * sigma, 3),
+            }
+            for index, (p_id, (mu, sigma)) in enumerate(ranked[:top], start=1)
+        ]
+
+        count = metrics["count"]
+        return {
+            "params": params,
+            "evaluated_matches": count,
+            "log_loss": round(metrics["loss"] / count, 6) if count else None,
+            "accuracy": round(metrics["correct"] / count, 4) if count else None,
+            "leaderboard": leaderboard,
+        }
+
+    @staticmethod
+    def run_grid(
+        param_sets: list[dict], workers: int = None, top: int = 20
+    ) -> list[dict]:
+        """
+        對多組參數執行模擬，多於一組時以行程池平行執行
+
+        Returns:
+            list: 各組結果，依 log_loss 由低到高排序
+        """
+        history = RatingSimulationService.load_history()
+        workers = max(1, min(workers or os.cpu_count() or 1, len(param_sets)))
+
+        if workers == 1:
+            results = [
+                RatingSimulationService.simulate(history, params, top)
+                for params in param_sets
+            ]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(history,),
+            ) as executor:
+                results = list(
+                    executor.map(
+                        _simulate_in_worker, [(params, top) for params in param_sets]
+                    )
+                )
+
+        return sorted(
+            results,
+            key=lambda result: (result["log_loss"] is None, result["log_loss"] or 0),
+        )
+
+
+def _init_worker(history: dict):
+    global _worker_history
+    _worker_history = history
+
+
+def _simulate_in_worker(args: tuple) -> dict:
+    params, top = args
+    return RatingSimulationService.simulate(_worker_history, params, top)
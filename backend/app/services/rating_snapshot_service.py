@@ -0,0 +1,101 @@
+# backend/app/services/rating_snapshot_service.py
+"""
+評分快照服務 - 保存每場比賽後的評分，提供歷史排行榜查詢
+
+RatingService 更新或重算評分時在同一交易中寫入快照；
+查詢某一天的評分只需取每位球員在該日之前最後一筆快照。
+"""
+
+import datetime
+
+from sqlalchemy import delete, func, insert
+
+from ..extensions import db
+from ..models import RatingSnapshot
+
+
+class RatingSnapshotService:
+    @staticmethod
+    def record_match(
+        match_record_id: int, match_date: datetime.date, ratings: dict
+    ) -> None:
+        """
+        新增單場比賽後的快照（不提交）
+
+        Args:
+            ratings: {player_id: (mu, sigma)}
+        """
+        if not ratings:
+            return
+        db.session.execute(
+            insert(RatingSnapshot),
+            [
+                {
+                    "member_id": p_id,
+                    "match_record_id": match_record_id,
+                    "match_date": match_date,
+                    "mu": mu,
+                    "sigma": sigma,
+                }
+                for p_id, (mu, sigma) in ratings.items()
+            ],
+        )
+
+    @staticmethod
+    def replace(rows: list[dict], player_ids: list[int] = None) -> None:
+        """
+        以重算結果取代既有快照（不提交）
+
+        Args:
+            rows: [{"member_id", "match_record_id", "match_date", "mu", "sigma"}]
+            player_ids: 只取代這些球員的快照；None 表示全部
+        """
+        statement = delete(RatingSnapshot)
+        if player_ids is not None:
+            statement = statement.where(RatingSnapshot.member_id.in_(player_ids))
+        db.session.execute(statement)
+        if rows:
+            db.session.execute(insert(RatingSnapshot), rows)
+
+    @staticmethod
+    def get_ratings_as_of(
+        as_of: datetime.date,
+        member_ids: list[int] = None,
+        active_since: datetime.date = None,
+    ) -> dict:
+        """
+        取得各球員在 as_of 當天結束時的評分
+
+        Args:
+            member_ids: 只查詢這些球員；None 表示全部
+            active_since: 只包含在此日期之後（含）有比賽的球員（賽季排行榜用）
+
+        Returns:
+            dict: {member_id: (mu, sigma)}；as_of 前沒有比賽的球員不在結果中
+        """
+        ranked = db.select(
+            RatingSnapshot.member_id,
+            RatingSnapshot.mu,
+            RatingSnapshot.sigma,
+            RatingSnapshot.match_date,
+            func.row_number()
+            .over(
+                partition_by=RatingSnapshot.member_id,
+                order_by=(
+                    RatingSnapshot.match_date.desc(),
+                    RatingSnapshot.match_record_id.desc(),
+                ),
+            )
+            .label("position"),
+        ).where(RatingSnapshot.match_date <= as_of)
+        if member_ids is not None:
+            ranked = ranked.where(RatingSnapshot.member_id.in_(member_ids))
+        ranked = ranked.subquery()
+
+        query = db.select(ranked.c.member_id, ranked.c.mu, ranked.c.sigma).where(
+            ranked.c.position == 1
+        )
+        if active_since is not None:
+            query = query.where(ranked.c.match_date >= active_since)
+
+        return {row.member_id: (row.mu, row.sigma) for row in db.session.execute(query)}
@@ -1,12 +1,82 @@
+import threading
+import time
 from functools import wraps
 
 from flask import current_app, jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
 
 from ..extensions import db
 from ..models.enums import UserRoleEnum
 from ..models.user import User
 
+# 使用者權限狀態快取：{user_id: (expires_at, role, is_active)}
+# 只在本行程內有效，跨行程的角色/停用變更最晚在 TTL 後生效
+DEFAULT_PRINCIPAL_CACHE_TTL_SECONDS = 60
+MAX_PRINCIPAL_CACHE_SIZE = 1024
+
+_principal_cache: dict = {}
+_invalidated_at: dict = {}  # {user_id: 權限變更時間}，早於此時間簽發的 token claims 不再採信
+_cache_lock = threading.Lock()
+
+
+def principal_claims(user: User) -> dict:
+    """簽發 access token 時附帶的權限 claims"""
+    return {"role": user.role.value, "active": bool(user.is_active)}
+
+
+def invalidate_principal(user_id) -> None:
+    """使用者角色或啟用狀態變更後呼叫，清除快取並讓舊 token 的 claims 失效"""
+    user_id = int(user_id)
+    with _cache_lock:
+        _principal_cache.pop(user_id, None)
+        _invalidated_at[user_id] = time.time()
+
+
+def _cache_ttl() -> int:
+    return current_app.config.get(
+        "PRINCIPAL_CACHE_TTL_SECONDS", DEFAULT_PRINCIPAL_CACHE_TTL_SECONDS
+    )
+
+
+def _store_principal(user_id: int, role: UserRoleEnum, is_active: bool, now: float):
+    with _cache_lock:
+        if len(_principal_cache) >= MAX_PRINCIPAL_CACHE_SIZE:
+            expired = [k for k, v in _principal_cache.items() if v[0] <= now]
+            for k in expired:
+                del _principal_cache[k]
+            if len(_principal_cache) >= MAX_PRINCIPAL_CACHE_SIZE:
+                _principal_cache.pop(next(iter(_principal_cache)))
+        _principal_cache[user_id] = (now + _cache_ttl(), role, is_active)
+
+
+def _resolve_principal(user_id: int):
+    """
+    取得使用者目前的 (role, is_active)，找不到使用者時回傳 None
+
+    依序使用：本行程快取 → TTL 內簽發且未被撤銷的 token claims → 資料庫。
+    """
+    now = time.time()
+    cached = _principal_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+
+    claims = get_jwt()
+    issued_at = claims.get("iat", 0)
+    if (
+        "role" in claims
+        and now - issued_at < _cache_ttl()
+        and issued_at > _invalidated_at.get(user_id, 0)
+    ):
+        role = UserRoleEnum.get_by_value(claims["role"])
+        if role is not None:
+            return role, bool(claims.get("active"))
+
+    row = db.session.query(User.role, User.is_active).filter(User.id == user_id).first()
+    if row is None:
+        return None
+    _store_principal(user_id, row.role, row.is_active, now)
+    return row.role, row.is_active
+
 
 def roles_required(*required_roles: UserRoleEnum):
     def decorator(fn):
@@ -25,8 +95,11 @@ def roles_required(*required_roles: UserRoleEnum):
                 current_app.logger.warning("Roles required: No user identity in JWT.")
                 return jsonify(msg="Invalid user identity in token"), 401
 
-            user = db.session.get(User, user_id)
-            if not user or not user.is_active:
+            try:
+                principal = _resolve_principal(int(user_id))
+            except (TypeError, ValueError):
+                principal = None
+            if not principal or not principal[1]:
                 current_app.logger.warning(
                     f"Roles required: User {user_id} not found or inactive."
                 )
@@ -36,10 +109,11 @@ def roles_required(*required_roles: UserRoleEnum):
                 )
 
             # 檢查使用者角色是否在允許的角色列表中
-            if user.role not in required_roles:
+            role = principal[0]
+            if role not in required_roles:
                 allowed_roles_str = ", ".join([r.name for r in required_roles])
                 current_app.logger.warning(
-                    f"Access denied for user {user.username} (Role: {user.role.name}). "
+                    f"Access denied for user {user_id} (Role: {role.name}). "
                     f"Required one of: {allowed_roles_str}"
                 )
                 return (
@@ -0,0 +1,232 @@
+# backend/app/tools/event_bus.py
+"""
+即時事件匯流排（SSE 推播用）
+
+服務層以 publish_after_commit() 登記事件，事件只在資料庫交易成功提交後送出，
+回滾時丟棄。後端由 EVENT_BUS_BACKEND 設定：
+- memory：行程內發佈/訂閱，只有同一行程的 SSE 連線收得到（單一 worker / 開發環境）
+- postgres：在交易內執行 pg_notify，提交時由 PostgreSQL 送出；每個行程以一條
+  LISTEN 連線接收後轉發給本行程的訂閱者，跨 worker 與 rating-worker 都能收到
+"""
+
+import itertools
+import json
+import queue
+import threading
+
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+DEFAULT_EVENT_CHANNEL = "app_events"
+SUBSCRIBER_QUEUE_SIZE = 100
+MAX_NOTIFY_PAYLOAD_BYTES = 7900  # PostgreSQL NOTIFY 上限為 8000 bytes
+LISTEN_POLL_SECONDS = 5
+
+_PENDING_KEY = "pending_events"
+
+
+class Subscription:
+    """單一訂閱者的事件佇列；佇列滿時丟棄最舊的事件，避免慢速客戶端拖住發佈端"""
+
+    def __init__(self, bus, maxsize: int = SUBSCRIBER_QUEUE_SIZE):
+        self._bus = bus
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, item: dict) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float = None):
+        """取得下一個事件，逾時回傳 None"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class InProcessEventBus:
+    """行程內發佈/訂閱"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_data: dict) -> None:
+        """送給本行程的所有訂閱者"""
+        item = {"id": next(self._sequence), **event_data}
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(item)
+
+    # ---- 交易掛勾 ----
+
+    def stage(self, session, events: list[dict]) -> None:
+        """提交前呼叫（仍在交易內）"""
+
+    def dispatch_committed(self, events: list[dict]) -> None:
+        """提交成功後呼叫"""
+        for event_data in events:
+            self.publish(event_data)
+
+
+class PostgresEventBus(InProcessEventBus):
+    """
+    以 PostgreSQL LISTEN/NOTIFY 跨行程傳遞事件
+
+    Args:
+        dsn: LISTEN 連線使用的資料庫 URL
+        channel: NOTIFY 頻道名稱
+        connect: 建立 LISTEN 連線的函式 connect(dsn)，回傳具 psycopg2 介面
+                 (cursor/poll/notifies/close) 的連線；測試時可替換為假連線
+    """
+
+    def __init__(self, dsn: str, channel: str = DEFAULT_EVENT_CHANNEL, connect=None):
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._connect = connect or _psycopg2_connect
+        self._listener = None
+        self._stopped = threading.Event()
+
+    def subscribe(self) -> Subscription:
+        self._ensure_listener()
+        return super().subscribe()
+
+    def stage(self, session, events: list[dict]) -> None:
+        # NOTIFY 隨交易提交才送出，回滾則不送出
+        for event_data in events:
+            payload = json.dumps(event_data, default=str, separators=(",", ":"))
+            if len(payload.encode("utf-8")) > MAX_NOTIFY_PAYLOAD_BYTES:
+                payload = json.dumps(
+                    {"type": event_data.get("type"), "full_refresh": True}
+                )
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+    def dispatch_committed(self, events: list[dict]) -> None:
+        """由 LISTEN 連線收到後轉發，本行程不重複發佈"""
+
+    def _ensure_listener(self) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._stopped.clear()
+            self._listener = threading.Thread(
+                target=self._listen, name="event-bus-listener", daemon=True
+            )
+            self._listener.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _wait_readable(self, connection) -> bool:
+        """等待 LISTEN 連線可讀，逾時回傳 False"""
+        import select
+
+        readable, _, _ = select.select([connection], [], [], LISTEN_POLL_SECONDS)
+        return bool(readable)
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self._connect(self.dsn)
+                connection.cursor().execute(f'LISTEN "{self.channel}"')
+                while not self._stopped.is_set():
+                    if not self._wait_readable(connection):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        try:
+                            self.publish(json.loads(notify.payload))
+                        except ValueError:
+                            continue
+            except Exception:
+                # 連線中斷時稍候重連
+                self._stopped.wait(LISTEN_POLL_SECONDS)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+def _psycopg2_connect(dsn: str):
+    import psycopg2
+
+    connection = psycopg2.connect(dsn)
+    connection.set_isolation_level(0)  # LISTEN 需要 autocommit
+    return connection
+
+
+def init_event_bus(app) -> None:
+    """依設定建立事件匯流排並掛在 app.extensions 上"""
+    backend = app.config.get("EVENT_BUS_BACKEND", "memory")
+    if backend == "postgres":
+        dsn = app.config.get("EVENT_BUS_DSN") or app.config["SQLALCHEMY_DATABASE_URI"]
+        bus = PostgresEventBus(
+            dsn.replace("postgresql+psycopg2://", "postgresql://"),
+            channel=app.config.get("EVENT_BUS_CHANNEL", DEFAULT_EVENT_CHANNEL),
+        )
+    else:
+        bus = InProcessEventBus()
+    app.extensions["event_bus"] = bus
+
+
+def get_event_bus():
+    return current_app.extensions.get("event_bus")
+
+
+def publish_after_commit(session, event_data: dict) -> None:
+    """登記事件，於目前交易提交後送出"""
+    session.info.setdefault(_PENDING_KEY, []).append(event_data)
+
+
+@event.listens_for(Session, "before_commit")
+def _stage_events(session):
+    events = session.info.get(_PENDING_KEY)
+    bus = get_event_bus() if events else None
+    if bus is not None:
+        bus.stage(session, events)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_events(session):
+    events = session.info.pop(_PENDING_KEY, None)
+    bus = get_event_bus() if events else None
+    if bus is not None:
+        bus.dispatch_committed(events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_events(session):
+    session.info.pop(_PENDING_KEY, None)
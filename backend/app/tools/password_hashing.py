@@ -0,0 +1,99 @@
+# backend/app/tools/password_hashing.py
+"""
+密碼雜湊工具
+
+雜湊演算法與成本由設定決定（PASSWORD_HASH_METHOD / PASSWORD_SALT_LENGTH），
+登入時若發現舊雜湊使用不同參數，可透過 needs_rehash() 判斷並重新雜湊。
+
+PASSWORD_HASH_EXECUTOR 可將雜湊運算交給有上限的執行緒池或行程池：
+- none：在請求執行緒中直接計算（預設）
+- thread：hashlib 計算時會釋放 GIL，適合 gthread 等多執行緒 worker
+- process：獨立行程計算，可同時使用多個 CPU 核心
+池的大小 (PASSWORD_HASH_WORKERS) 同時限制了同一時間進行的雜湊數量，
+大量同時登入時不會讓所有 worker 都卡在雜湊上。
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_HASH_METHOD = "scrypt"
+DEFAULT_SALT_LENGTH = 16
+DEFAULT_HASH_WORKERS = 4
+HASH_EXECUTORS = ("none", "thread", "process")
+
+_executor = None
+_executor_key = None
+_executor_lock = threading.Lock()
+
+
+def _hash_settings() -> tuple:
+    config = current_app.config
+    return (
+        config.get("PASSWORD_HASH_METHOD", DEFAULT_HASH_METHOD),
+        config.get("PASSWORD_SALT_LENGTH", DEFAULT_SALT_LENGTH),
+    )
+
+
+def _get_executor():
+    """依設定建立（或重用）雜湊用的執行池，none 模式回傳 None"""
+    global _executor, _executor_key
+    config = current_app.config
+    kind = config.get("PASSWORD_HASH_EXECUTOR", "none")
+    if kind not in HASH_EXECUTORS or kind == "none":
+        return None
+
+    key = (kind, config.get("PASSWORD_HASH_WORKERS", DEFAULT_HASH_WORKERS))
+    with _executor_lock:
+        if _executor is None or _executor_key != key:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            executor_class = (
+                ThreadPoolExecutor if kind == "thread" else ProcessPoolExecutor
+            )
+            _executor = executor_class(max_workers=key[1])
+            _executor_key = key
+        return _executor
+
+
+def _run(fn, *args):
+    executor = _get_executor()
+    if executor is None:
+        return fn(*args)
+    return executor.submit(fn, *args).result()
+
+
+def hash_password(password: str) -> str:
+    """以目前設定的參數雜湊密碼"""
+    method, salt_length = _hash_settings()
+    return _run(generate_password_hash, password, method, salt_length)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """檢查密碼是否與雜湊相符"""
+    if not password_hash:
+        return False
+    return _run(check_password_hash, password_hash, password)
+
+
+@lru_cache(maxsize=8)
+def _method_prefix(method: str) -> str:
+    """
+    取得設定值對應的完整參數字串
+
+    werkzeug 會補上預設參數（例如 "scrypt" → "scrypt:32768:8:1"），
+    直接產生一次雜湊取前綴即可與已儲存的雜湊比較。
+    """
+    return generate_password_hash("", method=method, salt_length=1).split("$", 1)[0]
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """已儲存的雜湊是否與目前設定的演算法、成本或鹽長度不同"""
+    if not password_hash or password_hash.count("$") < 2:
+        return True
+    method, salt_length = _hash_settings()
+    stored_method, salt, _ = password_hash.split("$", 2)
+    return stored_method != _method_prefix(method) or len(salt) != salt_length
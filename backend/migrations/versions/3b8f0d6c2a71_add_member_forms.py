@@ -0,0 +1,59 @@
+"""add member_forms
+
+Revision ID: 3b8f0d6c2a71
+Revises: 7c5e2a9d4f10
+Create Date: 2025-07-25 10:41:27.318204
+
+升級後執行 `flask rebuild-member-form` 以既有比賽建立球員近況。
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b8f0d6c2a71"
+down_revision = "7c5e2a9d4f10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "member_forms",
+        sa.Column("member_id", sa.Integer(), nullable=False, comment="球員ID"),
+        sa.Column(
+            "current_streak",
+            sa.Integer(),
+            nullable=False,
+            comment="目前連勝（正數）/ 連敗（負數）場數",
+        ),
+        sa.Column("longest_win_streak", sa.Integer(), nullable=False, comment="最長連勝"),
+        sa.Column("longest_loss_streak", sa.Integer(), nullable=False, comment="最長連敗"),
+        sa.Column(
+            "recent_results",
+            sa.String(length=10),
+            nullable=False,
+            comment="近期戰績，W / L 由新到舊",
+        ),
+        sa.Column("recent_wins", sa.Integer(), nullable=False, comment="近期戰績中的勝場"),
+        sa.Column("last_match_date", sa.Date(), nullable=True, comment="最後一場比賽日期"),
+        sa.Column(
+            "last_match_record_id",
+            sa.Integer(),
+            nullable=True,
+            comment="最後一場比賽記錄ID（同日比賽的先後）",
+        ),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, comment="更新時間"),
+        sa.ForeignKeyConstraint(
+            ["member_id"],
+            ["members.id"],
+            name="fk_member_forms_member_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("member_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("member_forms")
@@ -0,0 +1,32 @@
+"""add member conservative score index
+
+Revision ID: 4e9b1c7a2d58
+Revises: c2f8a5d61e47
+Create Date: 2025-07-17 16:05:48.772913
+
+運算式須與 CONSERVATIVE_SCORE_EXPRESSION 相同（k = TRUESKILL_CONSERVATIVE_K）；
+調整 k 時需以新的 migration 重建此索引。
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4e9b1c7a2d58"
+down_revision = "c2f8a5d61e47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_members_conservative_score",
+        "members",
+        [sa.text("(mu - 2.0 * sigma)"), "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_members_conservative_score", table_name="members")
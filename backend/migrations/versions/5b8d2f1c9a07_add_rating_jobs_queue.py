@@ -0,0 +1,108 @@
+"""add rating jobs queue and match record rating status
+
+Revision ID: 5b8d2f1c9a07
+Revises: 2e7bcaea2cf2
+Create Date: 2025-07-02 10:12:41.318204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "5b8d2f1c9a07"
+down_revision = "2e7bcaea2cf2"
+branch_labels = None
+depends_on = None
+
+RATING_STATUS_VALUES = ("pending", "processing", "done", "failed")
+
+
+def upgrade():
+    # 先創建枚舉類型（如果不存在）
+    record_status_enum = postgresql.ENUM(
+        *RATING_STATUS_VALUES, name="rating_status_enum_match_records"
+    )
+    record_status_enum.create(op.get_bind(), checkfirst=True)
+    job_status_enum = postgresql.ENUM(
+        *RATING_STATUS_VALUES, name="rating_status_enum_rating_jobs"
+    )
+    job_status_enum.create(op.get_bind(), checkfirst=True)
+    job_type_enum = postgresql.ENUM(
+        "match_update", "recalculate", name="rating_job_type_enum"
+    )
+    job_type_enum.create(op.get_bind(), checkfirst=True)
+
+    # 既有比賽的評分都已同步更新完成
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "rating_status",
+                postgresql.ENUM(name="rating_status_enum_match_records", create_type=False),
+                nullable=False,
+                server_default="done",
+                comment="評分更新狀態",
+            )
+        )
+
+    op.create_table(
+        "rating_jobs",
+        sa.Column("id", sa.Integer(), nullable=False, comment="工作唯一識別碼"),
+        sa.Column(
+            "job_type",
+            postgresql.ENUM(name="rating_job_type_enum", create_type=False),
+            nullable=False,
+            comment="工作類型",
+        ),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="rating_status_enum_rating_jobs", create_type=False),
+            nullable=False,
+            comment="處理狀態",
+        ),
+        sa.Column(
+            "match_record_id",
+            sa.Integer(),
+            nullable=True,
+            comment="相關比賽記錄ID（刪除後為空）",
+        ),
+        sa.Column("player_ids", sa.JSON(), nullable=True, comment="需重算的球員ID"),
+        sa.Column("attempts", sa.Integer(), nullable=False, comment="嘗試次數"),
+        sa.Column("last_error", sa.Text(), nullable=True, comment="最後一次錯誤訊息"),
+        sa.Column("created_at", sa.DateTime(), nullable=False, comment="建立時間"),
+        sa.Column("started_at", sa.DateTime(), nullable=True, comment="開始處理時間"),
+        sa.Column("finished_at", sa.DateTime(), nullable=True, comment="完成時間"),
+        sa.ForeignKeyConstraint(
+            ["match_record_id"],
+            ["match_records.id"],
+            name="fk_rating_jobs_match_record_id",
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("rating_jobs", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_rating_jobs_status"), ["status"], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f("ix_rating_jobs_match_record_id"), ["match_record_id"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("rating_jobs", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_rating_jobs_match_record_id"))
+        batch_op.drop_index(batch_op.f("ix_rating_jobs_status"))
+    op.drop_table("rating_jobs")
+
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        batch_op.drop_column("rating_status")
+
+    # 刪除枚舉類型
+    for enum_name in (
+        "rating_job_type_enum",
+        "rating_status_enum_rating_jobs",
+        "rating_status_enum_match_records",
+    ):
+        postgresql.ENUM(name=enum_name).drop(op.get_bind(), checkfirst=True)
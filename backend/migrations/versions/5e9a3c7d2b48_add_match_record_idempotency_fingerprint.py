@@ -0,0 +1,33 @@
+"""add idempotency fingerprint to match records
+
+Revision ID: 5e9a3c7d2b48
+Revises: 8d2c6e4b1f93
+Create Date: 2025-07-29 10:42:06.318274
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e9a3c7d2b48"
+down_revision = "8d2c6e4b1f93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "idempotency_fingerprint",
+                sa.String(length=64),
+                nullable=True,
+                comment="冪等請求內容指紋",
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        batch_op.drop_column("idempotency_fingerprint")
@@ -0,0 +1,186 @@
+"""add live point-by-point scoring
+
+Revision ID: 6f2a9c4e1b83
+Revises: d3f7b9a1e605
+Create Date: 2025-07-09 10:22:47.518306
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "6f2a9c4e1b83"
+down_revision = "d3f7b9a1e605"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 先創建枚舉類型（如果不存在）；其餘枚舉沿用 matches / match_records 的類型
+    status_enum = postgresql.ENUM(
+        "in_progress", "finalized", "abandoned", name="live_match_status_enum"
+    )
+    status_enum.create(op.get_bind(), checkfirst=True)
+
+    def existing_enum(name):
+        return postgresql.ENUM(name=name, create_type=False)
+
+    op.create_table(
+        "live_matches",
+        sa.Column("id", sa.Integer(), nullable=False, comment="即時比賽唯一識別碼"),
+        sa.Column(
+            "status",
+            existing_enum("live_match_status_enum"),
+            nullable=False,
+            comment="計分狀態",
+        ),
+        sa.Column("match_date", sa.Date(), nullable=False, comment="比賽日期"),
+        sa.Column(
+            "match_type",
+            existing_enum("match_type_enum_matches"),
+            nullable=False,
+            comment="比賽類型",
+        ),
+        sa.Column(
+            "match_format",
+            existing_enum("match_format_enum_matches"),
+            nullable=False,
+            comment="比賽賽制",
+        ),
+        sa.Column(
+            "match_time_slot",
+            existing_enum("match_time_slot_enum_matches"),
+            nullable=True,
+            comment="比賽時間段",
+        ),
+        sa.Column(
+            "court_surface",
+            existing_enum("court_surface_enum_matches"),
+            nullable=True,
+            comment="場地材質",
+        ),
+        sa.Column(
+            "court_environment",
+            existing_enum("court_environment_enum_matches"),
+            nullable=True,
+            comment="場地環境",
+        ),
+        sa.Column("player1_id", sa.Integer(), nullable=False),
+        sa.Column("player2_id", sa.Integer(), nullable=True),
+        sa.Column("player3_id", sa.Integer(), nullable=False),
+        sa.Column("player4_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "first_serve_side",
+            existing_enum("serve_start_enum_match_records"),
+            nullable=False,
+            comment="第一局發球方",
+        ),
+        sa.Column(
+            "current_game", sa.SmallInteger(), nullable=False, comment="目前進行中的局數"
+        ),
+        sa.Column("a_points", sa.SmallInteger(), nullable=False, comment="本局A方得分"),
+        sa.Column("b_points", sa.SmallInteger(), nullable=False, comment="本局B方得分"),
+        sa.Column("a_games", sa.SmallInteger(), nullable=False, comment="A方已贏局數"),
+        sa.Column("b_games", sa.SmallInteger(), nullable=False, comment="B方已贏局數"),
+        sa.Column(
+            "completed_games",
+            sa.JSON(),
+            nullable=False,
+            comment="已結束各局比分 [[a, b], ...]",
+        ),
+        sa.Column(
+            "last_sequence", sa.Integer(), nullable=False, comment="最後一分的事件序號"
+        ),
+        sa.Column(
+            "match_record_id",
+            sa.Integer(),
+            nullable=True,
+            comment="結束後寫入的比賽記錄ID",
+        ),
+        sa.Column(
+            "created_by_user_id", sa.Integer(), nullable=True, comment="計分員（建立者）"
+        ),
+        sa.Column("started_at", sa.DateTime(), nullable=False, comment="開始時間"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, comment="最後更新時間"),
+        sa.Column("finished_at", sa.DateTime(), nullable=True, comment="結束時間"),
+        sa.ForeignKeyConstraint(
+            ["player1_id"], ["members.id"], name="fk_live_matches_p1_id", ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["player2_id"], ["members.id"], name="fk_live_matches_p2_id", ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["player3_id"], ["members.id"], name="fk_live_matches_p3_id", ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["player4_id"], ["members.id"], name="fk_live_matches_p4_id", ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["match_record_id"],
+            ["match_records.id"],
+            name="fk_live_matches_match_record_id",
+            ondelete="SET NULL",
+        ),
+        sa.ForeignKeyConstraint(
+            ["created_by_user_id"],
+            ["users.id"],
+            name="fk_live_matches_created_by",
+            ondelete="SET NULL",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("live_matches", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_live_matches_status"), ["status"], unique=False
+        )
+        batch_op.create_index(
+            batch_op.f("ix_live_matches_created_by_user_id"),
+            ["created_by_user_id"],
+            unique=False,
+        )
+
+    op.create_table(
+        "live_point_events",
+        sa.Column("id", sa.Integer(), nullable=False, comment="事件唯一識別碼"),
+        sa.Column(
+            "live_match_id", sa.Integer(), nullable=False, comment="所屬即時比賽ID"
+        ),
+        sa.Column("sequence", sa.Integer(), nullable=False, comment="比賽內的事件序號"),
+        sa.Column("game_number", sa.SmallInteger(), nullable=False, comment="局數"),
+        sa.Column(
+            "scoring_side",
+            existing_enum("serve_start_enum_match_records"),
+            nullable=False,
+            comment="得分方",
+        ),
+        sa.Column(
+            "server_side",
+            existing_enum("serve_start_enum_match_records"),
+            nullable=False,
+            comment="發球方",
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False, comment="記錄時間"),
+        sa.ForeignKeyConstraint(
+            ["live_match_id"],
+            ["live_matches.id"],
+            name="fk_live_point_events_live_match_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "live_match_id", "sequence", name="uq_live_point_events_sequence"
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("live_point_events")
+    with op.batch_alter_table("live_matches", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_live_matches_created_by_user_id"))
+        batch_op.drop_index(batch_op.f("ix_live_matches_status"))
+    op.drop_table("live_matches")
+
+    # 刪除枚舉類型
+    postgresql.ENUM(name="live_match_status_enum").drop(op.get_bind(), checkfirst=True)
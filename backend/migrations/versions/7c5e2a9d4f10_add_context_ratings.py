@@ -0,0 +1,44 @@
+"""add context_ratings
+
+Revision ID: 7c5e2a9d4f10
+Revises: 9a3d6f1b8e27
+Create Date: 2025-07-23 15:12:44.906381
+
+升級後執行 `flask rebuild-context-ratings` 以既有比賽建立情境評分。
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7c5e2a9d4f10"
+down_revision = "9a3d6f1b8e27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "context_ratings",
+        sa.Column("context", sa.String(length=20), nullable=False, comment="情境（列舉值）"),
+        sa.Column("member_id", sa.Integer(), nullable=False, comment="球員ID"),
+        sa.Column("mu", sa.Float(), nullable=False, comment="情境 μ"),
+        sa.Column("sigma", sa.Float(), nullable=False, comment="情境 σ"),
+        sa.Column("matches_played", sa.Integer(), nullable=False, comment="比賽場數"),
+        sa.ForeignKeyConstraint(
+            ["member_id"],
+            ["members.id"],
+            name="fk_context_ratings_member_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("context", "member_id"),
+    )
+    op.create_index(
+        "ix_context_ratings_member_id", "context_ratings", ["member_id"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_context_ratings_member_id", table_name="context_ratings")
+    op.drop_table("context_ratings")
@@ -0,0 +1,130 @@
+"""add member search index (pg_trgm / sqlite fts5)
+
+Revision ID: 8c4e1a7d3f52
+Revises: 5b8d2f1c9a07
+Create Date: 2025-07-04 14:27:09.552130
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c4e1a7d3f52"
+down_revision = "5b8d2f1c9a07"
+branch_labels = None
+depends_on = None
+
+# 與 app/models/member_search_index.py 保持一致
+TRGM_INDEXES = (
+    ("members", "name"),
+    ("users", "display_name"),
+    ("users", "username"),
+    ("members", "student_id"),
+    ("members", "guest_phone"),
+    ("members", "guest_identifier"),
+    ("members", "guest_notes"),
+)
+
+FTS_TABLE = "member_search_fts"
+FTS_COLUMNS = (
+    "name, display_name, username, student_id, "
+    "guest_phone, guest_identifier, guest_notes"
+)
+SQLITE_TRIGGERS = (
+    "members_search_ai",
+    "members_search_au",
+    "members_search_ad",
+    "users_search_au",
+)
+
+
+def _member_values(alias):
+    return (
+        f"{alias}.name, u.display_name, u.username, {alias}.student_id, "
+        f"{alias}.guest_phone, {alias}.guest_identifier, {alias}.guest_notes"
+    )
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table_name, column_name in TRGM_INDEXES:
+            op.create_index(
+                f"ix_{table_name}_{column_name}_trgm",
+                table_name,
+                [column_name],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column_name: "gin_trgm_ops"},
+            )
+
+    elif dialect == "sqlite":
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            f"USING fts5({FTS_COLUMNS}, tokenize='trigram')"
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS members_search_ai AFTER INSERT ON members BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+                SELECT new.id, {_member_values("new")}
+                FROM (SELECT 1) LEFT JOIN users u ON u.id = new.user_id;
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS members_search_au
+            AFTER UPDATE OF name, user_id, student_id, guest_phone, guest_identifier, guest_notes
+            ON members BEGIN
+                DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+                INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+                SELECT new.id, {_member_values("new")}
+                FROM (SELECT 1) LEFT JOIN users u ON u.id = new.user_id;
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS members_search_ad AFTER DELETE ON members BEGIN
+                DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS users_search_au
+            AFTER UPDATE OF display_name, username ON users BEGIN
+                DELETE FROM {FTS_TABLE}
+                WHERE rowid IN (SELECT id FROM members WHERE user_id = new.id);
+                INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+                SELECT m.id, {_member_values("m")}
+                FROM members m JOIN users u ON u.id = m.user_id
+                WHERE m.user_id = new.id;
+            END
+            """
+        )
+        # 回填既有資料
+        op.execute(
+            f"""
+            INSERT INTO {FTS_TABLE}(rowid, {FTS_COLUMNS})
+            SELECT m.id, {_member_values("m")}
+            FROM members m LEFT JOIN users u ON u.id = m.user_id
+            """
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        for table_name, column_name in reversed(TRGM_INDEXES):
+            op.drop_index(f"ix_{table_name}_{column_name}_trgm", table_name=table_name)
+        # pg_trgm 擴充可能被其他物件使用，保留不刪除
+
+    elif dialect == "sqlite":
+        for trigger_name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
@@ -0,0 +1,57 @@
+"""add member_performance
+
+Revision ID: 8d2c6e4b1f93
+Revises: 3b8f0d6c2a71
+Create Date: 2025-07-28 09:17:52.604418
+
+升級後執行 `flask rebuild-performance-cube` 以既有比賽建立球員表現彙總。
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d2c6e4b1f93"
+down_revision = "3b8f0d6c2a71"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "member_performance",
+        sa.Column("member_id", sa.Integer(), nullable=False, comment="球員ID"),
+        sa.Column("match_date", sa.Date(), nullable=False, comment="比賽日期"),
+        sa.Column("court_surface", sa.String(length=20), nullable=False, comment="場地材質"),
+        sa.Column(
+            "court_environment", sa.String(length=20), nullable=False, comment="場地環境"
+        ),
+        sa.Column(
+            "match_time_slot", sa.String(length=20), nullable=False, comment="比賽時間段"
+        ),
+        sa.Column("match_format", sa.String(length=20), nullable=False, comment="賽制"),
+        sa.Column("matches", sa.Integer(), nullable=False, comment="比賽場數"),
+        sa.Column("wins", sa.Integer(), nullable=False, comment="勝場"),
+        sa.Column("losses", sa.Integer(), nullable=False, comment="敗場"),
+        sa.Column("games_won", sa.Integer(), nullable=False, comment="贏得局數"),
+        sa.Column("games_lost", sa.Integer(), nullable=False, comment="輸掉局數"),
+        sa.ForeignKeyConstraint(
+            ["member_id"],
+            ["members.id"],
+            name="fk_member_performance_member_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "member_id",
+            "match_date",
+            "court_surface",
+            "court_environment",
+            "match_time_slot",
+            "match_format",
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("member_performance")
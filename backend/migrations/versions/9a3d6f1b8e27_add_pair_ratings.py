@@ -0,0 +1,68 @@
+"""add pair_ratings
+
+Revision ID: 9a3d6f1b8e27
+Revises: 4e9b1c7a2d58
+Create Date: 2025-07-21 11:37:05.164229
+
+升級後執行 `flask rebuild-pair-ratings` 以既有雙打比賽建立組合評分。
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a3d6f1b8e27"
+down_revision = "4e9b1c7a2d58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "pair_ratings",
+        sa.Column(
+            "member_low_id", sa.Integer(), nullable=False, comment="組合中 ID 較小的球員"
+        ),
+        sa.Column(
+            "member_high_id", sa.Integer(), nullable=False, comment="組合中 ID 較大的球員"
+        ),
+        sa.Column("mu", sa.Float(), nullable=False, comment="組合 μ"),
+        sa.Column("sigma", sa.Float(), nullable=False, comment="組合 σ"),
+        sa.Column("matches_played", sa.Integer(), nullable=False, comment="比賽場數"),
+        sa.Column("wins", sa.Integer(), nullable=False, comment="勝場"),
+        sa.Column("losses", sa.Integer(), nullable=False, comment="敗場"),
+        sa.Column("last_match_date", sa.Date(), nullable=True, comment="最後比賽日期"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, comment="更新時間"),
+        sa.CheckConstraint(
+            "member_low_id < member_high_id", name="ck_pair_ratings_member_order"
+        ),
+        sa.ForeignKeyConstraint(
+            ["member_low_id"],
+            ["members.id"],
+            name="fk_pair_ratings_member_low_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["member_high_id"],
+            ["members.id"],
+            name="fk_pair_ratings_member_high_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("member_low_id", "member_high_id"),
+    )
+    op.create_index(
+        "ix_pair_ratings_member_high_id", "pair_ratings", ["member_high_id"]
+    )
+    # 運算式須與 PAIR_CONSERVATIVE_SCORE_EXPRESSION 相同（k = 2.0）
+    op.create_index(
+        "ix_pair_ratings_conservative_score",
+        "pair_ratings",
+        [sa.text("(mu - 2.0 * sigma)"), "member_low_id", "member_high_id"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_pair_ratings_conservative_score", table_name="pair_ratings")
+    op.drop_index("ix_pair_ratings_member_high_id", table_name="pair_ratings")
+    op.drop_table("pair_ratings")
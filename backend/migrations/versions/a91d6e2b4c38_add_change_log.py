@@ -0,0 +1,82 @@
+"""add change log for delta sync
+
+Revision ID: a91d6e2b4c38
+Revises: 8c4e1a7d3f52
+Create Date: 2025-07-07 09:41:23.870615
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "a91d6e2b4c38"
+down_revision = "8c4e1a7d3f52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 先創建枚舉類型（如果不存在）
+    entity_enum = postgresql.ENUM(
+        "match_record", "member", "rating", name="change_entity_enum"
+    )
+    entity_enum.create(op.get_bind(), checkfirst=True)
+    action_enum = postgresql.ENUM(
+        "created", "updated", "deleted", name="change_action_enum"
+    )
+    action_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        "change_log",
+        sa.Column("id", sa.Integer(), nullable=False, comment="變更版本號"),
+        sa.Column(
+            "entity_type",
+            postgresql.ENUM(name="change_entity_enum", create_type=False),
+            nullable=False,
+            comment="資料類型",
+        ),
+        sa.Column("entity_id", sa.Integer(), nullable=False, comment="資料ID"),
+        sa.Column(
+            "action",
+            postgresql.ENUM(name="change_action_enum", create_type=False),
+            nullable=False,
+            comment="變更動作",
+        ),
+        sa.Column("changed_at", sa.DateTime(), nullable=False, comment="變更時間"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("change_log", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_change_log_entity", ["entity_type", "entity_id"], unique=False
+        )
+
+    # 既有資料記為第一批變更，讓客戶端從版本 0 開始可取得完整資料（新建球員會一併帶上評分）
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+
+    def enum_value(value, enum_name):
+        return f"'{value}'::{enum_name}" if is_postgresql else f"'{value}'"
+
+    for entity_type, action, table_name in (
+        ("member", "created", "members"),
+        ("match_record", "created", "match_records"),
+    ):
+        op.execute(
+            f"""
+            INSERT INTO change_log (entity_type, entity_id, action, changed_at)
+            SELECT {enum_value(entity_type, "change_entity_enum")}, id,
+                   {enum_value(action, "change_action_enum")}, CURRENT_TIMESTAMP
+            FROM {table_name} ORDER BY id
+            """
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("change_log", schema=None) as batch_op:
+        batch_op.drop_index("ix_change_log_entity")
+    op.drop_table("change_log")
+
+    # 刪除枚舉類型
+    for enum_name in ("change_action_enum", "change_entity_enum"):
+        postgresql.ENUM(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,56 @@
+"""add commit-ordered version to change log
+
+Revision ID: b4d8f1a6c2e7
+Revises: 5e9a3c7d2b48
+Create Date: 2025-07-30 14:08:37.512093
+
+同步版本號改為提交時依序配置的 version 欄位；既有紀錄以 id 作為版本號，
+客戶端保存的游標可以直接沿用。
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b4d8f1a6c2e7"
+down_revision = "5e9a3c7d2b48"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("change_log", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "version",
+                sa.Integer(),
+                nullable=True,
+                comment="同步版本號（提交順序）",
+            )
+        )
+        batch_op.alter_column(
+            "id",
+            existing_type=sa.Integer(),
+            comment="變更紀錄ID",
+            existing_comment="變更版本號",
+            existing_nullable=False,
+        )
+
+    op.execute("UPDATE change_log SET version = id")
+
+    with op.batch_alter_table("change_log", schema=None) as batch_op:
+        batch_op.create_index("ix_change_log_version", ["version"], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table("change_log", schema=None) as batch_op:
+        batch_op.drop_index("ix_change_log_version")
+        batch_op.alter_column(
+            "id",
+            existing_type=sa.Integer(),
+            comment="變更版本號",
+            existing_comment="變更紀錄ID",
+            existing_nullable=False,
+        )
+        batch_op.drop_column("version")
@@ -0,0 +1,74 @@
+"""add rating_snapshots and seasons
+
+Revision ID: b7d4e2f91a36
+Revises: e5a1c7b39d24
+Create Date: 2025-07-14 10:22:37.518204
+
+升級後執行 `flask rebuild-rating-snapshots` 以既有比賽建立快照。
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7d4e2f91a36"
+down_revision = "e5a1c7b39d24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "seasons",
+        sa.Column("id", sa.Integer(), nullable=False, comment="賽季唯一識別碼"),
+        sa.Column("name", sa.String(length=50), nullable=False, comment="賽季名稱"),
+        sa.Column("start_date", sa.Date(), nullable=False, comment="開始日期"),
+        sa.Column("end_date", sa.Date(), nullable=False, comment="結束日期"),
+        sa.Column("created_at", sa.DateTime(), nullable=False, comment="建立時間"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+
+    op.create_table(
+        "rating_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False, comment="快照唯一識別碼"),
+        sa.Column("member_id", sa.Integer(), nullable=False, comment="球員ID"),
+        sa.Column("match_record_id", sa.Integer(), nullable=False, comment="比賽記錄ID"),
+        sa.Column("match_date", sa.Date(), nullable=False, comment="比賽日期"),
+        sa.Column("mu", sa.Float(), nullable=False, comment="賽後 μ"),
+        sa.Column("sigma", sa.Float(), nullable=False, comment="賽後 σ"),
+        sa.ForeignKeyConstraint(
+            ["member_id"],
+            ["members.id"],
+            name="fk_rating_snapshots_member_id",
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["match_record_id"],
+            ["match_records.id"],
+            name="fk_rating_snapshots_match_record_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("rating_snapshots", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_rating_snapshots_member_date",
+            ["member_id", "match_date", "match_record_id"],
+            unique=False,
+        )
+        batch_op.create_index(
+            batch_op.f("ix_rating_snapshots_match_record_id"),
+            ["match_record_id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("rating_snapshots", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_rating_snapshots_match_record_id"))
+        batch_op.drop_index("ix_rating_snapshots_member_date")
+
+    op.drop_table("rating_snapshots")
+    op.drop_table("seasons")
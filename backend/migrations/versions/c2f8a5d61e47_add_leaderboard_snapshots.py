@@ -0,0 +1,46 @@
+"""add leaderboard_snapshots
+
+Revision ID: c2f8a5d61e47
+Revises: b7d4e2f91a36
+Create Date: 2025-07-16 09:41:12.308517
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c2f8a5d61e47"
+down_revision = "b7d4e2f91a36"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "leaderboard_snapshots",
+        sa.Column("period_start", sa.Date(), nullable=False, comment="期別開始日（週一）"),
+        sa.Column("member_id", sa.Integer(), nullable=False, comment="球員ID"),
+        sa.Column("rank", sa.Integer(), nullable=False, comment="名次"),
+        sa.Column("score", sa.Float(), nullable=False, comment="保守分數 (μ - 3σ)"),
+        sa.ForeignKeyConstraint(
+            ["member_id"],
+            ["members.id"],
+            name="fk_leaderboard_snapshots_member_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("period_start", "member_id"),
+    )
+    with op.batch_alter_table("leaderboard_snapshots", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_leaderboard_snapshots_member_period",
+            ["member_id", "period_start"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("leaderboard_snapshots", schema=None) as batch_op:
+        batch_op.drop_index("ix_leaderboard_snapshots_member_period")
+
+    op.drop_table("leaderboard_snapshots")
@@ -0,0 +1,37 @@
+"""add idempotency key to match records
+
+Revision ID: d3f7b9a1e605
+Revises: a91d6e2b4c38
+Create Date: 2025-07-08 16:05:12.407731
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d3f7b9a1e605"
+down_revision = "a91d6e2b4c38"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "idempotency_key",
+                sa.String(length=64),
+                nullable=True,
+                comment="客戶端冪等鍵",
+            )
+        )
+        batch_op.create_unique_constraint(
+            "uq_match_records_idempotency_key", ["idempotency_key"]
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        batch_op.drop_constraint("uq_match_records_idempotency_key", type_="unique")
+        batch_op.drop_column("idempotency_key")
@@ -0,0 +1,103 @@
+"""move per-game scores to match_games
+
+Revision ID: e5a1c7b39d24
+Revises: 6f2a9c4e1b83
+Create Date: 2025-07-10 14:08:51.263940
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "e5a1c7b39d24"
+down_revision = "6f2a9c4e1b83"
+branch_labels = None
+depends_on = None
+
+MAX_GAMES = 9
+
+
+def upgrade():
+    op.create_table(
+        "match_games",
+        sa.Column(
+            "match_record_id", sa.Integer(), nullable=False, comment="所屬比賽記錄ID"
+        ),
+        sa.Column("game_number", sa.SmallInteger(), nullable=False, comment="局數 (1-9)"),
+        sa.Column("a_score", sa.SmallInteger(), nullable=False, comment="A方得分"),
+        sa.Column("b_score", sa.SmallInteger(), nullable=False, comment="B方得分"),
+        sa.Column(
+            "server_side",
+            postgresql.ENUM(name="serve_start_enum_match_records", create_type=False),
+            nullable=True,
+            comment="本局發球方（未記錄第一局發球方時為空）",
+        ),
+        sa.ForeignKeyConstraint(
+            ["match_record_id"],
+            ["match_records.id"],
+            name="fk_match_games_match_record_id",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("match_record_id", "game_number"),
+    )
+
+    # 只搬移有比分的局；奇數局與第一局發球方相同，偶數局相反
+    for game_number in range(1, MAX_GAMES + 1):
+        if game_number % 2 == 1:
+            server_side = "first_serve_side"
+        else:
+            server_side = (
+                "CASE WHEN first_serve_side = 'side_a' THEN 'side_b' "
+                "WHEN first_serve_side = 'side_b' THEN 'side_a' END"
+            )
+            if op.get_bind().dialect.name == "postgresql":
+                server_side = f"({server_side})::serve_start_enum_match_records"
+        op.execute(
+            f"""
+            INSERT INTO match_games
+                (match_record_id, game_number, a_score, b_score, server_side)
+            SELECT id, {game_number},
+                   COALESCE(game{game_number}_a_score, 0),
+                   COALESCE(game{game_number}_b_score, 0),
+                   {server_side}
+            FROM match_records
+            WHERE COALESCE(game{game_number}_a_score, 0) > 0
+               OR COALESCE(game{game_number}_b_score, 0) > 0
+            """
+        )
+
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        for game_number in range(1, MAX_GAMES + 1):
+            batch_op.drop_column(f"game{game_number}_a_score")
+            batch_op.drop_column(f"game{game_number}_b_score")
+
+
+def downgrade():
+    with op.batch_alter_table("match_records", schema=None) as batch_op:
+        for game_number in range(1, MAX_GAMES + 1):
+            for side in ("a", "b"):
+                batch_op.add_column(
+                    sa.Column(
+                        f"game{game_number}_{side}_score",
+                        sa.Integer(),
+                        nullable=True,
+                        comment=f"第{game_number}局{side.upper()}方得分",
+                    )
+                )
+
+    for game_number in range(1, MAX_GAMES + 1):
+        for side in ("a", "b"):
+            op.execute(
+                f"""
+                UPDATE match_records SET game{game_number}_{side}_score = COALESCE(
+                    (SELECT {side}_score FROM match_games
+                     WHERE match_games.match_record_id = match_records.id
+                       AND match_games.game_number = {game_number}),
+                    0
+                )
+                """
+            )
+
+    op.drop_table("match_games")